@@ -0,0 +1,57 @@
+import numpy as np
+
+from lss_reader import LssContents
+import livesplit_time
+
+
+class AttemptTable():
+    ''' Columnar copy of AttemptHistory, one typed array per field and one row per attempt in file order.
+
+        - `ids`: attempt id
+        - `started`, `ended`: epoch seconds, `livesplit_time.MISSING` when the stamp is absent
+        - `real_time`: RealTime of the run in ticks, 0 when not finished
+        - `finished`: whether the attempt has a RealTime
+    '''
+    def __init__(self, ids: np.ndarray, started: np.ndarray, ended: np.ndarray, real_time: np.ndarray, finished: np.ndarray):
+        self.ids = ids
+        self.started = started
+        self.ended = ended
+        self.real_time = real_time
+        self.finished = finished
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        return self.ids.nbytes + self.started.nbytes + self.ended.nbytes + self.real_time.nbytes + self.finished.nbytes
+
+    def append(self, other: 'AttemptTable'):
+        ''' Add the rows of `other` after the existing ones. '''
+        self.ids = np.concatenate((self.ids, other.ids))
+        self.started = np.concatenate((self.started, other.started))
+        self.ended = np.concatenate((self.ended, other.ended))
+        self.real_time = np.concatenate((self.real_time, other.real_time))
+        self.finished = np.concatenate((self.finished, other.finished))
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        return {
+            'attempt_ids': self.ids,
+            'attempt_started': self.started,
+            'attempt_ended': self.ended,
+            'attempt_real_time': self.real_time,
+            'attempt_finished': self.finished,
+        }
+
+    @staticmethod
+    def from_arrays(arrays: dict[str, np.ndarray]) -> 'AttemptTable':
+        return AttemptTable(arrays['attempt_ids'], arrays['attempt_started'], arrays['attempt_ended'], arrays['attempt_real_time'], arrays['attempt_finished'])
+
+    @staticmethod
+    def from_contents(contents: LssContents) -> 'AttemptTable':
+        ids = np.array(contents.attempt_ids, dtype=np.int32)
+        started = livesplit_time.parse_timestamps(contents.started)
+        ended = livesplit_time.parse_timestamps(contents.ended)
+        real_time, finished = livesplit_time.parse_times(contents.real_times)
+
+        return AttemptTable(ids, started, ended, real_time, finished)
@@ -0,0 +1,313 @@
+'''
+Time the data and graph code on generated splits files of a few sizes and write the results as JSON.
+
+    python benchmark.py --sizes 1000 10000 100000 -o before.json
+    python benchmark.py -o after.json --compare before.json
+
+Every stage (parsing, category data, segment data, outlier removal, the histogram counts and drawing each graph)
+is run `--repeat` times for its timings and once more under `tracemalloc` for its peak memory, which numpy
+arrays count towards. Files come from `generate_lss.py` with a fixed seed, so runs of different versions of the
+code see the same input. With `--compare` the best times are checked against an earlier result file and the exit
+code is 1 when a stage got slower by more than `--tolerance`.
+'''
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# export switches matplotlib to Agg, it has to come before plot
+from export import parse_enum_args
+from livesplit_data import LiveSplitData
+from plot import Plot
+from theme import Theme, ThemeVariant
+from graph import Graph
+from graph_options import OutlierStrategy
+from distribution import Distribution
+from segment_matrix import SegmentMatrix
+from best_segments import BestSegments
+from resets import ResetAnalysis, splits_reached
+from generate_lss import generate_lss
+
+
+SIZES = (1000, 10000, 100000)
+# bump when stages are renamed or measure something else, results of another version don't compare
+RESULTS_VERSION = 1
+# changes smaller than this (seconds) are noise whatever the ratio
+MIN_DIFFERENCE = 0.002
+
+
+def measure(function, repeat: int, memory: bool = True) -> dict:
+    ''' Seconds of every call to `function` and the most memory one call had allocated at once. '''
+    seconds = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        seconds.append(perf_counter() - start)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'seconds': seconds,
+        'best': min(seconds),
+        'median': float(np.median(seconds)),
+        'peak_bytes': peak,
+    }
+
+
+def draw_graph(lsd: LiveSplitData, graph: Graph, split_index: int, options: argparse.Namespace):
+    ''' Draw `graph` the way export does, all the way to pixels. '''
+    segment_frames = ()
+    if graph.is_split_graph:
+        distribution = lsd.segment_distribution() if graph == Graph.HISTOGRAM else None
+        segment_frames = (lsd.segment_times, lsd.avg_segment_times, distribution)
+
+    fig = Figure(figsize=options.size, dpi=options.dpi, layout="tight")
+    FigureCanvasAgg(fig)
+    plot = Plot(
+        livesplit_data=lsd,
+        split_name=lsd.split_names[split_index],
+        split_index=split_index,
+        theme=Theme.from_variant(ThemeVariant.SHADOW),
+        fig=fig,
+    )
+    plot.draw(graph, *segment_frames)
+    fig.canvas.draw()
+
+
+def stages(path: str, options: argparse.Namespace):
+    ''' (name, function) of every stage on the file at `path`, in the order they're run. Each one can be run
+        any number of times and leaves the data the way the next one needs it.
+    '''
+    lsd = LiveSplitData(path, use_cache=False, fetch_variables=False)
+    split_index = options.split
+
+    def load():
+        LiveSplitData(path, use_cache=False, fetch_variables=False)
+
+    def cached_load():
+        LiveSplitData(path, use_cache=True, fetch_variables=False)
+
+    # the data keeps these once they're built, so they're built here on the side
+    def segment_matrix(histories):
+        return lambda: SegmentMatrix.from_histories(histories, lsd.pb_id)
+
+    def best_segments():
+        BestSegments.from_matrix(lsd.segment_matrix)
+
+    def reset_analysis():
+        ResetAnalysis(splits_reached(lsd.segment_matrix, lsd.attempts), lsd.attempts.finished, len(lsd.split_names))
+
+    def extract_segment_data():
+        lsd.segment_view = None
+        lsd.extract_segment_data(split_index, show_outliers=True)
+
+    def remove_outliers(strategy: OutlierStrategy):
+        return lambda: lsd.remove_segment_outliers(strategy)
+
+    def distribution():
+        Distribution(lsd.segment_times["seconds"].to_numpy())
+
+    def prepare_graphs():
+        # the split graphs are drawn like the window shows them first, without outliers
+        lsd.segment_view = None
+        lsd.extract_segment_data(split_index, show_outliers=False)
+
+    def render(graph: Graph):
+        return lambda: draw_graph(lsd, graph, split_index, options)
+
+    yield "load", load
+    # the first one stores the cache entry, the timed ones read it
+    cached_load()
+    yield "cached load", cached_load
+    yield "parse", lambda: lsd.load_file(path)
+    yield "category data", lsd.extract_category_data
+    # the matrix drops the histories it's made from
+    yield "segment matrix", segment_matrix(lsd.segment_histories)
+    yield "best segments", best_segments
+    yield "reset analysis", reset_analysis
+    yield "segment data", extract_segment_data
+    for strategy in OutlierStrategy:
+        yield f"outliers {strategy.name.lower()}", remove_outliers(strategy)
+    yield "distribution", distribution
+    prepare_graphs()
+    for graph in options.graphs:
+        yield f"render {graph.value.lower()}", render(graph)
+
+
+def run_size(attempts: int, work_dir: str, options: argparse.Namespace) -> dict:
+    path = os.path.join(work_dir, f"generated-{attempts}.lss")
+    start = perf_counter()
+    generate_lss(path, attempts, options.splits, options.reset_rate, options.skip_rate, options.gold_rate, options.days, seed=options.seed)
+    print(f"{attempts} attempts: generated {os.path.getsize(path) / 2**20:.1f} MB in {perf_counter() - start:.2f}s", file=sys.stderr)
+
+    results = {}
+    for name, function in stages(path, options):
+        results[name] = measure(function, options.repeat, options.memory)
+        peak = results[name]['peak_bytes']
+        memory = f", peak {peak / 2**20:.1f} MB" if peak is not None else ""
+        print(f"  {name:<32} {results[name]['median'] * 1000:9.1f}ms{memory}", file=sys.stderr)
+
+    return {
+        'attempts': attempts,
+        'splits': options.splits,
+        'file_bytes': os.path.getsize(path),
+        'stages': results,
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return output.stdout.strip() or None
+
+
+def environment() -> dict:
+    import pandas
+
+    return {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pandas.__version__,
+        'matplotlib': matplotlib.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, file=sys.stdout) -> list[str]:
+    ''' Print how the best time of every stage moved since `baseline`, returns the stages that got slower than
+        `tolerance` allows. The best of a few runs is the one least thrown off by whatever else the machine was doing.
+    '''
+    if baseline.get('version') != results['version']:
+        print(f"baseline is of results version {baseline.get('version')}, not {results['version']}, not comparing", file=sys.stderr)
+        return []
+
+    old_sizes = {(size['attempts'], size['splits']): size for size in baseline['sizes']}
+    print(f"compared to {baseline['environment'].get('commit') or 'baseline'} ({baseline['created']}):", file=file)
+    slower = []
+    for size in results['sizes']:
+        old = old_sizes.get((size['attempts'], size['splits']))
+        if old is None:
+            continue
+        print(f"  {size['attempts']} attempts", file=file)
+        for name, stage in size['stages'].items():
+            if name not in old['stages']:
+                continue
+            before, after = old['stages'][name]['best'], stage['best']
+            change = after / before - 1 if before > 0 else 0.0
+            flag = ""
+            if abs(after - before) < MIN_DIFFERENCE:
+                pass
+            elif change > tolerance:
+                flag = "  slower"
+                slower.append(f"{size['attempts']} attempts: {name}")
+            elif change < -tolerance:
+                flag = "  faster"
+            print(f"    {name:<32} {before * 1000:9.1f}ms -> {after * 1000:9.1f}ms {change:+7.1%}{flag}", file=file)
+    return slower
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark loading and drawing generated splits files.")
+    parser.add_argument('-n', '--sizes', type=int, nargs='+', default=list(SIZES), help="attempts in the generated files (default: 1000 10000 100000)")
+    parser.add_argument('-s', '--splits', type=int, default=20, help="(default: 20)")
+    parser.add_argument('--reset-rate', type=float, default=0.05, help="chance of a reset on every segment (default: 0.05)")
+    parser.add_argument('--skip-rate', type=float, default=0.01, help="chance of skipping a split (default: 0.01)")
+    parser.add_argument('--gold-rate', type=float, default=0.002, help="chance of a segment time being a gold (default: 0.002)")
+    parser.add_argument('--days', type=int, default=365, help="days the attempts are spread over (default: 365)")
+    parser.add_argument('--seed', type=int, default=0, help="(default: 0)")
+    parser.add_argument('--split', type=int, default=0, help="split the segment stages and split graphs use (default: 0)")
+    parser.add_argument('-g', '--graphs', nargs='+', type=Graph.from_str, default=list(Graph), help="graphs to draw (default: all)")
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--size', type=float, nargs=2, default=(10, 6), metavar=('WIDTH', 'HEIGHT'), help="figure size in inches (default: 10 6)")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help="timed runs of every stage (default: 3)")
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help="skip the extra run that measures peak memory")
+    parser.add_argument('-o', '--out', default=None, help="JSON file to write the results to (default: standard output)")
+    parser.add_argument('--compare', default=None, metavar='RESULTS', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.1, help="slowdown of a best time that counts as a regression (default: 0.1)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    options = parse_enum_args(parse_args, argv)
+    if options is None:
+        return 2
+    if options.repeat < 1 or options.splits < 1 or not 0 <= options.split < options.splits:
+        print("repeat and splits have to be at least 1 and split one of the splits", file=sys.stderr)
+        return 2
+
+    baseline = None
+    if options.compare is not None:
+        try:
+            with open(options.compare, encoding='utf-8') as file:
+                baseline = json.load(file)
+        except (OSError, ValueError) as e:
+            print(e, file=sys.stderr)
+            return 1
+
+    results = {
+        'version': RESULTS_VERSION,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'settings': {
+            'splits': options.splits,
+            'reset_rate': options.reset_rate,
+            'skip_rate': options.skip_rate,
+            'gold_rate': options.gold_rate,
+            'days': options.days,
+            'seed': options.seed,
+            'split': options.split,
+            'repeat': options.repeat,
+            'dpi': options.dpi,
+            'size': list(options.size),
+        },
+        'sizes': [],
+    }
+
+    with tempfile.TemporaryDirectory(prefix='livesplit-graphs-benchmark-') as work_dir:
+        # the parse cache goes to the scratch directory, not the user's
+        os.environ['LOCALAPPDATA'] = os.environ['XDG_CACHE_HOME'] = work_dir
+        for attempts in options.sizes:
+            results['sizes'].append(run_size(attempts, work_dir, options))
+
+    if options.out is None:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        with open(options.out, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+
+    if baseline is not None:
+        # the results went to standard output already
+        slower = compare(results, baseline, options.tolerance, sys.stdout if options.out is not None else sys.stderr)
+        if slower:
+            print(f"{len(slower)} stages got slower", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
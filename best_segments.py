@@ -0,0 +1,135 @@
+import numpy as np
+
+from segment_matrix import SegmentMatrix
+
+
+# running best of a segment that has no time yet
+NO_TIME = np.iinfo(np.int64).max
+
+
+def segment_starts(valid: np.ndarray) -> np.ndarray:
+    ''' Split every segment time starts from: right after the last split before it that has a time, 0 when there's none.
+
+        A time after skipped splits starts before its own segment and covers the skipped ones too.
+    '''
+    segment_count = valid.shape[1]
+    ends = np.where(valid, np.arange(1, segment_count + 1), 0)
+    starts = np.zeros_like(ends)
+    starts[:, 1:] = np.maximum.accumulate(ends, axis=1)[:, :-1]
+    return starts
+
+
+def shortest_times(edges: np.ndarray, distances: np.ndarray, first_changed: int = 1):
+    ''' Fastest time from the first split boundary to every other one through `edges` (boundary x boundary times, inf
+        where there's none), in place. Boundaries before `first_changed` are kept as they are.
+    '''
+    distances[0] = 0
+    for end in range(max(first_changed, 1), len(edges)):
+        distances[end] = (distances[:end] + edges[:end, end]).min()
+
+
+class BestSegments():
+    ''' Golds and sum of best of every segment of a `SegmentMatrix`, worked out for all segments at once with a
+        running minimum down the attempts.
+
+        - `best`: gold (ticks) of every segment, `NO_TIME` for a segment that was never finished on its own
+        - `gold_rows`, `gold_segments`, `gold_times`, `previous_times`: every time a gold was set, in row order:
+          matrix row, segment, the new gold and the one it beat (`NO_TIME` for a segment's first time)
+        - `sob_rows`, `sob`: the sum of best after every row that lowered it, once there is one
+
+        A time after skipped splits covers several segments, it's never a gold but the sum of best can go
+        through it like LiveSplit's does. `extend` takes in rows appended to the matrix later without going over
+        the older ones again.
+    '''
+    def __init__(self, segment_count: int):
+        empty = np.empty(0, dtype=np.int64)
+        self.best = np.full(segment_count, NO_TIME, dtype=np.int64)
+        self.gold_rows, self.gold_segments, self.gold_times, self.previous_times = empty, empty, empty, empty
+        self.sob_rows, self.sob = empty, empty
+        self.sum_of_best: int | None = None
+
+        # best time from every split boundary to every later one, and the fastest way to each boundary through them
+        self.edges = np.full((segment_count + 1, segment_count + 1), np.inf)
+        self.distances = np.full(segment_count + 1, np.inf)
+        # rows of the matrix already taken in
+        self.rows = 0
+
+    @staticmethod
+    def from_matrix(matrix: SegmentMatrix) -> 'BestSegments':
+        best_segments = BestSegments(matrix.segment_count)
+        best_segments.extend(matrix)
+        return best_segments
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.best, self.gold_rows, self.gold_segments, self.gold_times, self.previous_times, self.sob_rows, self.sob, self.edges, self.distances)
+        return sum(array.nbytes for array in arrays)
+
+    def extend(self, matrix: SegmentMatrix):
+        ''' Take in the rows added to `matrix` since the last call. '''
+        times, valid = matrix.times[self.rows:], matrix.valid[self.rows:]
+        if len(times) == 0:
+            return
+
+        starts = segment_starts(valid)
+        own = valid & (starts == np.arange(matrix.segment_count))
+
+        # the golds so far go on top, so the running minimum carries on from them
+        candidates = np.where(own, times, NO_TIME)
+        running = np.minimum.accumulate(np.vstack((self.best, candidates)), axis=0)
+        previous, running = running[:-1], running[1:]
+
+        rows, segments = np.nonzero(running < previous)
+        gold_times = running[rows, segments]
+        self.gold_rows = np.concatenate((self.gold_rows, rows + self.rows))
+        self.gold_segments = np.concatenate((self.gold_segments, segments))
+        self.gold_times = np.concatenate((self.gold_times, gold_times))
+        self.previous_times = np.concatenate((self.previous_times, previous[rows, segments]))
+        self.best = running[-1].copy()
+
+        # every edge between split boundaries that got faster, golds and times through skipped splits
+        combined = self.combined_improvements(times, valid & ~own, starts)
+        update_rows = np.concatenate((rows, combined[0]))
+        update_starts = np.concatenate((segments, combined[1]))
+        update_ends = np.concatenate((segments + 1, combined[2]))
+        update_times = np.concatenate((gold_times, combined[3]))
+
+        # the sum only moves on rows that made an edge faster
+        order = np.argsort(update_rows, kind='stable')
+        changed_rows, firsts = np.unique(update_rows[order], return_index=True)
+        lasts = np.append(firsts[1:], len(order))
+        sob_rows, sob = [], []
+        for row, first, last in zip(changed_rows, firsts, lasts):
+            group = order[first:last]
+            np.minimum.at(self.edges, (update_starts[group], update_ends[group]), update_times[group].astype(np.float64))
+            shortest_times(self.edges, self.distances, update_ends[group].min())
+            total = self.distances[-1]
+            if np.isfinite(total) and (self.sum_of_best is None or total < self.sum_of_best):
+                self.sum_of_best = int(total)
+                sob_rows.append(row + self.rows)
+                sob.append(self.sum_of_best)
+
+        self.sob_rows = np.concatenate((self.sob_rows, np.array(sob_rows, dtype=np.int64)))
+        self.sob = np.concatenate((self.sob, np.array(sob, dtype=np.int64)))
+        self.rows += len(times)
+
+    def combined_improvements(self, times: np.ndarray, combined: np.ndarray, starts: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        ''' Rows, start and end boundaries and times of the times through skipped splits that beat every earlier one over the same splits. '''
+        rows, ends = np.nonzero(combined)
+        starts, ends, times = starts[rows, ends], ends + 1, times[rows, ends]
+        keep = np.zeros(len(rows), dtype=bool)
+
+        # few distinct stretches of skipped splits, each gets its own running minimum
+        edge_keys = starts * len(self.edges) + ends
+        for key in np.unique(edge_keys):
+            members = np.flatnonzero(edge_keys == key)
+            best_before = self.edges[starts[members[0]], ends[members[0]]]
+            running = np.minimum.accumulate(np.concatenate(([best_before], times[members])))
+            keep[members] = times[members] < running[:-1]
+
+        return rows[keep], starts[keep], ends[keep], times[keep]
+
+    def golds_of_row(self, row: int) -> np.ndarray:
+        ''' Positions (in the `gold_*` arrays) of the golds set by matrix row `row`. '''
+        start, end = np.searchsorted(self.gold_rows, (row, row + 1))
+        return np.arange(start, end)
@@ -0,0 +1,133 @@
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from livesplit_data import LiveSplitData
+from graph import Graph
+from outliers import outlier_mask
+from graph_options import OutlierStrategy
+from history import HistoryRange
+import livesplit_time
+
+
+# graphs that can show several files at once
+COMPARISON_GRAPHS = (Graph.HISTOGRAM, Graph.IMP_OVER_ATTEMPTS, Graph.PB_OVER_TIME, Graph.PB_OVER_ATTEMPTS)
+
+
+def read_columns(path: str) -> tuple:
+    ''' Runs in a worker process. Parses one file (or takes it from the parse cache), only its columns are sent back. '''
+    return LiveSplitData(path, fetch_variables=False).to_columns()
+
+
+def load_files(paths: list[str], max_workers: int | None = None) -> tuple[list[LiveSplitData], dict[str, Exception]]:
+    '''
+    Load every file, spread over up to `max_workers` processes (one per CPU by default).
+
+    Returns the files that could be read, in the order of `paths`, and the error of every one that couldn't.
+    '''
+    paths = list(dict.fromkeys(paths))
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(paths)))
+
+    columns = {}
+    errors = {}
+    if max_workers == 1:
+        # starting a process costs more than reading a single file
+        for path in paths:
+            try:
+                columns[path] = read_columns(path)
+            except Exception as e:
+                errors[path] = e
+    else:
+        # forking a process that runs Qt and worker threads isn't safe, start clean interpreters instead
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+            futures = {executor.submit(read_columns, path): path for path in paths}
+            for future in as_completed(futures):
+                try:
+                    columns[futures[future]] = future.result()
+                except Exception as e:
+                    errors[futures[future]] = e
+
+    # headers show the variables of the first file, they're all the same category
+    loaded = [path for path in paths if path in columns]
+    runs = [LiveSplitData(path, fetch_variables=index == 0, columns=columns[path]) for index, path in enumerate(loaded)]
+    return runs, errors
+
+
+def runner_names(paths: list[str]) -> list[str]:
+    ''' File names without extension, numbered where several files have the same name. '''
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    totals = Counter(stems)
+    seen = Counter()
+    names = []
+    for stem in stems:
+        seen[stem] += 1
+        names.append(stem if totals[stem] == 1 else f"{stem} ({seen[stem]})")
+    return names
+
+
+def split_keys(split_names: list[str]) -> list[tuple[str, int]]:
+    ''' (name, how many splits before it had the same name) for every split, so repeated names line up in order. '''
+    seen = Counter()
+    keys = []
+    for name in split_names:
+        keys.append((name, seen[name]))
+        seen[name] += 1
+    return keys
+
+
+class Comparison():
+    ''' Files of several runners of the same category, with their splits matched up by name.
+
+        Splits are listed in the order they first come up in the files. A file that doesn't have a split
+        is left out of that split's graphs.
+    '''
+    def __init__(self, runs: list[LiveSplitData], names: list[str] | None = None):
+        self.runs = runs
+        self.names = names if names is not None else runner_names([run.path for run in runs])
+
+        self.split_keys: list[tuple[str, int]] = []
+        # per run, the position of every split key in that file
+        self.split_positions: list[dict[tuple[str, int], int]] = []
+        for run in runs:
+            positions = {key: position for position, key in enumerate(split_keys(run.split_names))}
+            self.split_keys += [key for key in positions if key not in self.split_keys]
+            self.split_positions.append(positions)
+
+    def __len__(self):
+        return len(self.runs)
+
+    @property
+    def identity(self) -> tuple:
+        ''' Changes whenever any of the files does, for cache keys. '''
+        return tuple(run.file_identity for run in self.runs)
+
+    @property
+    def split_names(self) -> list[str]:
+        return [name if repeat == 0 else f"{name} ({repeat + 1})" for name, repeat in self.split_keys]
+
+    def split_index(self, run: int, split: int) -> int | None:
+        ''' Position in file `run` of split `split` of the comparison, None when that file doesn't have it. '''
+        return self.split_positions[run].get(self.split_keys[split])
+
+    def segment_seconds(self, split: int, show_outliers: bool, outlier_strategy=OutlierStrategy.STANDARD_DEVIATION, outlier_threshold: float | None = None, history_range: HistoryRange | None = None) -> list[np.ndarray | None]:
+        ''' Times (seconds) of a split for every run, None for runs without that split. Outliers are removed per run,
+            only the attempts in `history_range` of every file are taken.
+        '''
+        seconds = []
+        for run_index, run in enumerate(self.runs):
+            index = self.split_index(run_index, split)
+            if index is None:
+                seconds.append(None)
+                continue
+
+            first_row, last_row = run.query(history_range).row_range
+            _, ticks, _ = run.segment_matrix.column(index, first_row, last_row, history_range is not None and history_range.finished_only)
+            times = ticks / livesplit_time.TICKS_PER_SECOND
+            if not show_outliers and len(times):
+                times = times[outlier_mask(times, outlier_strategy, outlier_threshold)]
+            seconds.append(times)
+        return seconds
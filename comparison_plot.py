@@ -0,0 +1,186 @@
+import numpy as np
+import matplotlib
+import matplotlib.dates as mdates
+from matplotlib.figure import Figure
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.lines import Line2D
+
+from comparison import Comparison
+from plot import Plot
+from theme import Theme
+from graph import Graph
+from lod import LodLine
+from distribution import bin_edges
+from graph_options import BinRule
+from history import HistoryRange
+import livesplit_time
+import time_axis
+
+
+# a legend past this many runners covers the graph, hovering a line tells whose it is
+MAX_LEGEND_ENTRIES = 12
+
+
+def runner_colors(count: int) -> np.ndarray:
+    ''' One distinct colour per runner, the same in every theme. '''
+    if count <= 10:
+        return matplotlib.colormaps['tab10'](np.arange(count))
+    if count <= 20:
+        return matplotlib.colormaps['tab20'](np.arange(count))
+    return matplotlib.colormaps['turbo'](np.linspace(0, 1, count))
+
+
+class ComparisonPlot(Plot):
+    ''' The graphs of `Plot` with one line or histogram per file of a `Comparison` on the same axes. '''
+    def __init__(self, comparison: Comparison, split_name, split_index, theme: Theme, show_outliers=False, fig: Figure | None = None, history_range: HistoryRange | None = None):
+        # headers come from the first file, they're all the same category
+        super().__init__(comparison.runs[0], split_name, split_index, theme, show_outliers, fig, history_range)
+        self.comparison = comparison
+        self.histories = [run.query(history_range) for run in comparison.runs]
+        self.colors = runner_colors(len(comparison))
+
+        # run drawn by every line, for the annotation
+        self.line_runs: dict[Line2D, int] = {}
+
+    def set_history_range(self, history_range: HistoryRange | None):
+        super().set_history_range(history_range)
+        self.histories = [run.query(history_range) for run in self.comparison.runs]
+
+    def clear_graph(self):
+        super().clear_graph()
+        self.line_runs.clear()
+
+    def draw(self, graph: Graph, segment_seconds: list[np.ndarray | None] | None = None) -> Figure:
+        '''
+        Draw `graph` for every file. The histogram takes what `Comparison.segment_seconds` returned for the split.
+        '''
+        self.graph = graph
+        match graph:
+            case Graph.HISTOGRAM:
+                self.hist(segment_seconds)
+            case Graph.IMP_OVER_ATTEMPTS:
+                self.imp_over_attempts()
+            case Graph.PB_OVER_TIME:
+                self.personal_best_over_time()
+            case Graph.PB_OVER_ATTEMPTS:
+                self.personal_best_over_attempts()
+            case _:
+                raise NotImplementedError("This graph can't compare files.")
+
+        if len(self.line_runs) or graph == Graph.HISTOGRAM:
+            self.add_legend()
+        self.ax.grid(True)
+        return self.fig
+
+    def hist(self, segment_seconds: list[np.ndarray | None]) -> Figure:
+        '''
+        Outline of every file's histogram over the same bins, as a share of that file's times so runners with
+        more attempts don't dwarf the others.
+        '''
+        present = [seconds for seconds in segment_seconds if seconds is not None and len(seconds)]
+        edges = bin_edges(np.concatenate(present), BinRule.FREEDMAN_DIACONIS) if present else 10
+
+        for run, seconds in enumerate(segment_seconds):
+            if seconds is None or len(seconds) == 0:
+                continue
+            weights = np.full(len(seconds), 100 / len(seconds))
+            self.ax.hist(seconds, bins=edges, weights=weights, histtype='step', linewidth=1.5, color=self.colors[run], label=self.comparison.names[run])
+
+        time_axis.set_duration_axis(self.ax.xaxis)
+
+        runners = sum(seconds is not None for seconds in segment_seconds)
+        self.set_axes_headers(title=f"{self.split_name} Histogram ({runners} runners)", title_color=self.theme.title_color)
+        self.ax.set_xlabel("Time")
+        self.ax.set_ylabel("Share of Times (%)")
+        self.ax.set_axisbelow(True)
+
+        return self.fig
+
+    def imp_over_attempts(self) -> Figure:
+        for run, history in enumerate(self.histories):
+            line, = self.ax.plot(history.finished_indexes, history.finished_times / livesplit_time.TICKS_PER_SECOND, color=self.colors[run], linewidth=1, label=self.comparison.names[run])
+            self.line_runs[line] = run
+            self.lod_artists.append(LodLine(line))
+
+        time_axis.set_duration_axis(self.ax.yaxis)
+
+        self.set_axes_headers(title=f"Improvement Over Attempts ({len(self.comparison)} runners)", title_color=self.theme.title_color)
+        self.ax.set_xlabel("Attempts")
+        self.ax.set_ylabel("Run Time")
+        self.ax.set_axisbelow(True)
+
+        self.update_lod()
+
+        return self.fig
+
+    def personal_best_over_time(self) -> Figure:
+        for run, history in enumerate(self.histories):
+            self.plot_run_pb_line(run, time_axis.to_date_numbers(history.pb_dates), history.pb_times / livesplit_time.TICKS_PER_SECOND)
+
+        time_axis.set_duration_axis(self.ax.yaxis)
+        time_axis.set_date_axis(self.ax.xaxis)
+
+        self.set_axes_headers(title=f"Personal Best Over Time ({len(self.comparison)} runners)", title_color=self.theme.title_color)
+        self.ax.set_xlabel("Date")
+        self.ax.set_ylabel("Run Time")
+        self.ax.set_axisbelow(True)
+
+        return self.fig
+
+    def personal_best_over_attempts(self) -> Figure:
+        for run, history in enumerate(self.histories):
+            self.plot_run_pb_line(run, history.pb_abs_indexes, history.pb_times / livesplit_time.TICKS_PER_SECOND)
+
+        time_axis.set_duration_axis(self.ax.yaxis)
+
+        self.set_axes_headers(title=f"Personal Best Over Attempts ({len(self.comparison)} runners)", title_color=self.theme.title_color)
+        self.ax.set_xlabel("Attempts")
+        self.ax.set_ylabel("Run Time")
+        self.ax.set_axisbelow(True)
+
+        return self.fig
+
+    def plot_run_pb_line(self, run: int, x, pb_times):
+        line, = self.ax.plot(x, pb_times, color=self.colors[run], linewidth=1.5, marker="o", markersize=3.5, label=self.comparison.names[run])
+        self.line_runs[line] = run
+
+    def add_legend(self):
+        if len(self.comparison) > MAX_LEGEND_ENTRIES:
+            return
+        legend = self.ax.legend(loc="upper right", fontsize="small")
+        legend.set_draggable(True)
+
+    def hover_plot(self, event: MouseEvent, graph: Graph):
+        """
+        Annotate the point of any runner's line under the cursor with the runner and their time.
+        """
+        if event.inaxes != self.ax or not self.line_runs:
+            return
+
+        hovered = None
+        for line in reversed(list(self.line_runs)):
+            xy = line.get_xydata()
+            # LOD lines are hovered on the points they currently draw
+            index = self.hover_index(line, xy).nearest(event.x, event.y, line.get_pickradius())
+            if index is not None:
+                hovered = (line, tuple(xy[index]))
+                break
+
+        if hovered is None:
+            self.hide_annot()
+            return
+
+        if hovered != self.hovered:
+            self.update_run_annot(graph, *hovered)
+        self.show_annot(hovered)
+
+    def update_run_annot(self, graph: Graph, line: Line2D, xy: tuple[float, float]):
+        x, seconds = xy
+        match graph:
+            case Graph.PB_OVER_TIME:
+                where = self.format_date(np.datetime64(mdates.num2date(x).date(), 'D'))
+            case _:
+                where = f"#{int(x)}"
+
+        self.annot.xy = xy
+        self.annot.set_text(f"{self.comparison.names[self.line_runs[line]]}\n{where}\n{time_axis.format_duration(seconds, 3, seconds >= 3600)}")
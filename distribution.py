@@ -0,0 +1,121 @@
+import math
+
+import numpy as np
+
+from graph_options import BinRule
+
+
+# more bins than this are thinner than a pixel on a normal sized window
+MAX_BINS = 200
+# points the density curve is worked out on, the cost of the convolution only depends on this
+KDE_POINTS = 512
+
+
+def bin_width(seconds: np.ndarray, rule: BinRule, width: float | None = None) -> float:
+    ''' Width (seconds) of the bins `rule` picks for `seconds`, `width` is the one of fixed width bins. '''
+    match rule:
+        case BinRule.FREEDMAN_DIACONIS:
+            q1, q3 = np.percentile(seconds, [25, 75])
+            return 2 * (q3 - q1) * len(seconds) ** (-1 / 3)
+        case BinRule.SCOTT:
+            return 3.49 * seconds.std() * len(seconds) ** (-1 / 3)
+        case BinRule.FIXED:
+            return width if width is not None else 1.0
+        case _:
+            raise NotImplementedError("No support for this binning rule")
+
+
+def bin_edges(seconds: np.ndarray, rule: BinRule, width: float | None = None) -> np.ndarray:
+    ''' Evenly spaced edges covering `seconds`, on multiples of the width so neighbouring views line up.
+
+        Falls back to 10 bins when the rule gives no width (all times in the middle half the same) and to
+        `MAX_BINS` wider bins when it gives too many.
+    '''
+    low, high = float(seconds.min()), float(seconds.max())
+    if high == low:
+        return np.array([low - 0.5, low + 0.5])
+
+    step = bin_width(seconds, rule, width)
+    if not step > 0:
+        step = (high - low) / 10
+
+    start = math.floor(low / step) * step
+    count = max(1, math.ceil((high - start) / step))
+    if count > MAX_BINS:
+        start, count, step = low, MAX_BINS, (high - low) / MAX_BINS
+    return start + np.arange(count + 1) * step
+
+
+def kde(seconds: np.ndarray, points: int = KDE_POINTS) -> tuple[np.ndarray, np.ndarray] | None:
+    '''
+    Gaussian kernel density estimate of `seconds` on `points` evenly spaced positions, None for fewer than 2
+    distinct times.
+
+    The times are spread linearly onto the grid and the kernel is applied with one FFT convolution, so
+    100k times cost a couple of bincounts rather than 100k kernels. Bandwidth from Silverman's rule.
+    '''
+    count = len(seconds)
+    if count < 2:
+        return None
+    q1, q3 = np.percentile(seconds, [25, 75])
+    spread = min(seconds.std(), (q3 - q1) / 1.34) or seconds.std()
+    if not spread > 0:
+        return None
+    bandwidth = 0.9 * spread * count ** -0.2
+
+    low, high = seconds.min() - 3 * bandwidth, seconds.max() + 3 * bandwidth
+    grid = np.linspace(low, high, points)
+    step = grid[1] - grid[0]
+
+    # every time split between the two grid points around it
+    position = (seconds - low) / step
+    left = np.minimum(position.astype(np.int64), points - 2)
+    right_share = position - left
+    weights = np.bincount(left, 1 - right_share, minlength=points) + np.bincount(left + 1, right_share, minlength=points)
+
+    reach = min(math.ceil(4 * bandwidth / step), points - 1)
+    offsets = np.arange(-reach, reach + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * math.sqrt(2 * math.pi))
+
+    # zero padded so the convolution doesn't wrap around
+    size = 1 << (points + len(kernel) - 2).bit_length()
+    density = np.fft.irfft(np.fft.rfft(weights, size) * np.fft.rfft(kernel, size), size)[reach:reach + points] / count
+    return grid, np.maximum(density, 0)
+
+
+class Distribution():
+    ''' Histogram counts, density curve and percentiles of some times, worked out once and drawn any number of times.
+
+        - `edges`, `counts`: the bins and how many times fall in each
+        - `density_x`, `density_y`: the density curve scaled to the counts, None without one
+        - `best`, `median`, `p90`: percentile markers (seconds)
+    '''
+    def __init__(self, seconds: np.ndarray, rule: BinRule = BinRule.FREEDMAN_DIACONIS, width: float | None = None, density: bool = True):
+        seconds = np.asarray(seconds, dtype=np.float64)
+        self.rule = rule
+        self.count = len(seconds)
+        self.density_x, self.density_y = None, None
+
+        if self.count == 0:
+            self.edges, self.counts = np.array([0.0, 1.0]), np.zeros(1, dtype=np.int64)
+            self.best = self.median = self.p90 = np.nan
+            return
+
+        self.edges = bin_edges(seconds, rule, width)
+        self.counts, _ = np.histogram(seconds, self.edges)
+        self.best = float(seconds.min())
+        self.median, self.p90 = (float(value) for value in np.percentile(seconds, [50, 90]))
+
+        curve = kde(seconds) if density else None
+        if curve is not None:
+            # density times the count in a bin, on the same scale as the bars
+            self.density_x, self.density_y = curve[0], curve[1] * self.count * (self.edges[1] - self.edges[0])
+
+    @property
+    def markers(self) -> list[tuple[str, float]]:
+        return [("Best", self.best), ("Median", self.median), ("90th percentile", self.p90)]
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.edges, self.counts, self.density_x, self.density_y)
+        return sum(array.nbytes for array in arrays if array is not None)
@@ -0,0 +1,249 @@
+'''
+Render graphs of one or more splits files to image files without opening the window.
+
+    python export.py "Any%.lss" -g hist "moving avg" -t Shadow Miami -f png svg -o cards
+
+Every combination of the given graphs, splits and themes is rendered with the Agg backend on a process
+pool. Files are named `<out>/<file>/<graph>[_<split #>-<split>]_<theme>.<format>`.
+'''
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+
+import numpy as np
+
+# before pyplot gets imported through plot, nothing here may pull in Qt
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from livesplit_data import LiveSplitData
+from plot import Plot
+from theme import Theme, ThemeVariant
+from graph import Graph
+from graph_options import BinRule, OutlierStrategy
+from history import HistoryRange
+
+
+FORMATS = ('png', 'svg')
+
+
+class ExportTask():
+    ''' Everything one worker renders from a single extraction: one graph of one split (or of the whole
+        category, `split_index` None) in every requested theme and format.
+    '''
+    def __init__(self, path: str, graph: Graph, split_index: int | None, split_name: str | None, options: argparse.Namespace):
+        self.path = path
+        self.graph = graph
+        self.split_index = split_index
+        self.split_name = split_name
+        self.options = options
+
+
+def slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', str(text).lower()).strip('-') or 'unnamed'
+
+
+def output_path(out_dir: str, path: str, graph: Graph, split_index: int | None, split_name: str | None, theme: ThemeVariant, format: str) -> str:
+    name = slug(graph.value)
+    if split_index is not None:
+        name += f"_{split_index:02d}-{slug(split_name)}"
+    name += f"_{slug(theme.value)}.{format}"
+    return os.path.join(out_dir, slug(os.path.splitext(os.path.basename(path))[0]), name)
+
+
+# files already loaded by this worker process
+_loaded: dict[str, LiveSplitData] = {}
+
+def load(path: str, fetch_variables: bool) -> LiveSplitData:
+    lsd = _loaded.get(path)
+    if lsd is None:
+        lsd = LiveSplitData(path, fetch_variables=fetch_variables)
+        # the headers are drawn once, there's no window to refresh them later
+        lsd.wait_for_variables()
+        _loaded[path] = lsd
+    return lsd
+
+
+def render(task: ExportTask) -> list[tuple[str, float]]:
+    ''' Runs in a worker. Returns every written file with the seconds it took to draw the figure and save the file. '''
+    options = task.options
+    lsd = load(task.path, options.variables)
+    history_range = HistoryRange(options.attempts, options.dates, options.last_days, options.finished_only)
+
+    segment_frames = ()
+    if task.graph.is_split_graph:
+        lsd.extract_segment_data(
+            segment_index=task.split_index,
+            show_outliers=options.show_outliers,
+            outlier_strategy=options.outlier_strategy,
+            outlier_threshold=options.outlier_threshold,
+            window=options.window,
+            history_range=history_range,
+        )
+        distribution = None
+        if task.graph == Graph.HISTOGRAM:
+            distribution = lsd.segment_distribution(options.bins, options.bin_width if options.bins == BinRule.FIXED else None, options.density)
+        segment_frames = (lsd.segment_times, lsd.avg_segment_times, distribution)
+
+    written = []
+    for variant in options.themes:
+        start = perf_counter()
+        fig = Figure(figsize=options.size, dpi=options.dpi, layout="tight")
+        FigureCanvasAgg(fig)
+        plot = Plot(
+            livesplit_data=lsd,
+            split_name=task.split_name,
+            split_index=task.split_index,
+            theme=Theme.from_variant(variant),
+            show_outliers=options.show_outliers,
+            fig=fig,
+            history_range=history_range,
+        )
+        plot.draw(task.graph, *segment_frames)
+        draw_seconds = perf_counter() - start
+
+        # every format is saved from the same figure, each file counts the drawing and its own save
+        for format in options.formats:
+            start = perf_counter()
+            target = output_path(options.out, task.path, task.graph, task.split_index, task.split_name, variant, format)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            fig.savefig(target, facecolor=fig.get_facecolor())
+            written.append((target, draw_seconds + perf_counter() - start))
+
+    return written
+
+
+def select_splits(split_names: list[str], selection: list[str] | None) -> list[int]:
+    ''' Indexes of the splits picked by number or name, every split without a selection. '''
+    if not selection:
+        return list(range(len(split_names)))
+
+    indexes = []
+    for item in selection:
+        if item.isdigit() and int(item) < len(split_names):
+            indexes.append(int(item))
+        elif item in split_names:
+            indexes.append(split_names.index(item))
+        else:
+            raise ValueError(f"No split {item!r}")
+    return indexes
+
+
+def make_tasks(options: argparse.Namespace) -> tuple[list[ExportTask], dict[str, float]]:
+    tasks = []
+    load_times = {}
+    for path in options.files:
+        # parse once here so the workers find the file in the parse cache
+        start = perf_counter()
+        lsd = load(path, options.variables)
+        load_times[path] = perf_counter() - start
+
+        split_indexes = select_splits(lsd.split_names, options.splits)
+        for graph in options.graphs:
+            if graph.is_split_graph:
+                tasks += [ExportTask(path, graph, i, lsd.split_names[i], options) for i in split_indexes]
+            else:
+                tasks.append(ExportTask(path, graph, None, None, options))
+    return tasks, load_times
+
+
+def day(text: str) -> np.datetime64:
+    try:
+        return np.datetime64(text, 'D')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a date: {text!r}")
+
+
+def bound(parse):
+    ''' An argument type that also takes - for no bound. '''
+    def parse_bound(text: str):
+        return None if text == '-' else parse(text)
+    parse_bound.__name__ = parse.__name__
+    return parse_bound
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export LiveSplit graphs to image files.")
+    parser.add_argument('files', nargs='+', help=".lss files")
+    parser.add_argument('-o', '--out', default='export', help="output directory (default: export)")
+    parser.add_argument('-g', '--graphs', nargs='+', type=Graph.from_str, default=list(Graph), help="graphs to draw (default: all)")
+    parser.add_argument('-s', '--splits', nargs='+', help="split numbers (from 0) or names for the split graphs (default: all)")
+    parser.add_argument('-t', '--themes', nargs='+', type=ThemeVariant.from_str, default=[ThemeVariant.SHADOW], help="themes (default: Shadow)")
+    parser.add_argument('-f', '--formats', nargs='+', choices=FORMATS, default=['png'], help="file formats (default: png)")
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--size', type=float, nargs=2, default=(10, 6), metavar=('WIDTH', 'HEIGHT'), help="figure size in inches (default: 10 6)")
+    parser.add_argument('--show-outliers', action='store_true')
+    parser.add_argument('--outlier-strategy', type=OutlierStrategy.from_str, default=OutlierStrategy.STANDARD_DEVIATION)
+    parser.add_argument('--outlier-threshold', type=float, default=None, help="(default: the strategy's own)")
+    parser.add_argument('--bins', type=BinRule.from_str, default=BinRule.FREEDMAN_DIACONIS, help="histogram bins: fd, scott or fixed (default: fd)")
+    parser.add_argument('--bin-width', type=float, default=1.0, help="seconds per bin with --bins fixed (default: 1)")
+    parser.add_argument('--no-density', dest='density', action='store_false', help="leave the density curve out of histograms")
+    parser.add_argument('--window', type=int, default=10, help="moving average window (default: 10)")
+    parser.add_argument('--attempts', type=bound(int), nargs=2, default=None, metavar=('FIRST', 'LAST'), help="only attempts with these ids (inclusive, - for no bound)")
+    parser.add_argument('--dates', type=bound(day), nargs=2, default=None, metavar=('START', 'END'), help="only attempts that ended on these days (YYYY-MM-DD, inclusive, - for no bound)")
+    parser.add_argument('--last-days', type=int, default=None, metavar='DAYS', help="only the latest days of the history")
+    parser.add_argument('--finished-only', action='store_true', help="leave resets out of the segment graphs and run progression")
+    parser.add_argument('--no-variables', dest='variables', action='store_false', help="don't look up the category's variables on speedrun.com")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="worker processes (default: one per CPU)")
+    return parser.parse_args(argv)
+
+
+def parse_enum_args(parse, argv: list[str] | None) -> argparse.Namespace | None:
+    ''' `parse(argv)`, None after printing the error when a graph, theme or option name is unknown. '''
+    # the enum parsers raise NotImplementedError for unknown names
+    try:
+        return parse(argv)
+    except NotImplementedError as e:
+        print(e, file=sys.stderr)
+        return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    options = parse_enum_args(parse_args, argv)
+    if options is None:
+        return 2
+
+    start = perf_counter()
+    try:
+        tasks, load_times = make_tasks(options)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    written: list[tuple[str, float]] = []
+    failed = 0
+    with ProcessPoolExecutor(max_workers=max(options.jobs, 1)) as executor:
+        futures = {executor.submit(render, task): task for task in tasks}
+        for future in as_completed(futures):
+            try:
+                written += future.result()
+            except Exception as e:
+                task = futures[future]
+                print(f"{task.path}: {task.graph.value} {task.split_name or ''} failed: {e}", file=sys.stderr)
+                failed += 1
+
+    total = perf_counter() - start
+    print_summary(written, load_times, total, options.jobs)
+    return 1 if failed else 0
+
+
+def print_summary(written: list[tuple[str, float]], load_times: dict[str, float], total: float, jobs: int):
+    for path, seconds in load_times.items():
+        print(f"loaded {path} in {seconds:.2f}s")
+
+    if written:
+        render_times = [seconds for _, seconds in written]
+        slowest_path, slowest = max(written, key=lambda item: item[1])
+        print(f"rendered {len(written)} files on {jobs} workers in {total:.2f}s")
+        print(f"per file: {sum(render_times) / len(render_times) * 1000:.0f}ms average, slowest {slowest * 1000:.0f}ms ({slowest_path})")
+    else:
+        print("nothing rendered")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+'''
+Write a made up but realistic .lss file, for trying the graphs on big histories and for `benchmark.py`.
+
+    python generate_lss.py big.lss --attempts 100000 --splits 25 --reset-rate 0.04 --days 730
+
+Segment times get faster over the history with some noise on top, attempts are reset part way through with a
+fixed chance on every segment, splits get skipped now and then and attempts are grouped into sessions spread
+over the given number of days. The same seed always gives the same file.
+'''
+import argparse
+import datetime
+import sys
+
+import numpy as np
+
+import livesplit_time
+
+
+# how much slower than their best the segments start out, and how quickly that goes away
+LEARNING = 0.25
+LEARNING_RATE = 5.0
+# spread of the times around the trend
+NOISE = 0.06
+# how far below every other time the golds get by the end of the history
+GOLD_MARGIN = 0.05
+
+
+def format_times(ticks: np.ndarray) -> list[str]:
+    ''' LiveSplit `HH:MM:SS.fffffff` times. '''
+    seconds, fraction = np.divmod(ticks.astype(np.int64), livesplit_time.TICKS_PER_SECOND)
+    minutes, seconds = np.divmod(seconds, 60)
+    hours, minutes = np.divmod(minutes, 60)
+    return [f"{h:02d}:{m:02d}:{s:02d}.{f:07d}" for h, m, s, f in zip(hours.tolist(), minutes.tolist(), seconds.tolist(), fraction.tolist())]
+
+
+def format_stamps(epoch: np.ndarray) -> list[str]:
+    ''' LiveSplit `MM/DD/YYYY HH:MM:SS` stamps of epoch seconds. '''
+    start = datetime.datetime(1970, 1, 1)
+    return [f"{start + datetime.timedelta(seconds=s):%m/%d/%Y %H:%M:%S}" for s in epoch.tolist()]
+
+
+def session_starts(rng: np.random.Generator, busy: np.ndarray, days: int) -> np.ndarray:
+    ''' Start (seconds from the first attempt) of attempts that take `busy` seconds each, with a break between
+        sessions so the whole history covers about `days` days.
+    '''
+    count = len(busy)
+    offsets = np.concatenate(([0.0], busy[:-1]))
+    breaks = min(days - 1, count - 1)
+    spare = days * 86400 - busy.sum()
+    if breaks > 0 and spare > 0:
+        after = rng.choice(count - 1, breaks, replace=False) + 1
+        lengths = rng.uniform(0.5, 1.5, breaks)
+        # some room is left at the end so the last session doesn't run into the next day
+        offsets[after] += lengths / lengths.sum() * spare * 0.9
+    return np.cumsum(offsets)
+
+
+def generate_lss(path: str, attempts: int = 1000, splits: int = 20, reset_rate: float = 0.05, skip_rate: float = 0.01,
+                 gold_rate: float = 0.002, days: int = 365, start: str = '2022-01-01', seed: int = 0,
+                 game: str = "Generated Game", category: str = "Any%"):
+    '''
+    Write a splits file with `attempts` attempts of `splits` splits to `path`.
+
+    - `reset_rate`: chance of a reset during every segment, so about `(1 - reset_rate) ** splits` of the attempts finish
+    - `skip_rate`: chance of skipping a split, the next segment time then covers both (never the last split)
+    - `gold_rate`: chance of a segment time being a gold on purpose, on top of the ones from getting faster
+    - `days`: days from the first attempt to the last, starting on `start`, more when the attempts alone take longer
+    '''
+    rng = np.random.default_rng(seed)
+    ticks_per_second = livesplit_time.TICKS_PER_SECOND
+
+    # segment times (seconds) of every attempt as if it went all the way
+    base = rng.uniform(20, 120, splits)
+    progress = np.arange(attempts) / max(attempts - 1, 1)
+    trend = 1 + LEARNING * np.exp(-LEARNING_RATE * progress)
+    times = base * trend[:, None] * (1 + np.abs(rng.normal(0, NOISE, (attempts, splits))))
+
+    # never slower than the trend allows and lower with every attempt, so each of these beats everything before it
+    golds = rng.random((attempts, splits)) < gold_rate
+    gold_times = base * (1 - GOLD_MARGIN * (progress[:, None] + 1 / attempts))
+    times[golds] = np.broadcast_to(gold_times, times.shape)[golds]
+
+    # splits every attempt got through before its reset
+    if reset_rate > 0:
+        reached = np.minimum(rng.geometric(reset_rate, attempts) - 1, splits)
+    else:
+        reached = np.full(attempts, splits)
+    finished = reached == splits
+    present = np.arange(splits) < reached[:, None]
+
+    ticks = np.round(times * ticks_per_second).astype(np.int64)
+    split_times = np.cumsum(ticks, axis=1)
+    skipped = present & (rng.random((attempts, splits)) < skip_rate)
+    skipped[:, -1] = False
+    recorded = present & ~skipped
+
+    # a time after skipped splits runs from the last split that has one
+    ends = np.where(recorded, np.arange(1, splits + 1), 0)
+    starts = np.zeros_like(ends)
+    starts[:, 1:] = np.maximum.accumulate(ends, axis=1)[:, :-1]
+    padded = np.hstack((np.zeros((attempts, 1), dtype=np.int64), split_times))
+    segment_ticks = split_times - np.take_along_axis(padded, starts, axis=1)
+
+    # resets happen part way through the segment they're on
+    run_ticks = np.where(reached > 0, split_times[np.arange(attempts), np.maximum(reached - 1, 0)], 0)
+    spent = np.where(finished, 0, rng.uniform(0, 1, attempts) * base[np.minimum(reached, splits - 1)])
+    durations = run_ticks / ticks_per_second + spent + rng.uniform(1, 5, attempts)
+    busy = durations + rng.uniform(3, 30, attempts)
+
+    first = int(np.datetime64(start, 'D').astype('datetime64[s]').astype(np.int64)) + 18 * 3600
+    started = first + np.round(session_starts(rng, busy, days)).astype(np.int64)
+    ended = started + np.round(durations).astype(np.int64)
+
+    ids = np.arange(1, attempts + 1)
+    finished_ids = ids[finished]
+    pb_row = int(np.argmin(np.where(finished, split_times[:, -1], np.iinfo(np.int64).max))) if finished.any() else None
+    best = np.where(recorded & (starts == np.arange(splits)), segment_ticks, np.iinfo(np.int64).max).min(axis=0)
+
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('<?xml version="1.0" encoding="UTF-8"?>\n<Run version="1.7.0">')
+        file.write(f'<GameIcon /><GameName>{game}</GameName><CategoryName>{category}</CategoryName><LayoutPath></LayoutPath>')
+        file.write('<Metadata><Run id="" /><Platform usesEmulator="False"></Platform><Region></Region><Variables /></Metadata>')
+        file.write(f'<Offset>00:00:00</Offset><AttemptCount>{attempts}</AttemptCount><AttemptHistory>')
+
+        finish_times = dict(zip(finished_ids.tolist(), format_times(split_times[finished, -1])))
+        for attempt_id, started_at, ended_at in zip(ids.tolist(), format_stamps(started), format_stamps(ended)):
+            real_time = finish_times.get(attempt_id)
+            body = f'<RealTime>{real_time}</RealTime>' if real_time is not None else ''
+            file.write(f'<Attempt id="{attempt_id}" started="{started_at}" isStartedSynced="True" ended="{ended_at}" isEndedSynced="True">{body}</Attempt>')
+
+        file.write('</AttemptHistory><Segments>')
+        for segment in range(splits):
+            file.write(f'<Segment><Name>Split {segment + 1}</Name><Icon />')
+            if pb_row is not None:
+                file.write(f'<SplitTimes><SplitTime name="Personal Best"><RealTime>{format_times(split_times[pb_row, segment:segment + 1])[0]}</RealTime></SplitTime></SplitTimes>')
+            else:
+                file.write('<SplitTimes><SplitTime name="Personal Best" /></SplitTimes>')
+            if best[segment] != np.iinfo(np.int64).max:
+                file.write(f'<BestSegmentTime><RealTime>{format_times(best[segment:segment + 1])[0]}</RealTime></BestSegmentTime>')
+            else:
+                file.write('<BestSegmentTime />')
+
+            file.write('<SegmentHistory>')
+            rows = np.flatnonzero(present[:, segment])
+            formatted = iter(format_times(segment_ticks[rows[recorded[rows, segment]], segment]))
+            file.writelines(
+                f'<Time id="{attempt_id}"><RealTime>{next(formatted)}</RealTime></Time>' if has_time else f'<Time id="{attempt_id}" />'
+                for attempt_id, has_time in zip(ids[rows].tolist(), recorded[rows, segment].tolist())
+            )
+            file.write('</SegmentHistory></Segment>')
+        file.write('</Segments><AutoSplitterSettings /></Run>\n')
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Write a generated .lss file.")
+    parser.add_argument('path', help="file to write")
+    parser.add_argument('-n', '--attempts', type=int, default=1000, help="(default: 1000)")
+    parser.add_argument('-s', '--splits', type=int, default=20, help="(default: 20)")
+    parser.add_argument('--reset-rate', type=float, default=0.05, help="chance of a reset on every segment (default: 0.05)")
+    parser.add_argument('--skip-rate', type=float, default=0.01, help="chance of skipping a split (default: 0.01)")
+    parser.add_argument('--gold-rate', type=float, default=0.002, help="chance of a segment time being a gold (default: 0.002)")
+    parser.add_argument('--days', type=int, default=365, help="days the attempts are spread over (default: 365)")
+    parser.add_argument('--start', default='2022-01-01', help="day of the first attempt, YYYY-MM-DD (default: 2022-01-01)")
+    parser.add_argument('--seed', type=int, default=0, help="(default: 0)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    options = parse_args(argv)
+    if options.attempts < 1 or options.splits < 1 or options.days < 1:
+        print("attempts, splits and days have to be at least 1", file=sys.stderr)
+        return 2
+    if not 0 <= options.reset_rate < 1 or not 0 <= options.skip_rate < 1 or not 0 <= options.gold_rate <= 1:
+        print("rates have to be between 0 and 1", file=sys.stderr)
+        return 2
+
+    generate_lss(options.path, options.attempts, options.splits, options.reset_rate, options.skip_rate, options.gold_rate, options.days, options.start, options.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
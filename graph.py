@@ -9,6 +9,10 @@ class Graph(Enum):
     IMP_OVER_ATTEMPTS = "Improvement Over Attempts"
     PB_OVER_TIME = "PB Over Time"
     PB_OVER_ATTEMPTS = "PB Over Attempts"
+    SOB_OVER_TIME = "Sum of Best Over Time"
+    RUN_PROGRESSION = "Run Progression"
+    RESET_DISTRIBUTION = "Reset Distribution"
+    SURVIVAL = "Survival Curve"
 
     @staticmethod
     def from_str(label):
@@ -27,5 +31,23 @@ class Graph(Enum):
                 return Graph.PB_OVER_TIME
             case 'pb over attempts':
                 return Graph.PB_OVER_ATTEMPTS
+            case 'sob over time'|'sum of best over time'|'sob':
+                return Graph.SOB_OVER_TIME
+            case 'run progression'|'progression':
+                return Graph.RUN_PROGRESSION
+            case 'reset distribution'|'resets':
+                return Graph.RESET_DISTRIBUTION
+            case 'survival curve'|'survival':
+                return Graph.SURVIVAL
             case _:
                 raise NotImplementedError("This graph is not implemented")
+
+    @property
+    def is_split_graph(self) -> bool:
+        ''' Drawn for one split at a time, the other graphs show the whole category. '''
+        return self in (Graph.HISTOGRAM, Graph.MOVING_AVERAGE)
+
+    @property
+    def uses_finished_only(self) -> bool:
+        ''' Drawn from single attempts, the only graphs `HistoryRange.finished_only` leaves the resets out of. '''
+        return self in (Graph.HISTOGRAM, Graph.MOVING_AVERAGE, Graph.RUN_PROGRESSION)
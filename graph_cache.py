@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Hashable
+
+from graph import Graph
+
+# only for annotations, the window imports this before plotting is loaded
+if TYPE_CHECKING:
+    from plot import Plot
+
+
+class CachedGraph():
+    ''' A drawn graph: its Plot, the view it shows and the pixels last rendered for it. '''
+    def __init__(self, plot: Plot, graph: Graph, key: Hashable):
+        self.plot = plot
+        self.graph = graph
+        self.key = key
+
+        # set by the window after every draw, restored with a blit when the view is shown again
+        self.background = None
+        self.size: tuple[int, int] | None = None
+
+    @property
+    def nbytes(self) -> int:
+        size = self.plot.nbytes
+        if self.size is not None:
+            # RGBA copy of the canvas
+            size += self.size[0] * self.size[1] * 4
+        return size
+
+
+class GraphCache():
+    ''' Most recently shown graphs, bounded by count and approximate memory. Oldest go first.
+
+        `on_evict` gets every entry that's dropped, so its artists can be removed from the figure.
+    '''
+    def __init__(self, max_entries: int = 8, max_bytes: int = 128 * 1024 * 1024, on_evict: Callable[[CachedGraph], None] | None = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.entries: OrderedDict[Hashable, CachedGraph] = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    @property
+    def nbytes(self) -> int:
+        return sum(entry.nbytes for entry in self.entries.values())
+
+    def get(self, key: Hashable) -> CachedGraph | None:
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, entry: CachedGraph):
+        self.entries[entry.key] = entry
+        self.entries.move_to_end(entry.key)
+        self.evict()
+
+    def rekey(self, entry: CachedGraph, key: Hashable):
+        ''' `entry` was updated to show the view of `key`, the view it showed before is gone. '''
+        self.entries.pop(entry.key, None)
+        replaced = self.entries.pop(key, None)
+        if replaced is not None and replaced is not entry:
+            self.drop(replaced)
+        entry.key = key
+        self.put(entry)
+
+    def pop_oldest(self) -> CachedGraph | None:
+        ''' Take the least recently used entry out, the caller drops it. '''
+        if not self.entries:
+            return None
+        _, entry = self.entries.popitem(last=False)
+        return entry
+
+    def evict(self):
+        # the newest entry is the one on screen, it always stays
+        while len(self.entries) > 1 and (len(self.entries) > self.max_entries or self.nbytes > self.max_bytes):
+            self.drop(self.pop_oldest())
+
+    def clear(self, keep: CachedGraph | None = None):
+        ''' Drop every entry, but `keep` when it's given. '''
+        for entry in list(self.entries.values()):
+            if entry is not keep:
+                del self.entries[entry.key]
+                self.drop(entry)
+
+    def drop(self, entry: CachedGraph):
+        if self.on_evict is not None:
+            self.on_evict(entry)
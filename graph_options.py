@@ -0,0 +1,52 @@
+from enum import Enum, unique
+
+# options the window lists before any data is loaded, the work they stand for needs numpy and is in outliers.py and distribution.py
+
+
+@unique
+class OutlierStrategy(Enum):
+    STANDARD_DEVIATION = "Mean + kσ"
+    IQR = "IQR Fences"
+    MAD = "Median Absolute Deviation"
+
+    @staticmethod
+    def from_str(label):
+        match str(label).lower():
+            case 'mean + kσ'|'std'|'stdev'|'standard deviation':
+                return OutlierStrategy.STANDARD_DEVIATION
+            case 'iqr fences'|'iqr':
+                return OutlierStrategy.IQR
+            case 'median absolute deviation'|'mad':
+                return OutlierStrategy.MAD
+            case _:
+                raise NotImplementedError("This outlier strategy is not implemented")
+
+    @property
+    def default_threshold(self) -> float:
+        ''' k for mean + kσ, fence multiplier for IQR, modified z-score cutoff for MAD. '''
+        match self:
+            case OutlierStrategy.STANDARD_DEVIATION:
+                return 3.0
+            case OutlierStrategy.IQR:
+                return 1.5
+            case OutlierStrategy.MAD:
+                return 3.5
+
+
+@unique
+class BinRule(Enum):
+    FREEDMAN_DIACONIS = "Freedman–Diaconis"
+    SCOTT = "Scott"
+    FIXED = "Fixed Width"
+
+    @staticmethod
+    def from_str(label):
+        match str(label).lower():
+            case 'freedman–diaconis'|'freedman-diaconis'|'fd':
+                return BinRule.FREEDMAN_DIACONIS
+            case 'scott':
+                return BinRule.SCOTT
+            case 'fixed width'|'fixed':
+                return BinRule.FIXED
+            case _:
+                raise NotImplementedError("This binning rule is not implemented")
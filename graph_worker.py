@@ -0,0 +1,70 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class GraphWorker(QObject):
+    ''' Runs jobs off the GUI thread, one at a time so they never touch a LiveSplitData at the same time.
+
+        Every job is submitted under a kind ("file", "graph", ...) and gets a version. Submitting again
+        supersedes the older job of that kind: it's cancelled if it hasn't started and its result is dropped
+        if it has. Results arrive on the GUI thread through `finished` / `failed`.
+    '''
+    finished = pyqtSignal(str, int, object)
+    failed = pyqtSignal(str, int, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='graph-worker')
+        self.versions: dict[str, int] = {}
+        self.pending: dict[str, Future] = {}
+        self.lock = threading.Lock()
+
+    def submit(self, kind: str, job: Callable, *args) -> int:
+        with self.lock:
+            version = self.supersede(kind)
+            self.pending[kind] = self.executor.submit(self.run, kind, version, job, *args)
+        return version
+
+    def cancel(self, kind: str):
+        ''' Drop whatever job of `kind` is queued or running. '''
+        with self.lock:
+            self.supersede(kind)
+
+    def supersede(self, kind: str) -> int:
+        version = self.versions.get(kind, 0) + 1
+        self.versions[kind] = version
+        previous = self.pending.pop(kind, None)
+        if previous is not None:
+            previous.cancel()
+        return version
+
+    def is_current(self, kind: str, version: int) -> bool:
+        return self.versions.get(kind) == version
+
+    def is_busy(self, kind: str) -> bool:
+        future = self.pending.get(kind)
+        return future is not None and not future.done()
+
+    def run(self, kind: str, version: int, job: Callable, *args):
+        # superseded while waiting for the thread
+        if not self.is_current(kind, version):
+            return
+
+        try:
+            result = job(*args)
+        except Exception as e:
+            if self.is_current(kind, version):
+                self.failed.emit(kind, version, e)
+            return
+
+        if self.is_current(kind, version):
+            self.finished.emit(kind, version, result)
+
+    def shutdown(self):
+        with self.lock:
+            for kind in list(self.versions):
+                self.supersede(kind)
+        self.executor.shutdown(wait=False, cancel_futures=True)
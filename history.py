@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+import livesplit_time
+
+if TYPE_CHECKING:
+    from livesplit_data import LiveSplitData
+
+
+def day_to_epoch(day) -> int:
+    ''' Epoch seconds at the start of a day (anything `np.datetime64` takes). '''
+    return int(np.datetime64(day, 'D').astype('datetime64[s]').astype(np.int64))
+
+
+class HistoryRange():
+    ''' Part of a file's history to graph, every bound is optional and inclusive.
+
+        - `attempts`: first and last attempt id
+        - `dates`: first and last day attempts ended on
+        - `last_days`: only the latest days, counted back from the day of the last attempt
+        - `finished_only`: leave resets out of the graphs of single attempts (segment times, run progression)
+    '''
+    def __init__(self, attempts: tuple[int | None, int | None] | None = None, dates: tuple | None = None, last_days: int | None = None, finished_only: bool = False):
+        self.attempts = tuple(attempts) if attempts is not None and attempts != (None, None) else None
+        self.dates = tuple(None if day is None else np.datetime64(day, 'D') for day in dates) if dates is not None and tuple(dates) != (None, None) else None
+        self.last_days = last_days or None
+        self.finished_only = finished_only
+
+    @property
+    def key(self) -> tuple:
+        return (self.attempts, self.dates, self.last_days, self.finished_only)
+
+    def __eq__(self, other):
+        return isinstance(other, HistoryRange) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f"HistoryRange({self.label() or 'everything'})"
+
+    @property
+    def is_everything(self) -> bool:
+        return self.key == (None, None, None, False)
+
+    def label(self, finished_only: bool = True) -> str:
+        ''' The bounds for a graph title, empty for the whole history. Without `finished_only` the title of a graph
+            the filter doesn't apply to doesn't mention it.
+        '''
+        parts = []
+        if self.attempts is not None:
+            first, last = self.attempts
+            parts.append(f"#{first or 1}–{'' if last is None else last}")
+        if self.dates is not None:
+            start, end = self.dates
+            parts.append(f"{'' if start is None else start} to {'now' if end is None else end}".strip())
+        if self.last_days is not None:
+            parts.append(f"last {self.last_days} days")
+        if self.finished_only and finished_only:
+            parts.append("finished only")
+        return ", ".join(parts)
+
+
+class HistoryView():
+    ''' The series of a `LiveSplitData` cut down to a `HistoryRange`.
+
+        Every bound is found by binary search over a sorted column: attempt ids (they go up in file order),
+        a running latest end stamp for the dates, and the positions and cumulative counts the category series
+        already keep. The series are then plain slices of the file's own arrays, nothing is copied.
+
+        - `first`, `last`: positions of the attempts in range, `last` exclusive
+        - `row_range`: the same attempts as rows of the segment matrix
+        - `AOT_before`, `finished_before`: running counts at the end of the day before the first one in range
+        - the category series of `LiveSplitData` under the same names
+    '''
+    def __init__(self, lsd: LiveSplitData, history_range: HistoryRange | None = None):
+        self.lsd = lsd
+        self.range = history_range if history_range is not None else HistoryRange()
+        self.first, self.last = self.attempt_bounds()
+
+        # finished runs and PBs keep their 1-based position
+        finished = slice(*np.searchsorted(lsd.finished_indexes, (self.first + 1, self.last + 1)))
+        self.finished_indexes = lsd.finished_indexes[finished]
+        self.finished_times = lsd.finished_times[finished]
+        self.finished_dates = lsd.finished_dates[finished]
+
+        pbs = slice(*np.searchsorted(lsd.pb_abs_indexes, (self.first + 1, self.last + 1)))
+        self.pb_dates = lsd.pb_dates[pbs]
+        self.pb_times = lsd.pb_times[pbs]
+        self.pb_abs_indexes = lsd.pb_abs_indexes[pbs]
+
+        # days keep a running count, every day that has one of the attempts is in
+        days = HistoryView.day_slice(lsd.AOT_attempts, self.first, self.last)
+        self.AOT_dates = lsd.AOT_dates[days]
+        self.AOT_attempts = lsd.AOT_attempts[days]
+        self.daily_time_played = lsd.daily_time_played[days]
+        self.AOT_before = int(lsd.AOT_attempts[days.start - 1]) if days.start else 0
+
+        finished_days = HistoryView.day_slice(lsd.finished_attempts, finished.start, finished.stop)
+        self.unique_finished_dates = lsd.unique_finished_dates[finished_days]
+        self.finished_attempts = lsd.finished_attempts[finished_days]
+        self.finished_before = int(lsd.finished_attempts[finished_days.start - 1]) if finished_days.start else 0
+
+        self.row_range = self.matrix_rows()
+
+    def attempt_bounds(self) -> tuple[int, int]:
+        attempts = self.lsd.attempts
+        first, last = 0, len(attempts)
+
+        if self.range.attempts is not None:
+            first_id, last_id = self.range.attempts
+            if first_id is not None:
+                first = max(first, int(np.searchsorted(attempts.ids, first_id)))
+            if last_id is not None:
+                last = min(last, int(np.searchsorted(attempts.ids, last_id, side='right')))
+
+        latest = self.lsd.latest_ended
+        start, end = self.range.dates if self.range.dates is not None else (None, None)
+        if self.range.last_days is not None and len(latest) and latest[-1] != livesplit_time.MISSING:
+            final_day = livesplit_time.epoch_to_datetime64(latest[-1:]).astype('datetime64[D]')[0]
+            recent = final_day - np.timedelta64(self.range.last_days - 1, 'D')
+            start = recent if start is None else max(start, recent)
+        if start is not None:
+            first = max(first, int(np.searchsorted(latest, day_to_epoch(start))))
+        if end is not None:
+            last = min(last, int(np.searchsorted(latest, day_to_epoch(end + np.timedelta64(1, 'D')))))
+
+        return first, max(first, last)
+
+    @staticmethod
+    def day_slice(counts: np.ndarray, first: int, last: int) -> slice:
+        ''' Days (with running `counts` at their end) that have any of the items `first` to `last` (exclusive). '''
+        if first >= last:
+            return slice(0, 0)
+        start = int(np.searchsorted(counts, first, side='right'))
+        end = min(int(np.searchsorted(counts, last)) + 1, len(counts))
+        return slice(start, end)
+
+    def matrix_rows(self) -> tuple[int, int]:
+        if self.first >= self.last:
+            return 0, 0
+        ids = self.lsd.attempts.ids
+        row_ids = self.lsd.segment_matrix.attempt_ids
+        return int(np.searchsorted(row_ids, ids[self.first])), int(np.searchsorted(row_ids, ids[self.last - 1], side='right'))
+
+    @property
+    def rows(self) -> slice | np.ndarray:
+        ''' Rows of the segment matrix for the graphs of single attempts, a slice unless only finished runs count. '''
+        rows = slice(*self.row_range)
+        if not self.range.finished_only:
+            return rows
+        return np.flatnonzero(self.lsd.segment_matrix.valid[rows, -1]) + self.row_range[0]
+
+    @property
+    def attempt_count(self) -> int:
+        return self.last - self.first
+
+    def sum_of_best_history(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        ''' `LiveSplitData.sum_of_best_history` for the attempts in range, with the matrix row of every entry. '''
+        lsd = self.lsd
+        best_segments = lsd.best_segments
+        start, end = np.searchsorted(best_segments.sob_rows, self.row_range)
+        rows = best_segments.sob_rows[start:end]
+        positions = lsd.attempt_positions(lsd.segment_matrix.attempt_ids[rows])
+        ended = livesplit_time.epoch_to_datetime64(lsd.attempts.ended[positions])
+        return positions + 1, ended, best_segments.sob[start:end], rows
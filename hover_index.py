@@ -0,0 +1,40 @@
+import numpy as np
+from matplotlib.axes import Axes
+
+
+class HoverIndex():
+    ''' Screen positions of a graph's points sorted by x, so the point under the cursor is found with a binary
+        search instead of hit testing every point.
+
+        Positions are in pixels, so an index is only good for the view limits and axes size it was built
+        with, see `matches`.
+    '''
+    def __init__(self, ax: Axes, points: np.ndarray):
+        self.view = HoverIndex.view_of(ax)
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        screen = ax.transData.transform(points)
+
+        self.order = np.argsort(screen[:, 0], kind='stable')
+        self.xs = screen[self.order, 0]
+        self.ys = screen[self.order, 1]
+
+    @staticmethod
+    def view_of(ax: Axes) -> tuple:
+        return (*ax.viewLim.bounds, *ax.bbox.bounds)
+
+    def matches(self, ax: Axes) -> bool:
+        return self.view == HoverIndex.view_of(ax)
+
+    def nearest(self, x: float, y: float, radius: float) -> int | None:
+        ''' Position (in the original points) of the point closest to pixel (x, y), None when none is within `radius` pixels. '''
+        start, end = np.searchsorted(self.xs, (x - radius, x + radius))
+        if start == end:
+            return None
+
+        dx = self.xs[start:end] - x
+        dy = self.ys[start:end] - y
+        distances = dx * dx + dy * dy
+        closest = int(np.argmin(distances))
+        if not distances[closest] <= radius * radius:
+            return None
+        return int(self.order[start + closest])
@@ -1,41 +1,106 @@
+from __future__ import annotations
+
+import startup
+
+import argparse
 import sys
-import gc
+from typing import TYPE_CHECKING
+from xml.etree.ElementTree import ParseError
+
+with startup.stage("import PyQt6"):
+    from PyQt6.QtWidgets import QApplication, QMainWindow, QFileDialog, QPushButton, QSizePolicy, QButtonGroup, QWidget, QProgressBar, QDateEdit
+    from PyQt6 import QtGui
+    from PyQt6.QtCore import QFileSystemWatcher, QTimer, pyqtSignal
 
-from PyQt6.QtWidgets import QApplication, QMainWindow, QFileDialog, QPushButton, QSizePolicy, QButtonGroup, QWidget
-from PyQt6 import QtGui
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT as NavigationToolbar
+with startup.stage("import window modules"):
+    from ui.main_window_ui import Ui_MainWindow
+    from theme import Theme, ThemeVariant
+    from graph import Graph
+    from graph_cache import GraphCache, CachedGraph
+    from graph_worker import GraphWorker
+    from graph_options import BinRule, OutlierStrategy
 
-from ui.main_window_ui import Ui_MainWindow
-from livesplit_data import LiveSplitData
-from plot import Plot
-from theme import Theme, ThemeVariant
-from graph import Graph
+# pandas, matplotlib and requests are imported on the worker once the window is up, see preloadModules()
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT as NavigationToolbar
+    from pandas import DataFrame
+    from livesplit_data import LiveSplitData
+    from plot import Plot
+    from comparison import Comparison
+    from history import HistoryRange
+    from distribution import Distribution
 
 
 class Window(QMainWindow, Ui_MainWindow):
+    figure: Figure | None = None
     currentGraph: FigureCanvasQTAgg | None = None
     currentToolbar: NavigationToolbar | None = None
     lsd: LiveSplitData | None = None
+    currentPlot: Plot | None = None
+    currentGraphType: Graph | None = None
+    currentKey: tuple | None = None
+    # several files side by side instead of `lsd`, see openFiles()
+    comparison: Comparison | None = None
+
+    # emitted from the lookup thread once the speedrun.com variables of the open file are known
+    variablesLoaded = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setupUi(self)
         self.setWindowTitle("Livesplit Graphs")
         self.loadThemes()
+        self.loadOutlierStrategies()
+        self.loadBinRules()
 
         self.listSplits.clear()
+
+        # LiveSplit rewrites the file after every reset, wait for it to settle before reloading
+        self.fileWatcher = QFileSystemWatcher(self)
+        self.reloadTimer = QTimer(self)
+        self.reloadTimer.setSingleShot(True)
+        self.reloadTimer.setInterval(500)
+
+        # recently shown graphs, keyed by everything that changes what they look like
+        self.graphCache = GraphCache(max_entries=8, on_evict=self.removeCachedGraph)
+
+        # parsing and segment extraction run here, only the latest result gets drawn
+        self.worker = GraphWorker(self)
+        self.progressBar = QProgressBar(self)
+        self.progressBar.setRange(0, 0)
+        self.progressBar.setMaximumWidth(160)
+        self.progressBar.setVisible(False)
+        self.statusbar.addPermanentWidget(self.progressBar)
+
         self.connectSignalsSlots()
 
-        # REMOVE testing
-        self.lsd = LiveSplitData("E:/Livesplit-new/layouts/Grand Theft Auto V - Trevor%.lss")
-        self.loadSplitsList()
+        # warm up while the window is being painted, files opened meanwhile queue up behind it
+        QTimer.singleShot(0, lambda: self.worker.submit("imports", Window.preloadModules))
 
     def connectSignalsSlots(self):
         self.actionOpen.triggered.connect(self.selectFile)
+        self.actionCompare.triggered.connect(self.selectFiles)
+        self.actionWatch.toggled.connect(self.updateWatchedFile)
+        self.fileWatcher.fileChanged.connect(self.reloadTimer.start)
+        self.reloadTimer.timeout.connect(self.reloadFile)
+        self.variablesLoaded.connect(self.refreshHeaders)
+        self.worker.finished.connect(self.workFinished)
+        self.worker.failed.connect(self.workFailed)
         self.listSplits.itemClicked.connect(self.loadGraph)
         self.check_showOutliers.clicked.connect(self.loadGraph)
+        self.outlier_options.currentIndexChanged.connect(self.outlierStrategyChanged)
+        self.outlier_threshold.editingFinished.connect(self.loadGraph)
+        self.moving_avg_window.editingFinished.connect(self.loadGraph)
+        self.check_density.clicked.connect(self.loadGraph)
+        self.bin_options.currentIndexChanged.connect(self.binRuleChanged)
+        self.bin_width.editingFinished.connect(self.loadGraph)
+        self.check_finishedOnly.clicked.connect(self.loadGraph)
+        self.range_first.editingFinished.connect(self.loadGraph)
+        self.range_last.editingFinished.connect(self.loadGraph)
+        self.range_days.editingFinished.connect(self.loadGraph)
+        self.range_from.dateChanged.connect(self.loadGraph)
+        self.range_to.dateChanged.connect(self.loadGraph)
         self.color_options.currentIndexChanged.connect(self.loadGraph)
         self.option_buttons.buttonClicked.connect(self.loadGraph)
     
@@ -43,6 +108,32 @@ class Window(QMainWindow, Ui_MainWindow):
         for variant in ThemeVariant:
             self.color_options.addItem(variant.value)
 
+    def loadOutlierStrategies(self):
+        for strategy in OutlierStrategy:
+            self.outlier_options.addItem(strategy.value)
+
+    def getOutlierStrategy(self) -> OutlierStrategy:
+        return OutlierStrategy.from_str(self.outlier_options.currentText())
+
+    def outlierStrategyChanged(self):
+        # every strategy has its own scale, start from its default threshold
+        self.outlier_threshold.blockSignals(True)
+        self.outlier_threshold.setValue(self.getOutlierStrategy().default_threshold)
+        self.outlier_threshold.blockSignals(False)
+        self.loadGraph()
+
+    def loadBinRules(self):
+        for rule in BinRule:
+            self.bin_options.addItem(rule.value)
+
+    def getBinRule(self) -> BinRule:
+        return BinRule.from_str(self.bin_options.currentText())
+
+    def binRuleChanged(self):
+        # the width is only used by fixed width bins, the other rules work it out
+        self.bin_width.setEnabled(self.getBinRule() == BinRule.FIXED)
+        self.loadGraph()
+
     def selectFile(self):
         fileDialog = QFileDialog.getOpenFileName(
             self,
@@ -52,117 +143,569 @@ class Window(QMainWindow, Ui_MainWindow):
         livesplit_path = fileDialog[0]
 
         if livesplit_path != "":
-            self.lsd = LiveSplitData(livesplit_path)
-            self.loadSplitsList()
+            self.openFile(livesplit_path)
+
+    def selectFiles(self):
+        paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            caption="Select Livesplit files to compare",
+            filter="*.lss"
+        )
+
+        if paths:
+            self.openFiles(paths)
+
+    def openFile(self, path: str):
+        # graphs of the previous file aren't wanted anymore
+        self.worker.cancel("graph")
+        self.worker.cancel("reload")
+        self.worker.cancel("compare")
+        self.worker.submit("file", Window.readFile, path)
+
+        self.statusbar.showMessage(f"Loading {path}...")
+        self.progressBar.setVisible(True)
+
+    @staticmethod
+    def preloadModules():
+        ''' Runs on the worker. Everything needed to read a file and draw it, before it's needed. '''
+        with startup.stage("import livesplit_data"):
+            import livesplit_data
+        with startup.stage("import plot"):
+            import plot
+            import matplotlib.backends.backend_qt5agg
+
+    @staticmethod
+    def readFile(path: str) -> LiveSplitData:
+        ''' Runs on the worker. '''
+        from livesplit_data import LiveSplitData
+
+        with startup.stage(f"read {path}"):
+            return LiveSplitData(path)
+
+    def openFiles(self, paths: list[str]):
+        self.worker.cancel("graph")
+        self.worker.cancel("reload")
+        self.worker.cancel("file")
+        self.worker.submit("compare", Window.readFiles, paths)
+
+        self.statusbar.showMessage(f"Loading {len(paths)} files...")
+        self.progressBar.setVisible(True)
+
+    @staticmethod
+    def readFiles(paths: list[str]) -> tuple[list[LiveSplitData], dict[str, Exception]]:
+        ''' Runs on the worker, which waits for the files to be read on a process pool. '''
+        from comparison import load_files
+
+        return load_files(paths)
+
+    def fileLoaded(self, lsd: LiveSplitData):
+        self.progressBar.setVisible(False)
+        self.statusbar.clearMessage()
+
+        self.lsd = lsd
+        self.comparison = None
+        self.updateGraphButtons()
+        self.clearGraphCache()
+        self.loadSplitsList()
+        self.updateWatchedFile()
+        self.watchVariables(lsd)
+        self.loadGraph()
+
+        startup.mark("file loaded")
+        # nothing gets drawn until a graph is picked
+        if self.option_buttons.checkedButton() is None:
+            startup.report()
+
+    def workFinished(self, kind: str, version: int, result):
+        # a newer request came in after this one was done
+        if not self.worker.is_current(kind, version):
+            return
+
+        match kind:
+            case "file":
+                self.fileLoaded(result)
+            case "compare":
+                self.filesLoaded(*result)
+            case "reload":
+                self.fileReloaded(*result)
+            case "graph":
+                self.graphReady(*result)
+
+    def workFailed(self, kind: str, version: int, error: Exception):
+        if not self.worker.is_current(kind, version):
+            return
+
+        match kind:
+            case "file":
+                self.progressBar.setVisible(False)
+                self.statusbar.showMessage(f"Couldn't open the file: {error}")
+                startup.report()
+            case "compare":
+                self.progressBar.setVisible(False)
+                self.statusbar.showMessage(f"Couldn't open the files: {error}")
+            case "reload":
+                self.rewatchFile()
+                if isinstance(error, (OSError, ParseError)):
+                    # caught LiveSplit mid-write, try again once it's done
+                    self.reloadTimer.start()
+                else:
+                    print(error)
+            case _:
+                print(error)
+
+    def filesLoaded(self, runs: list[LiveSplitData], errors: dict[str, Exception]):
+        from comparison import Comparison
+
+        self.progressBar.setVisible(False)
+        if not runs:
+            self.statusbar.showMessage(f"Couldn't open any of the files: {next(iter(errors.values()), '')}")
+            return
+
+        message = f"Comparing {len(runs)} files"
+        if errors:
+            message += f", couldn't open {', '.join(errors)}"
+        self.statusbar.showMessage(message)
+
+        # there's no single file to watch anymore
+        self.lsd = None
+        self.comparison = Comparison(runs)
+        self.updateWatchedFile()
+        self.updateGraphButtons()
+        self.clearGraphCache()
+        self.loadSplitsList()
+        self.watchVariables(self.comparison.runs[0])
+        self.loadGraph()
+
+    def updateGraphButtons(self):
+        ''' Only the graphs that can show several files at once are available while comparing. '''
+        from comparison import COMPARISON_GRAPHS
+
+        for button in self.option_buttons.buttons():
+            button.setEnabled(self.comparison is None or Graph(button.text()) in COMPARISON_GRAPHS)
+
+        checkedButton = self.option_buttons.checkedButton()
+        if checkedButton is not None and not checkedButton.isEnabled():
+            next(button for button in self.option_buttons.buttons() if button.isEnabled()).setChecked(True)
+
+    def watchVariables(self, lsd: LiveSplitData):
+        if lsd.variables_future is not None:
+            lsd.variables_future.add_done_callback(lambda future: self.variablesLoaded.emit())
+
+    def refreshHeaders(self):
+        if self.currentPlot is None or self.currentGraph is None:
+            return
+
+        # titles of the graphs drawn before the variables arrived are out of date too
+        for entry in self.graphCache.entries.values():
+            entry.plot.refresh_headers()
+            entry.background = None
+        self.currentGraph.draw_idle()
+
+    def updateWatchedFile(self):
+        watched = self.fileWatcher.files()
+        if watched:
+            self.fileWatcher.removePaths(watched)
+
+        if self.actionWatch.isChecked() and self.lsd is not None:
+            self.fileWatcher.addPath(self.lsd.path)
+
+    def reloadFile(self):
+        if self.lsd is None or not self.actionWatch.isChecked():
+            return
+
+        # the running merge will be followed by another look at the file
+        if self.worker.is_busy("reload"):
+            self.reloadTimer.start()
+            return
+
+        # merging runs after any extraction already queued for this file, never at the same time
+        lsd = self.lsd
+        self.worker.submit("reload", lambda: (lsd, lsd.reload()))
+
+    def rewatchFile(self):
+        # saving by replacing the file drops it from the watcher
+        if self.lsd is not None and self.actionWatch.isChecked() and self.lsd.path not in self.fileWatcher.files():
+            self.fileWatcher.addPath(self.lsd.path)
+
+    def fileReloaded(self, lsd: LiveSplitData, new_attempts: int):
+        self.rewatchFile()
+        if lsd is not self.lsd:
+            return
+
+        if new_attempts != 0:
+            # every other cached graph shows the file as it was, the one on screen is moved over to the new attempts
+            self.graphCache.clear(keep=self.currentEntry())
+            if [self.listSplits.item(i).text() for i in range(self.listSplits.count())] != self.lsd.split_names:
+                self.loadSplitsList()
+
+        # also picks up clicks that came in while merging
+        self.loadGraph()
         
     def loadSplitsList(self):
         self.listSplits.clear()
-        self.listSplits.addItems(self.lsd.split_names)
+        self.listSplits.addItems(self.comparison.split_names if self.comparison is not None else self.lsd.split_names)
     
     def loadGraph(self):
         checkedButton = self.option_buttons.checkedButton()
-        if checkedButton is None or self.lsd is None:
+        if checkedButton is None or (self.lsd is None and self.comparison is None):
+            return
+
+        # the data is being merged on the worker, fileReloaded() comes back here
+        if self.worker.is_busy("reload"):
             return
         
         if self.listSplits.currentItem() is None:
             self.listSplits.setCurrentRow(0)
 
-        # remove old graph or placeholder
-        self.removeGraphAndToolbar()
+        # one canvas for the lifetime of the window, replaces the placeholder the first time
+        if self.currentGraph is None:
+            self.createCanvas()
 
-        # define new graph and toolbar
-        fig = self.getFigure(Graph(checkedButton.text()))
-        self.currentGraph = FigureCanvasQTAgg(fig)
-        self.currentGraph.setSizePolicy(QSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Expanding))
-        self.currentToolbar = NavigationToolbar(canvas=self.currentGraph, parent=self)
-        self.currentToolbar.setStyleSheet("background-color: white;")
+        # whatever was asked for before this is stale
+        self.worker.cancel("graph")
 
-        # TODO why is this here?
-        plt.grid()
-        plt.tight_layout()
+        graph = Graph(checkedButton.text())
+        key = self.viewKey(graph)
+        if key == self.currentKey:
+            return
 
-        # add new graph to layout
-        self.graph_layout.addWidget(self.currentToolbar)
-        self.graph_layout.addWidget(self.currentGraph)     
-            
-    def getFigure(self, graph: Graph) -> Figure:
-        plot = Plot(
-            livesplit_data=self.lsd, 
-            split_name=self.listSplits.currentItem().text(), 
-            split_index=self.listSplits.currentRow(),
-            theme=self.getTheme(self.color_options.currentText()), 
-            show_outliers=self.check_showOutliers.isChecked()
+        # seen recently, put the pixels from last time back
+        entry = self.graphCache.get(key)
+        if entry is not None:
+            self.showGraph(entry)
+            if entry.background is not None and entry.size == self.currentGraph.get_width_height():
+                self.currentGraph.restore_region(entry.background)
+                self.currentGraph.blit(self.figure.bbox)
+            else:
+                self.currentGraph.draw_idle()
+            return
+
+        # only the colours changed, recolour what's on screen
+        current = self.currentEntry()
+        if current is not None and current.key[:2] == key[:2] and current.key[3:] == key[3:]:
+            current.plot.apply_theme(self.getTheme(self.color_options.currentText()))
+            self.graphChanged(current, key)
+            return
+
+        # extraction and everything else the graph is drawn from is worked out on the worker, see prepareGraph()
+        request = self.graphRequest(graph, key)
+        self.worker.submit("graph", Window.prepareGraph, request)
+
+    def segmentParams(self) -> dict:
+        return dict(
+            segment_index=self.listSplits.currentRow(),
+            show_outliers=self.check_showOutliers.isChecked(),
+            outlier_strategy=self.getOutlierStrategy(),
+            outlier_threshold=self.outlier_threshold.value(),
+            window=self.moving_avg_window.value(),
+            history_range=self.historyRange(),
+        )
+
+    def historyRange(self) -> HistoryRange:
+        ''' The part of the history picked with the range controls, 0 (or the earliest date) is no bound. '''
+        from history import HistoryRange
+
+        return HistoryRange(
+            attempts=(self.range_first.value() or None, self.range_last.value() or None),
+            dates=(self.rangeDay(self.range_from), self.rangeDay(self.range_to)),
+            last_days=self.range_days.value() or None,
+            finished_only=self.check_finishedOnly.isChecked(),
+        )
+
+    @staticmethod
+    def rangeDay(edit: QDateEdit) -> str | None:
+        # the minimum shows the special value text, it stands for no bound
+        if edit.date() == edit.minimumDate():
+            return None
+        return edit.date().toString("yyyy-MM-dd")
+
+    def binParams(self) -> dict:
+        rule = self.getBinRule()
+        return dict(
+            rule=rule,
+            width=self.bin_width.value() if rule == BinRule.FIXED else None,
+            density=self.check_density.isChecked(),
         )
 
-        # generate figure object
+    @staticmethod
+    def extractSegmentView(lsd: LiveSplitData, params: dict, bins: dict | None = None) -> tuple[DataFrame, DataFrame, Distribution | None]:
+        '''
+        Runs on the worker. Every extraction builds new frames, so the ones returned stay as they are
+        when the next request changes the view of `lsd`. The histogram counts come along with `bins`.
+        '''
+        lsd.extract_segment_data(**params)
+        distribution = lsd.segment_distribution(**bins) if bins is not None else None
+        return lsd.segment_times, lsd.avg_segment_times, distribution
+
+    def graphRequest(self, graph: Graph, key: tuple) -> dict:
+        ''' Everything `prepareGraph` needs from the window, read here so the worker never touches a widget. '''
+        return dict(
+            graph=graph,
+            key=key,
+            lsd=self.lsd,
+            comparison=self.comparison,
+            split_name=self.listSplits.currentItem().text(),
+            theme=self.getTheme(self.color_options.currentText()),
+            segment=self.segmentParams(),
+            bins=self.binParams() if graph == Graph.HISTOGRAM else None,
+        )
+
+    @staticmethod
+    def prepareGraph(request: dict) -> tuple[dict, dict]:
+        '''
+        Runs on the worker. Works out what the graph is drawn from, as the keyword arguments of `Plot.draw`: the
+        segment frames and histogram counts of a split, reset analyses and split times, the times of every file of a
+        comparison. The window only makes or moves artists with them, see graphReady().
+        '''
+        graph, lsd, comparison, segment = request['graph'], request['lsd'], request['comparison'], request['segment']
+        history_range = segment['history_range']
+
+        # every file of a comparison was read up front, only the histogram has anything left to extract
+        if comparison is not None:
+            if graph != Graph.HISTOGRAM:
+                return request, {}
+            segment_seconds = comparison.segment_seconds(
+                segment['segment_index'],
+                show_outliers=segment['show_outliers'],
+                outlier_strategy=segment['outlier_strategy'],
+                outlier_threshold=segment['outlier_threshold'],
+                history_range=history_range,
+            )
+            return request, dict(segment_seconds=segment_seconds)
+
+        if graph.is_split_graph:
+            segment_times, avg_segment_times, distribution = Window.extractSegmentView(lsd, segment, request['bins'])
+            return request, dict(segment_times=segment_times, avg_segment_times=avg_segment_times, distribution=distribution)
+
         match graph:
-            case Graph.HISTOGRAM:
-                self.lsd.extract_segment_data(
-                    segment_index=self.listSplits.currentRow(),
-                    show_outliers=self.check_showOutliers.isChecked(),
-                )
+            case Graph.RESET_DISTRIBUTION | Graph.SURVIVAL:
+                return request, dict(resets=lsd.reset_analysis(history_range))
+            case Graph.RUN_PROGRESSION:
+                return request, dict(progression=lsd.run_progression(history_range))
+            case Graph.SOB_OVER_TIME:
+                # golds are found the first time they're asked for, better here than while drawing
+                lsd.best_segments
+        # the range is looked up in columns that are worked out on first use too
+        lsd.query(history_range)
+        return request, {}
+
+    def graphReady(self, request: dict, data: dict):
+        # worked out for a file that's been closed since
+        source = request['comparison'] if request['comparison'] is not None else request['lsd']
+        if source is not (self.comparison if self.comparison is not None else self.lsd):
+            return
 
-                fig = plot.hist(self.lsd.segment_times["seg_times"])
+        # the same graph of other data, move what's on screen over to it
+        current = self.currentEntry()
+        if current is not None and current.graph == request['graph']:
+            self.updateFigure(current, request, data)
+            self.graphChanged(current, request['key'])
+            return
+
+        entry = CachedGraph(self.drawFigure(request, data), request['graph'], request['key'])
+        self.graphCache.put(entry)
+        self.showGraph(entry)
+        self.currentGraph.draw_idle()
+
+    def graphChanged(self, entry: CachedGraph, key: tuple):
+        ''' The graph on screen was updated in place to show the view of `key`. '''
+        entry.background = None
+        self.graphCache.rekey(entry, key)
+        self.showGraph(entry)
+        self.currentGraph.draw_idle()
+
+    def currentEntry(self) -> CachedGraph | None:
+        return self.graphCache.entries.get(self.currentKey) if self.currentKey is not None else None
+
+    def viewKey(self, graph: Graph) -> tuple:
+        theme = self.color_options.currentText()
+        source = (self.comparison.identity if self.comparison is not None else self.lsd.file_identity, self.historyRange())
+        match graph:
+            case Graph.HISTOGRAM:
+                return (source, graph, theme, self.listSplits.currentRow(), self.check_showOutliers.isChecked(), self.getOutlierStrategy(), self.outlier_threshold.value(), *self.binParams().values())
             case Graph.MOVING_AVERAGE:
-                self.lsd.extract_segment_data(
-                    segment_index=self.listSplits.currentRow(),
-                    show_outliers=self.check_showOutliers.isChecked(),
-                )
-        
-                fig = plot.moving_avg(self.lsd.segment_times, self.lsd.avg_segment_times)
-
-                # have to call this here, doesn't work in Plot class
-                fig.canvas.mpl_connect("motion_notify_event", lambda event=None : plot.hover_scatter(event))
-            case Graph.ATTEMPTS_OVER_TIME:
-                fig = plot.attempts_over_time()
-                fig.canvas.mpl_connect("motion_notify_event", lambda event=None : plot.hover_plot(event, graph=Graph.ATTEMPTS_OVER_TIME))
-            case Graph.IMP_OVER_ATTEMPTS:
-                fig = plot.imp_over_attempts()
-            case Graph.IMP_OVER_TIME: 
-                fig = plot.imp_over_time()
-            case Graph.PB_OVER_TIME:
-                fig = plot.personal_best_over_time()
-                fig.canvas.mpl_connect("motion_notify_event", lambda event=None : plot.hover_plot(event, graph=Graph.PB_OVER_TIME))
-            case Graph.PB_OVER_ATTEMPTS:
-                fig = plot.personal_best_over_attempts()
-                fig.canvas.mpl_connect("motion_notify_event", lambda event=None : plot.hover_plot(event, graph=Graph.PB_OVER_ATTEMPTS))
+                return (source, graph, theme, self.listSplits.currentRow(), self.check_showOutliers.isChecked(), self.getOutlierStrategy(), self.outlier_threshold.value(), self.moving_avg_window.value())
             case _:
-                NotImplementedError("Graph not implemented.")
-                return
-        
-        return fig
+                # graphs of the whole category don't depend on the split or outlier options
+                return (source, graph, theme)
 
-    def removeCurrentGraph(self):
-        if self.currentGraph is None:
+    def createCanvas(self):
+        # already imported by preloadModules() unless a graph was asked for right away
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT as NavigationToolbar
+
+        self.graph_placeholder.setParent(None)
+
+        # the layout is worked out again on every draw, for whichever axes are visible
+        self.figure = Figure(layout="tight")
+        self.currentGraph = FigureCanvasQTAgg(self.figure)
+        self.currentGraph.setSizePolicy(QSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Expanding))
+        self.currentToolbar = NavigationToolbar(canvas=self.currentGraph, parent=self)
+        self.currentToolbar.setStyleSheet("background-color: white;")
+
+        # hovering goes to whatever plot is currently drawn
+        self.currentGraph.mpl_connect("motion_notify_event", self.hoverGraph)
+        self.currentGraph.mpl_connect("draw_event", self.graphDrawn)
+
+        self.graph_layout.addWidget(self.currentToolbar)
+        self.graph_layout.addWidget(self.currentGraph)
+
+    def showGraph(self, entry: CachedGraph):
+        # the cursor left the previous graph with it
+        if self.currentPlot is not None:
+            self.currentPlot.hide_annot(redraw=False)
+
+        for cached in self.graphCache.entries.values():
+            cached.plot.ax.set_visible(cached is entry)
+        self.figure.patch.set_facecolor(entry.plot.theme.figure_color)
+
+        self.currentKey = entry.key
+        self.currentPlot = entry.plot
+        self.currentGraphType = entry.graph
+
+        # the old view limits belong to the previous graph
+        self.currentToolbar.update()
+
+    def graphDrawn(self, event):
+        entry = self.graphCache.entries.get(self.currentKey)
+        if entry is None:
             return
 
-        plt.close("all")
-        self.currentGraph.setParent(None)
-        self.graph_layout.removeWidget(self.currentGraph)
-        self.currentGraph = None
-            
-    def removeCurrentToolbar(self):
-        if self.currentToolbar is None:
+        if startup.enabled and not startup.reported:
+            startup.mark("first graph drawn")
+            startup.report()
+
+        entry.background = self.currentGraph.copy_from_bbox(self.figure.bbox)
+        entry.size = self.currentGraph.get_width_height()
+        self.graphCache.evict()
+
+    def removeCachedGraph(self, entry: CachedGraph):
+        entry.plot.remove()
+
+    def clearGraphCache(self):
+        self.graphCache.clear()
+        self.currentKey = None
+        self.currentPlot = None
+
+    def hoverGraph(self, event):
+        if self.currentPlot is None:
             return
-        
-        self.currentToolbar.setParent(None)
-        self.graph_layout.removeWidget(self.currentToolbar)
-        self.currentToolbar = None
 
-    def removeGraphAndToolbar(self):
-        self.removeCurrentGraph()
-        self.removeCurrentToolbar()
-        self.graph_placeholder.setParent(None)
-        gc.collect()
-    
+        # every line of a comparison is some runner's
+        if self.comparison is not None:
+            self.currentPlot.hover_plot(event, graph=self.currentGraphType)
+            return
+
+        match self.currentGraphType:
+            case Graph.MOVING_AVERAGE:
+                self.currentPlot.hover_scatter(event)
+            case Graph.ATTEMPTS_OVER_TIME | Graph.PB_OVER_TIME | Graph.PB_OVER_ATTEMPTS | Graph.SOB_OVER_TIME | Graph.SURVIVAL:
+                self.currentPlot.hover_plot(event, graph=self.currentGraphType)
+            case Graph.RUN_PROGRESSION:
+                self.currentPlot.hover_progression(event)
+            case Graph.RESET_DISTRIBUTION:
+                self.currentPlot.hover_bars(event)
+
+    @staticmethod
+    def updateFigure(entry: CachedGraph, request: dict, data: dict):
+        '''
+        Move the graph of `entry` over to another request for the same graph. The split graphs of a file move their
+        artists to the new data. The other graphs are drawn again inside the same axes: their artists are made from
+        the whole range at once (a line per runner, a bar per split, the legend), there's nothing to keep.
+        '''
+        plot = entry.plot
+        if entry.key[2] != request['key'][2]:
+            plot.apply_theme(request['theme'])
+
+        segment = request['segment']
+        plot.split_name, plot.split_index = request['split_name'], segment['segment_index']
+        plot.show_outliers = segment['show_outliers']
+        if request['comparison'] is not None or not entry.graph.is_split_graph:
+            plot.redraw(entry.graph, segment['history_range'], **data)
+            return
+
+        # the frames are already cut down to the range, the title still says which it is
+        plot.set_history_range(segment['history_range'])
+        match entry.graph:
+            case Graph.HISTOGRAM:
+                plot.update_hist(data['segment_times']["seconds"], request['split_name'], data['distribution'])
+            case Graph.MOVING_AVERAGE:
+                plot.update_moving_avg(data['segment_times'], data['avg_segment_times'], request['split_name'])
+
+    def drawFigure(self, request: dict, data: dict) -> Plot:
+        if request['comparison'] is not None:
+            return self.drawComparison(request, data)
+
+        from plot import Plot
+
+        segment = request['segment']
+        plot = Plot(
+            livesplit_data=request['lsd'],
+            split_name=request['split_name'],
+            split_index=segment['segment_index'],
+            theme=request['theme'],
+            show_outliers=segment['show_outliers'],
+            fig=self.figure,
+            history_range=segment['history_range'],
+        )
+
+        # draw into new axes of the canvas figure
+        plot.draw(request['graph'], **data)
+        return plot
+
+    def drawComparison(self, request: dict, data: dict) -> Plot:
+        from comparison_plot import ComparisonPlot
+
+        segment = request['segment']
+        plot = ComparisonPlot(
+            comparison=request['comparison'],
+            split_name=request['split_name'],
+            split_index=segment['segment_index'],
+            theme=request['theme'],
+            show_outliers=segment['show_outliers'],
+            fig=self.figure,
+            history_range=segment['history_range'],
+        )
+        plot.draw(request['graph'], **data)
+        return plot
+
+    def closeEvent(self, event):
+        self.worker.shutdown()
+        super().closeEvent(event)
+
     def getTheme(self, theme_str: str):
         theme_variant = ThemeVariant.from_str(theme_str)
         return Theme.from_variant(theme_variant)
     
 
 
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Show LiveSplit data in graphs.")
+    parser.add_argument('file', nargs='?', help=".lss file to open")
+    parser.add_argument('--startup-report', action='store_true', help="print how long each part of starting up took")
+    # Qt takes its own arguments (-style, ...)
+    return parser.parse_known_args(argv)[0]
+
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = Window()
-    window.show()
+    # comparisons read files in child processes, which start from this script when it's frozen into an exe
+    import multiprocessing
+    multiprocessing.freeze_support()
+
+    args = parse_args(sys.argv[1:])
+
+    with startup.stage("QApplication"):
+        app = QApplication(sys.argv)
+    with startup.stage("Window"):
+        window = Window()
+    with startup.stage("show"):
+        window.show()
+
+    # zero timers run once the event loop has handled showing the window
+    QTimer.singleShot(0, lambda: startup.mark("first paint"))
+    if args.file is not None:
+        QTimer.singleShot(0, lambda: window.openFile(args.file))
+    else:
+        QTimer.singleShot(0, startup.report)
+
     sys.exit(app.exec())
\ No newline at end of file
@@ -1,298 +1,412 @@
-import datetime
-from dateutil import relativedelta
-import xml.etree.ElementTree as ET
-from statistics import pstdev, mean
+import numpy as np
 import pandas as pd
-from time import perf_counter
 
 import variables
+import parse_cache
+import livesplit_time
+from lss_reader import read_lss, LssContents
+from attempt_table import AttemptTable
+from segment_matrix import SegmentMatrix
+from best_segments import BestSegments
+from resets import ResetAnalysis, splits_reached
+from progression import RunProgression
+from history import HistoryRange, HistoryView
+from outliers import outlier_mask
+from distribution import Distribution
+from graph_options import BinRule, OutlierStrategy
+from rolling import rolling_stats, extend_rolling_stats
+
+
+def day_groups(days: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    ''' Split a chronological array of days into runs of the same day.
+
+        Returns the position each run starts at and the (exclusive) position it ends at.
+    '''
+    if len(days) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    starts = np.flatnonzero(days[1:] != days[:-1]) + 1
+    starts = np.concatenate(([0], starts))
+    ends = np.append(starts[1:], len(days))
+    return starts, ends
+
+
+def extend_day_groups(dates: np.ndarray, counts: np.ndarray, totals: np.ndarray | None, new_days: np.ndarray, offset: int, new_values: np.ndarray | None = None):
+    '''
+    Add `new_days` to per-day series: `dates` of each day, cumulative `counts` at the end of each day and
+    optionally `totals` of `new_values` per day. `offset` is how many items the existing series cover.
+
+    A first new day equal to the last existing day is merged into it.
+    '''
+    starts, ends = day_groups(new_days)
+    new_dates = new_days[starts]
+    new_counts = ends + offset
+    new_totals = None
+    if totals is not None:
+        new_totals = np.add.reduceat(new_values, starts) if len(starts) else np.empty(0, dtype=totals.dtype)
+
+    counts = counts.copy()
+    if totals is not None:
+        totals = totals.copy()
+    if len(dates) and len(new_dates) and new_dates[0] == dates[-1]:
+        counts[-1] = new_counts[0]
+        new_dates, new_counts = new_dates[1:], new_counts[1:]
+        if totals is not None:
+            totals[-1] += new_totals[0]
+            new_totals = new_totals[1:]
+
+    dates = np.concatenate((dates, new_dates))
+    counts = np.concatenate((counts, new_counts))
+    if totals is not None:
+        totals = np.concatenate((totals, new_totals))
+    return dates, counts, totals
 
 
 class LiveSplitData():
     avg_segment_times: pd.DataFrame
     segment_times: pd.DataFrame
+    segment_view: tuple | None = None
+    segment_view_rows = 0
     
-    def __init__(self, path: str):
-        start = perf_counter()
-        self.set_XML_root(path)
-        self.segments = self.xroot.find('Segments')
-        self.game_name = self.xroot.find('GameName').text
-        self.game_category = self.xroot.find('CategoryName').text
-        self.variables = self.xroot.find('Metadata').find('Variables')
-        self.split_names = [segment.find('Name').text for segment in self.segments]
-        self.available_variables = variables.get_category_variables(self.game_name, self.game_category)
+    def __init__(self, path: str, use_cache=True, fetch_variables=True, columns: tuple | None = None):
+        ''' `columns` is what `to_columns` returned for the same file, in another process for example. '''
+        self.path = path
+        self.use_cache = use_cache
+
+        if columns is not None:
+            self.file_identity, data, arrays = columns
+            self.restore_columns(data, arrays)
+            loaded_from_cache = True
+        else:
+            self.file_identity = parse_cache.FileIdentity.of(path)
+            loaded_from_cache = use_cache and self.load_cached()
+        if not loaded_from_cache:
+            self.load_file(path)
+
+        # filled in when the speedrun.com lookup finishes, headers are drawn without variables until then
+        self.available_variables = 0
+        self.variables_future = None
+        if fetch_variables:
+            self.variables_future = variables.get_category_variables_async(self.game_name, self.game_category)
+            self.variables_future.add_done_callback(self.set_available_variables)
 
         self.extract_category_data()
-        
-        end = perf_counter()
-        # print(end-start)
 
-    def set_XML_root(self, path):
-        xtree = ET.parse(path)
-        self.xroot = xtree.getroot()
+        if not loaded_from_cache:
+            self.update_cache()
+
+    def set_available_variables(self, future):
+        self.available_variables = future.result()
+
+    def wait_for_variables(self, timeout: float | None = None):
+        ''' Block until the speedrun.com lookup is done, for drawing headers that won't be refreshed later. '''
+        if self.variables_future is not None:
+            self.available_variables = self.variables_future.result(timeout)
+
+    def load_file(self, path):
+        contents: LssContents = read_lss(path)
+        self.game_name = contents.game_name
+        self.game_category = contents.category_name
+        self.variables = contents.variables
+        self.split_names = contents.split_names
+        self.segment_histories = contents.segment_histories
+        self.attempts = AttemptTable.from_contents(contents)
+        self._segment_matrix = None
+        self._best_segments = None
+        self._splits_reached = None
+        self._latest_ended = None
+        self.segment_view = None
+        self.distribution_key, self.distribution = None, None
+
+    def load_cached(self) -> bool:
+        ''' Restore the parsed columns from the on-disk cache, False when there's no usable entry. '''
+        cached = parse_cache.load(self.file_identity)
+        if cached is None:
+            return False
+
+        self.restore_columns(*cached)
+        return True
+
+    def store_cached(self):
+        _, data, arrays = self.to_columns()
+        parse_cache.store(self.file_identity, data, arrays)
+
+    def update_cache(self):
+        if self.use_cache:
+            self.store_cached()
+
+    def to_columns(self) -> tuple[parse_cache.FileIdentity, dict, dict[str, np.ndarray]]:
+        ''' Everything parsed from the file as plain metadata and typed arrays, cheap to store or send to another process. '''
+        data = {
+            'game_name': self.game_name,
+            'game_category': self.game_category,
+            'variables': self.variables,
+            'split_names': self.split_names,
+        }
+        arrays = self.attempts.to_arrays() | self.segment_matrix.to_arrays()
+        return self.file_identity, data, arrays
+
+    def restore_columns(self, data: dict, arrays: dict[str, np.ndarray]):
+        self.game_name = data['game_name']
+        self.game_category = data['game_category']
+        self.variables = data['variables']
+        self.split_names = data['split_names']
+        self.segment_histories = None
+        self.attempts = AttemptTable.from_arrays(arrays)
+        self._segment_matrix = SegmentMatrix.from_arrays(arrays)
+        self._best_segments = None
+        self._splits_reached = None
+        self._latest_ended = None
+        self.segment_view = None
+        self.distribution_key, self.distribution = None, None
+
+    @property
+    def segment_matrix(self) -> SegmentMatrix:
+        ''' Attempts x segments times, decoded from the segment histories on first access. '''
+        if self._segment_matrix is None:
+            self._segment_matrix = SegmentMatrix.from_histories(self.segment_histories, self.pb_id)
+            # raw strings aren't needed anymore
+            self.segment_histories = None
+        return self._segment_matrix
+
+    @property
+    def best_segments(self) -> BestSegments:
+        ''' Golds and sum of best of every segment, worked out on first access and extended by `reload`. '''
+        if self._best_segments is None:
+            self._best_segments = BestSegments.from_matrix(self.segment_matrix)
+        return self._best_segments
+
+    @property
+    def splits_reached(self) -> np.ndarray:
+        ''' How many splits every attempt in `attempts` got through, worked out on first access. '''
+        if self._splits_reached is None:
+            self._splits_reached = splits_reached(self.segment_matrix, self.attempts)
+        return self._splits_reached
+
+    @property
+    def latest_ended(self) -> np.ndarray:
+        ''' Latest end stamp (epoch seconds) up to every attempt, sorted even where LiveSplit wrote them out of order. '''
+        if self._latest_ended is None:
+            # MISSING is the smallest int64, attempts without a stamp take the one before them
+            self._latest_ended = np.maximum.accumulate(self.attempts.ended) if len(self.attempts) else self.attempts.ended
+        return self._latest_ended
+
+    def query(self, history_range: HistoryRange | None = None) -> HistoryView:
+        ''' The category series of the attempts in `history_range` (all of them without one), see `HistoryView`. '''
+        return HistoryView(self, history_range)
+
+    def reset_analysis(self, history_range: HistoryRange | None = None) -> ResetAnalysis:
+        ''' Where the attempts in `history_range` were reset. '''
+        view = self.query(history_range)
+        positions = slice(view.first, view.last)
+        return ResetAnalysis(self.splits_reached[positions], self.attempts.finished[positions], len(self.split_names))
+
+    def run_progression(self, history_range: HistoryRange | None = None) -> RunProgression:
+        ''' Split times of the attempts in `history_range` as the lines of the Run Progression graph. '''
+        return RunProgression(self.segment_matrix, self.query(history_range).rows)
+
+    def attempt_positions(self, attempt_ids: np.ndarray) -> np.ndarray:
+        ''' Position in `attempts` of every id in `attempt_ids`. '''
+        order = np.argsort(self.attempts.ids, kind='stable')
+        found = np.searchsorted(self.attempts.ids, attempt_ids, sorter=order)
+        return order[np.minimum(found, len(order) - 1)]
+
+    def sum_of_best_history(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        '''
+        Every attempt that lowered the sum of best: its 1-based position in `attempts`, when it ended
+        (datetime64, NaT without a stamp) and the new sum of best in ticks.
+        '''
+        best_segments = self.best_segments
+        positions = self.attempt_positions(self.segment_matrix.attempt_ids[best_segments.sob_rows])
+        ended = livesplit_time.epoch_to_datetime64(self.attempts.ended[positions])
+        return positions + 1, ended, best_segments.sob
         
     def extract_category_data(self):
-        ''' Extract necessary data to plot CATEGORY graphs
+        ''' Extract necessary data to plot CATEGORY graphs from `self.attempts`, every series is a slice or
+            grouped reduction of its columns
             - Finished Dates & Attempted Dates
-            - Finished Times
+            - Finished Times (ticks)
             - Finished Indexes & Attempted Indexes
-            -
+            - Daily Time Played (seconds)
         '''
-        self.finished_dates, self.finished_times, self.finished_indexes = [], [], []
-        self.pb_dates, self.pb_times = [], []
-        self.pb_abs_indexes = []
-        self.finished_attempts = []
-        self.unique_finished_dates = []
-
-        pb_time = datetime.datetime.strptime("23:59:59", "%H:%M:%S")
-        last_date = None
-        finished_counter = 0
-        for i, attempt in enumerate(self.xroot.find('AttemptHistory')):
-            real_time = attempt.find('RealTime')
-            if real_time is None: # if run not finished
-                continue
-
-            finished_date = datetime.datetime.strptime(attempt.attrib.get('ended')[:10], '%m/%d/%Y')
-            finished_counter += 1
-            if last_date is None:
-                last_date = finished_date
-
-            # update counter if same day
-            if finished_date == last_date and len(self.finished_attempts) != 0:
-                self.finished_attempts[-1] = finished_counter
-
-            # first attempt or different date
-            else:
-                self.unique_finished_dates.append(finished_date)
-                self.finished_attempts.append(finished_counter)
-
-            self.finished_dates.append(finished_date)
-
-            last_date = finished_date
-
-            t = real_time.text
-            if len(t) == 8:
-                    t += ".0000100"
-            finished_time = datetime.datetime.strptime(t[:-1], '%H:%M:%S.%f')
-            self.finished_times.append(finished_time)
-            self.finished_indexes.append(i+1)
-
-            # check if PB
-            if finished_time < pb_time:
-                self.pb_dates.append(finished_date)
-                self.pb_times.append(finished_time)
-                pb_time = finished_time
-                self.pb_abs_indexes.append(i+1)
-                # TODO this can crash
-                self.pb_id = int(attempt.attrib.get('id'))
-
-
-        self.AOT_dates, self.AOT_attempts, self.daily_time_played = [], [], []
-        attempt_history = self.xroot.find('AttemptHistory')
-        current_dates = [datetime.datetime.strptime(attempt.attrib.get('ended')[:10], '%m/%d/%Y') for attempt in attempt_history]
-        time_played = [datetime.datetime.strptime(attempt.attrib.get('ended'), '%m/%d/%Y %H:%M:%S') - datetime.datetime.strptime(attempt.attrib.get('started'), '%m/%d/%Y %H:%M:%S') for attempt in attempt_history]
-        total_daily_playtime = relativedelta.relativedelta(hour=0)
-        last_date = None
-        for i, current_date in enumerate(current_dates):
-            # initial avoid issues with NoneType
-            if last_date is None:
-                last_date = current_date
-            
-            # different day?
-            if current_date != last_date:
-                self.AOT_dates.append(last_date)
-                self.AOT_attempts.append(i)
-                self.daily_time_played.append(total_daily_playtime)
-                total_daily_playtime = relativedelta.relativedelta(hour=0)
-
-            # final attempt
-            if i+1 == len(current_dates):
-                self.AOT_dates.append(current_date)
-                self.AOT_attempts.append(i+1)
-
-                # update total now since it's the last cycle
-                time_in_attempt = time_played[i]
-                total_daily_playtime += time_in_attempt
-                self.daily_time_played.append(total_daily_playtime)
-            
-            last_date = current_date
-            time_in_attempt = time_played[i]
-            total_daily_playtime += time_in_attempt
-        
-        xm = pd.DataFrame({
-            "dates": self.AOT_dates,
-            "attempts": self.AOT_attempts,
-        })
+        empty_days = np.empty(0, dtype='datetime64[D]')
+        empty = np.empty(0, dtype=np.int64)
+        self.finished_indexes, self.finished_times, self.finished_dates = empty, empty, empty_days
+        self.pb_dates, self.pb_times, self.pb_abs_indexes = empty_days, empty, empty
+        self.pb_id = None
+        self.unique_finished_dates, self.finished_attempts = empty_days, empty
+        self.AOT_dates, self.AOT_attempts, self.daily_time_played = empty_days, empty, empty
+
+        self.extend_category_data(0)
+
+    def extend_category_data(self, first_new: int):
+        ''' Update the category series with the attempts from position `first_new` on, older attempts aren't looked at. '''
+        attempts = self.attempts
+        ended_days = livesplit_time.epoch_to_datetime64(attempts.ended[first_new:]).astype('datetime64[D]')
+
+        finished_positions = np.flatnonzero(attempts.finished[first_new:]) + first_new
+        finished_times = attempts.real_time[finished_positions]
+        finished_dates = ended_days[finished_positions - first_new]
+        finished_before = len(self.finished_times)
+
+        self.finished_indexes = np.concatenate((self.finished_indexes, finished_positions + 1))
+        self.finished_times = np.concatenate((self.finished_times, finished_times))
+        self.finished_dates = np.concatenate((self.finished_dates, finished_dates))
+
+        # a PB is a finished run faster than every finished run before it
+        best = self.pb_times[-1] if len(self.pb_times) else np.iinfo(np.int64).max
+        previous_best = np.minimum.accumulate(np.concatenate(([best], finished_times)))[:-1]
+        pb_positions = finished_positions[finished_times < previous_best]
+
+        self.pb_dates = np.concatenate((self.pb_dates, ended_days[pb_positions - first_new]))
+        self.pb_times = np.concatenate((self.pb_times, attempts.real_time[pb_positions]))
+        self.pb_abs_indexes = np.concatenate((self.pb_abs_indexes, pb_positions + 1))
+        if len(pb_positions):
+            self.pb_id = int(attempts.ids[pb_positions[-1]])
+
+        # finished runs per day, counted cumulatively
+        self.unique_finished_dates, self.finished_attempts, _ = extend_day_groups(
+            self.unique_finished_dates, self.finished_attempts, None, finished_dates, finished_before
+        )
+
+        # attempts and time played per day
+        started, ended = attempts.started[first_new:], attempts.ended[first_new:]
+        has_stamps = (started != livesplit_time.MISSING) & (ended != livesplit_time.MISSING)
+        time_played = np.where(has_stamps, ended - started, 0)
+        self.AOT_dates, self.AOT_attempts, self.daily_time_played = extend_day_groups(
+            self.AOT_dates, self.AOT_attempts, self.daily_time_played, ended_days, first_new, time_played
+        )
+
+    def reload(self) -> int:
+        '''
+        Merge the attempts LiveSplit added to the file since it was loaded and return how many there are.
+
+        Only attempts newer than the last known one are decoded and every series is extended rather than rebuilt.
+        Falls back to a full reload when the file changed in any other way (splits edited, history cleared).
+        Nothing is read while the file keeps its size and mtime, the merged data is written back to the parse cache.
+        '''
+        if self.file_identity.matches_stat():
+            return 0
+
+        # hashed before reading, a write in between leaves the cache entry stale rather than wrong
+        self.file_identity = parse_cache.FileIdentity.of(self.path)
+        last_id = int(self.attempts.ids.max()) if len(self.attempts) else 0
+        contents = read_lss(self.path, after_attempt_id=last_id)
+
+        if contents.split_names != self.split_names or contents.max_attempt_id < last_id:
+            self.load_file(self.path)
+            self.extract_category_data()
+            self.update_cache()
+            return len(self.attempts)
+
+        new_attempts = AttemptTable.from_contents(contents)
+        if len(new_attempts) == 0:
+            self.update_cache()
+            return 0
+
+        # make sure the older history is decoded before appending to it
+        segment_matrix = self.segment_matrix
+
+        first_new = len(self.attempts)
+        self.attempts.append(new_attempts)
+        self.extend_category_data(first_new)
+        segment_matrix.append(contents.segment_histories, self.pb_id)
+        if self._best_segments is not None:
+            self._best_segments.extend(segment_matrix)
+        # one pass over the matrix, cheaper to redo than to patch
+        self._splits_reached = None
+        self._latest_ended = None
+        self.update_cache()
+        return len(new_attempts)
     
-    def extract_segment_data(self, segment_index: int, show_outliers: bool):
+    def extract_segment_data(self, segment_index: int, show_outliers: bool, outlier_strategy=OutlierStrategy.STANDARD_DEVIATION, outlier_threshold: float | None = None, window: int = 10, history_range: HistoryRange | None = None):
         ''' Extracts following data with and without outliers:
-            - Segment Times
+            - Segment Times (seconds)
             - Segment Indexes
-            - Average Segment Time every 10 times
-            - Index for that Average Segment Time
+            - Rolling mean, median, standard deviation and percentiles over the last `window` times
+            - Index for those rolling statistics
+
+            Only the attempts in `history_range` are taken, all of them without one. Asking for the same view of
+            the whole history again only processes attempts added by `reload` since the last call.
         '''
-        seg_times = []
-        self.from_pb = []
-        attempt_ids = []
-        
-        segment = self.segments[segment_index]
-        segment_history = segment.find('SegmentHistory')
-        for attempt in segment_history:
-            try:
-                attempt_id = int(attempt.attrib.get('id'))
-                if attempt_id < 0:
-                    continue
-
-                # TODO add support for GameTime (no)
-                time_type = "RealTime"
-                try:
-                    t: str = attempt.find(time_type).text
-                except AttributeError:
-                    # can't find RealTime element
-                    continue
-
-                # add missing microseconds
-                if len(t) == 8:
-                    t += ".0000100"
-                
-                # remove last digit for microseconds as datetime.strptime() only allows up to 6 decimals after the decimal point, livesplit stores 7 at most
-                dt_time = datetime.datetime.strptime(t[:-1], '%H:%M:%S.%f')
-                seg_times.append(dt_time)
-
-                if attempt_id == self.pb_id:
-                    self.from_pb.append(True)
-                else:
-                    self.from_pb.append(False)
-
-                attempt_ids.append(attempt_id)
-
-            except ValueError as e:
-                print(e)
-                continue
-            except IndexError:
-                #empty Time element
-                continue
-
-        self.avg_segment_times = self.get_averages(seg_times)
-
-        self.segment_times = pd.DataFrame({
-            'seg_times': seg_times,
-            'is_from_pb': self.from_pb,
-            'attempt_ids': attempt_ids,
-        })
+        history_range = history_range if history_range is not None else HistoryRange()
+        view = (segment_index, show_outliers, outlier_strategy, outlier_threshold, window, history_range)
+        row_count = len(self.segment_matrix.attempt_ids)
+        if view == self.segment_view:
+            if row_count == self.segment_view_rows:
+                return
+            # the bounds of a range can move with new attempts, it's worked out again
+            if history_range.is_everything and self.extend_segment_data(show_outliers, outlier_strategy, outlier_threshold, window):
+                self.segment_view_rows = row_count
+                return
+
+        # TODO add support for GameTime (no)
+        first_row, last_row = self.query(history_range).row_range
+        self.all_segment_times = self.get_segment_frame(segment_index, first_row, last_row, history_range.finished_only)
+        self.segment_times = self.all_segment_times
+        self.segment_keep = np.ones(len(self.all_segment_times), dtype=bool)
 
         if not show_outliers:
-            self.remove_segment_outliers()
-        
-    def get_averages(self, seg_times) -> pd.DataFrame:
-        avg_times, avg_indexes = [], []
-        start, end = 0, 10
-
-        while end < len(seg_times):
-            selection = seg_times[start:end]
-            avg_times.append(self.get_avg_HMS(selection))
-            avg_indexes.append(end)
-
-            start = end
-            end += 10
-            
+            self.remove_segment_outliers(outlier_strategy, outlier_threshold)
+
+        self.avg_segment_times = self.get_rolling_stats(self.segment_times["seconds"].to_numpy(), window)
+        self.segment_view = view
+        self.segment_view_rows = row_count
+
+    def extend_segment_data(self, show_outliers: bool, outlier_strategy, outlier_threshold, window: int) -> bool:
+        ''' Add the rows of new attempts to the current segment view, False when it has to be rebuilt instead. '''
+        new_times = self.get_segment_frame(self.segment_view[0], self.segment_view_rows)
+        all_segment_times = pd.concat((self.all_segment_times, new_times), ignore_index=True)
+
+        keep = np.ones(len(all_segment_times), dtype=bool)
+        if not show_outliers:
+            keep = outlier_mask(all_segment_times["seconds"].to_numpy(), outlier_strategy, outlier_threshold)
+            # the limit moved and older times changed sides
+            if not np.array_equal(keep[:len(self.segment_keep)], self.segment_keep):
+                return False
+
+        self.all_segment_times = all_segment_times
+        self.segment_keep = keep
+        new_times = new_times[keep[len(keep) - len(new_times):]]
+        self.segment_times = pd.concat((self.segment_times, new_times), ignore_index=True)
+
+        # a new PB moves the marker off the old PB's time
+        self.from_pb = self.segment_times["attempt_ids"].to_numpy() == self.pb_id
+        self.segment_times["is_from_pb"] = self.from_pb
+
+        stats = extend_rolling_stats(self.avg_segment_times.drop(columns='avg_indexes'), self.segment_times["seconds"].to_numpy(), window)
+        stats.insert(0, 'avg_indexes', np.arange(1, len(stats) + 1))
+        self.avg_segment_times = stats
+        return True
+
+    def segment_distribution(self, rule=BinRule.FREEDMAN_DIACONIS, width: float | None = None, density: bool = True) -> Distribution:
+        ''' Histogram of the current segment view (see `extract_segment_data`), kept until the view or the binning changes. '''
+        key = (self.segment_view, self.segment_view_rows, rule, width, density)
+        if key != self.distribution_key:
+            self.distribution = Distribution(self.segment_times["seconds"].to_numpy(), rule, width, density)
+            self.distribution_key = key
+        return self.distribution
+
+    def get_segment_frame(self, segment_index: int, first_row: int, last_row: int | None = None, finished_only: bool = False) -> pd.DataFrame:
+        attempt_ids, ticks, self.from_pb = self.segment_matrix.column(segment_index, first_row, last_row, finished_only)
         return pd.DataFrame({
-            'avg_times': avg_times,
-            'avg_indexes': avg_indexes,
+            'seconds': ticks / livesplit_time.TICKS_PER_SECOND,
+            'is_from_pb': self.from_pb,
+            'attempt_ids': attempt_ids,
         })
-    
-    def get_avg_HMS(self, values: list):
+        
+    def get_rolling_stats(self, seconds, window: int, percentiles=(10, 90)) -> pd.DataFrame:
         '''
-        Returns datetime object of average time\n
-        values should be a list of datetime objects
+        Rolling statistics of `seconds` (see `rolling.rolling_stats`), `avg_indexes` is the 1-based position
+        of the last time in each window.
         '''
-        total = datetime.timedelta(seconds=0)
-        for time in values:
-            total_seconds = time.hour * 3600 + time.minute * 60 + time.second
-            total += datetime.timedelta(seconds=total_seconds)
-
-        return datetime.datetime(1900, 1, 1, 0, 0, 0) + total / len(values)
+        stats = rolling_stats(seconds, window, percentiles)
+        stats.insert(0, 'avg_indexes', np.arange(1, len(stats) + 1))
+        return stats
     
-    def get_dynamic_interval(self, realtimes: list[datetime.datetime], ticks, format: str):
-        '''formats: %M:%S | %Y-%m-%d | %H:%M:%S'''
-        ticks -= 1
-        sorted_realtimes = sorted(realtimes)
-
-        if format == '%M:%S':
-            #5:26.20 -> 5:26.00
-            start_time = sorted_realtimes[0].replace(microsecond=0)
-            #5:30.40 -> 5:31.00
-            end_time = (sorted_realtimes[-1] + relativedelta.relativedelta(seconds=1)).replace(microsecond=0)
-        
-        elif format == '%Y-%m-%d':
-            start_date = sorted_realtimes[0].replace(day=1)
-            end_date = sorted_realtimes[-1].replace(day=1) + relativedelta.relativedelta(months=1)
-
-            time_delta = relativedelta.relativedelta(end_date, start_date)
-
-            time_delta_months = time_delta.months
-            time_delta_months += time_delta.years * 12
-            
-            interval = time_delta_months / ticks
-            if interval < 1:
-                interval = 1
-                ticks =  time_delta_months
-
-            base_time = start_date
-            interval_dates = [base_time]
-            i = 0
-            while i < ticks:
-                base_time = base_time + relativedelta.relativedelta(months=round(interval))
-                interval_dates.append(base_time)
-                i += 1
-            return interval_dates
-        
-        elif format == '%H:%M:%S':
-            start_time = sorted_realtimes[0].replace(second=0)
-            end_time = (sorted_realtimes[-1] + relativedelta.relativedelta(minutes=1)).replace(second=0)
-
-        #M:S and H:M:S
-        #example: 5 seconds delta
-        time_delta = relativedelta.relativedelta(end_time, start_time)
+    def remove_segment_outliers(self, strategy=OutlierStrategy.STANDARD_DEVIATION, threshold: float | None = None):
+        ''' Drop slow outliers from `segment_times`, see `outliers.OutlierStrategy` for the available strategies. '''
+        self.segment_keep = outlier_mask(self.all_segment_times["seconds"].to_numpy(), strategy, threshold)
 
-        time_delta_seconds = time_delta.seconds
-        time_delta_seconds += time_delta.minutes * 60
-        time_delta_seconds += time_delta.hours * 3600
-
-        interval = time_delta_seconds / ticks
-
-        if interval < 1:
-            interval = 1
-            ticks = time_delta_seconds
-        
-        base_time = start_time
-        interval_dates = [base_time]
-        for i in range(ticks):
-            base_time += relativedelta.relativedelta(seconds=round(interval))
-            interval_dates.append(base_time)
-
-        return interval_dates
-    
-    def convert_datetime_to_float(self, time: datetime.datetime) -> float:
-        hours_in_seconds = time.hour * 3600
-        minutes_in_seconds = time.minute * 60
-        seconds = time.second
-        milliseconds = float(f"0.{datetime.datetime.strftime(time, format='%f')}")
-        
-        result = hours_in_seconds + minutes_in_seconds + seconds + milliseconds
-        return result
-
-    def remove_segment_outliers(self):
-        times_in_seconds = [self.convert_datetime_to_float(row['seg_times']) for _, row in self.segment_times.iterrows()]
-
-        # remove row if outlier
-        upper_limit = mean(times_in_seconds) + pstdev(times_in_seconds) * 3
-        for index, row in self.segment_times.iterrows():
-            time = self.convert_datetime_to_float(row['seg_times'])
-            if time > upper_limit:
-                self.segment_times.drop(index, inplace=True)
-        
         # refresh index 
-        self.segment_times.index = range(len(self.segment_times))
-
-        self.avg_segment_times = self.get_averages(self.segment_times["seg_times"])
\ No newline at end of file
+        self.segment_times = self.all_segment_times[self.segment_keep].reset_index(drop=True)
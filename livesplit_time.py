@@ -0,0 +1,173 @@
+import datetime
+
+import numpy as np
+
+
+# LiveSplit stores times as .NET TimeSpans, 1 tick = 100ns
+TICKS_PER_SECOND = 10_000_000
+TICKS_PER_MICROSECOND = 10
+
+# missing timestamp, shows up as NaT when viewed as datetime64
+MISSING = np.iinfo(np.int64).min
+
+# value all durations are offset from when handed to matplotlib as dates
+DURATION_EPOCH = np.datetime64('1900-01-01', 'ns')
+UNIX_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _codepoints(strings: list[str | None]) -> tuple[np.ndarray, np.ndarray]:
+    ''' Lay out `strings` as a (rows, width) matrix of unicode code points, 0 past the end of each string. '''
+    present = np.fromiter((s is not None for s in strings), dtype=bool, count=len(strings))
+    column = np.array([s or "" for s in strings], dtype=str)
+    if column.dtype.itemsize == 0:
+        column = column.astype('U1')
+    width = column.dtype.itemsize // 4
+    return column.view(np.uint32).reshape(len(strings), width), present
+
+
+def parse_times(times: list[str | None]) -> tuple[np.ndarray, np.ndarray]:
+    ''' Convert a column of LiveSplit `[-][D.]HH:MM:SS[.fffffff]` strings to ticks in one pass.
+
+        Returns `(ticks, valid)`, `ticks` is 0 wherever `valid` is False (None or malformed string).
+    '''
+    chars, present = _codepoints(times)
+    rows, width = chars.shape
+
+    # HH:MM:SS is anchored on the first colon, fixed width fields are gathered relative to it
+    is_colon = chars == ord(':')
+    colon = is_colon.argmax(axis=1)
+
+    def gather(offsets):
+        # digit values at colon + offsets for every row, -1 for anything that isn't a digit
+        positions = colon[:, None] + np.asarray(offsets)[None, :]
+        inside = (positions >= 0) & (positions < width)
+        gathered = np.take_along_axis(chars, np.clip(positions, 0, width - 1), axis=1).astype(np.int64) - ord('0')
+        return np.where(inside & (gathered >= 0) & (gathered <= 9), gathered, -1), np.where(inside, gathered + ord('0'), 0)
+
+    def number(digits):
+        value = np.zeros(rows, dtype=np.int64)
+        for column in digits.T:
+            value = value * 10 + column
+        return value
+
+    minute_digits, _ = gather([1, 2])
+    second_digits, _ = gather([4, 5])
+    _, separators = gather([3, 6])
+    fraction_digits, _ = gather(np.arange(7, 14))
+
+    # everything before the colon, read right to left: hours, then an optional day count after a '.'
+    head_width = max(int(colon.max(initial=0)), 1)
+    head_digits, head_chars = gather(-1 - np.arange(head_width))
+    in_head = np.arange(head_width)[None, :] < colon[:, None]
+    is_day_dot = in_head & (head_chars == ord('.'))
+    has_days = is_day_dot.any(axis=1)
+    day_dot = np.where(has_days, is_day_dot.argmax(axis=1), colon)
+    negative = chars[:, 0] == ord('-')
+
+    rank = np.arange(head_width)[None, :]
+    is_sign = (rank == colon[:, None] - 1) & negative[:, None]
+    is_hour = (rank < day_dot[:, None]) & ~is_sign
+    is_day = in_head & (rank > day_dot[:, None]) & ~is_sign
+    hours = np.where(is_hour, np.maximum(head_digits, 0) * 10**np.minimum(rank, 18), 0).sum(axis=1)
+    day_rank = np.clip(rank - day_dot[:, None] - 1, 0, 18)
+    days = np.where(is_day, np.maximum(head_digits, 0) * 10**day_rank, 0).sum(axis=1)
+
+    # up to 7 fraction digits, fewer digits are right padded
+    has_fraction = separators[:, 1] == ord('.')
+    fraction_digits = np.where(has_fraction[:, None], fraction_digits, -1)
+    seen_end = np.cumsum(fraction_digits < 0, axis=1) > 0
+    fraction = number(np.where(seen_end, 0, fraction_digits))
+
+    # both separators in place and every character of HH:MM:SS a digit
+    valid = present & is_colon.any(axis=1) & (separators[:, 0] == ord(':'))
+    valid &= (minute_digits >= 0).all(axis=1) & (second_digits >= 0).all(axis=1)
+    valid &= ((head_digits >= 0) | ~(is_hour | is_day)).all(axis=1) & (day_dot > 0)
+
+    ticks = (((days * 24 + hours) * 60 + number(minute_digits)) * 60 + number(second_digits)) * TICKS_PER_SECOND + fraction
+    ticks = np.where(negative, -ticks, ticks)
+    return np.where(valid, ticks, 0), valid
+
+
+def _days_from_civil(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+    ''' Days since 1970-01-01 of a proleptic Gregorian date, vectorized. '''
+    year = year - (month <= 2)
+    era = np.floor_divide(year, 400)
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def parse_timestamps(stamps: list[str | None]) -> np.ndarray:
+    ''' Convert a column of LiveSplit `MM/DD/YYYY HH:MM:SS` stamps to epoch seconds in one pass.
+
+        Missing stamps become `MISSING`, stamps that aren't in the fixed width layout go through `parse_timestamp`.
+    '''
+    stamps = list(stamps)
+    if len(stamps) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    chars, present = _codepoints(stamps)
+    if chars.shape[1] < 19:
+        chars = np.pad(chars, ((0, 0), (0, 19 - chars.shape[1])))
+    digits = chars[:, :19].astype(np.int64) - ord('0')
+
+    def number(start, length):
+        value = digits[:, start]
+        for i in range(start + 1, start + length):
+            value = value * 10 + digits[:, i]
+        return value
+
+    month, day, year = number(0, 2), number(3, 2), number(6, 4)
+    hour, minute, second = number(11, 2), number(14, 2), number(17, 2)
+    epoch_seconds = _days_from_civil(year, month, day) * 86400 + hour * 3600 + minute * 60 + second
+
+    digit_cols = [0, 1, 3, 4, 6, 7, 8, 9, 11, 12, 14, 15, 17, 18]
+    regular = present & (chars[:, 19:] == 0).all(axis=1)
+    regular &= ((digits[:, digit_cols] >= 0) & (digits[:, digit_cols] <= 9)).all(axis=1)
+    epoch_seconds = np.where(present, epoch_seconds, MISSING)
+
+    for i in np.flatnonzero(present & ~regular):
+        epoch_seconds[i] = parse_timestamp(stamps[i])
+
+    return epoch_seconds
+
+
+def parse_timestamp(stamp: str | None) -> int:
+    ''' Convert a single LiveSplit `MM/DD/YYYY HH:MM:SS` stamp to epoch seconds. '''
+    if stamp is None:
+        return MISSING
+    dt = datetime.datetime.strptime(stamp.strip(), '%m/%d/%Y %H:%M:%S')
+    return (dt - UNIX_EPOCH) // datetime.timedelta(seconds=1)
+
+
+def ticks_to_datetime64(ticks: np.ndarray) -> np.ndarray:
+    ''' Durations as datetime64 offset from 1900-01-01, which is what the `%H:%M:%S` axis formatters expect. '''
+    return DURATION_EPOCH + (np.asarray(ticks, dtype=np.int64) * 100).astype('timedelta64[ns]')
+
+
+def seconds_to_datetime64(seconds: np.ndarray) -> np.ndarray:
+    return ticks_to_datetime64(np.rint(np.asarray(seconds, dtype=np.float64) * TICKS_PER_SECOND))
+
+
+def epoch_to_datetime64(seconds: np.ndarray) -> np.ndarray:
+    ''' Zero-copy view of epoch seconds as datetime64, missing stamps become NaT. '''
+    return np.asarray(seconds, dtype=np.int64).view('datetime64[s]')
+
+
+def ticks_to_timedelta(ticks: int) -> datetime.timedelta:
+    return datetime.timedelta(microseconds=int(ticks) // TICKS_PER_MICROSECOND)
+
+
+def format_ticks(ticks: int, decimals: int = 1, hours: bool = True) -> str:
+    ''' `HH:MM:SS.f` (or `MM:SS.f` when `hours` is False) with `decimals` digits after the point. '''
+    ticks = int(ticks)
+    total_seconds, remainder = divmod(ticks, TICKS_PER_SECOND)
+    h, rest = divmod(total_seconds, 3600)
+    m, s = divmod(rest, 60)
+
+    formatted = f"{h:02d}:{m:02d}:{s:02d}" if hours else f"{m + h*60:02d}:{s:02d}"
+    if decimals > 0:
+        fraction = f"{remainder:07d}"[:decimals]
+        formatted += f".{fraction}"
+    return formatted
@@ -0,0 +1,199 @@
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.collections import PathCollection, PolyCollection
+from matplotlib.lines import Line2D
+import matplotlib.colors as mcolors
+
+
+# series up to this many visible points are drawn in full
+LOD_THRESHOLD = 5000
+# smallest density bin of the scatter decimation, in pixels, bins are at least a marker wide
+CELL_PIXELS = 3
+
+
+def view_of(ax: Axes) -> tuple:
+    return (*ax.viewLim.bounds, ax.bbox.width, ax.bbox.height)
+
+
+def is_stale(view: tuple | None, ax: Axes) -> bool:
+    ''' The view limits changed, or the axes were resized enough for the pixel grid to matter. '''
+    if view is None:
+        return True
+    current = view_of(ax)
+    if current[:4] != view[:4]:
+        return True
+    return any(abs(new - old) > old * 0.2 for new, old in zip(current[4:], view[4:]))
+
+
+def to_pixels(values: np.ndarray, low: float, high: float, pixels: float) -> np.ndarray:
+    span = (high - low) or 1.0
+    return np.floor((values - low) / span * pixels).astype(np.int64)
+
+
+def group_extremes(groups: np.ndarray, values: np.ndarray) -> np.ndarray:
+    ''' Positions of the lowest and highest of `values` in every group. '''
+    order = np.lexsort((values, groups))
+    sorted_groups = groups[order]
+    boundaries = np.flatnonzero(np.diff(sorted_groups)) + 1
+    firsts = np.concatenate(([0], boundaries))
+    lasts = np.concatenate((boundaries, [len(order)])) - 1
+    return np.concatenate((order[firsts], order[lasts]))
+
+
+def line_lod(x: np.ndarray, y: np.ndarray, x_range: tuple[float, float], pixels: float) -> np.ndarray:
+    ''' Rows of a line (x ascending) worth drawing at a width of `pixels`.
+
+        Keeps the first, last, lowest and highest point of every pixel column (M4), which draws the same
+        as the full line, plus the nearest point on each side of the view so the line runs off the edges.
+    '''
+    count = len(x)
+    if count <= LOD_THRESHOLD:
+        return np.arange(count)
+
+    low, high = x_range
+    start = max(np.searchsorted(x, low, side='left') - 1, 0)
+    end = min(np.searchsorted(x, high, side='right') + 1, count)
+    if end - start <= max(LOD_THRESHOLD, 4 * pixels):
+        return np.arange(start, end)
+
+    columns = np.clip(to_pixels(x[start:end], low, high, pixels), -1, int(pixels))
+    boundaries = np.flatnonzero(np.diff(columns)) + 1
+    firsts = np.concatenate(([0], boundaries))
+    lasts = np.concatenate((boundaries, [len(columns)])) - 1
+
+    keep = np.concatenate((firsts, lasts, group_extremes(columns, y[start:end])))
+    return np.unique(keep) + start
+
+
+def scatter_lod(points: np.ndarray, x_range: tuple[float, float], y_range: tuple[float, float], size: tuple[float, float], keep: np.ndarray | None = None, cell: int = CELL_PIXELS) -> tuple[np.ndarray, np.ndarray]:
+    ''' Rows of a scatter worth drawing at `size` pixels and how many points each of them stands for.
+
+        Density binning: one point per occupied `cell` x `cell` pixel square of the visible area, plus the
+        fastest and slowest point of every pixel column and every row in `keep` (PBs).
+    '''
+    x, y = points[:, 0], points[:, 1]
+    visible = (x >= x_range[0]) & (x <= x_range[1]) & (y >= y_range[0]) & (y <= y_range[1])
+    rows = np.flatnonzero(visible)
+    if len(rows) <= LOD_THRESHOLD:
+        return rows, np.ones(len(rows), dtype=np.int64)
+
+    width, height = size
+    column = to_pixels(x[rows], *x_range, width)
+    row = to_pixels(y[rows], *y_range, height)
+    cells = (column // cell) * (int(height) // cell + 2) + row // cell
+    _, first, cell_of_row, counts = np.unique(cells, return_index=True, return_inverse=True, return_counts=True)
+
+    weights = np.zeros(len(points), dtype=np.int64)
+    representatives = rows[first]
+    weights[representatives] = counts
+
+    extras = group_extremes(column, y[rows])
+    if keep is not None:
+        extras = np.concatenate((extras, np.flatnonzero(keep[rows])))
+    # drawn on their own, so the point standing in for their cell covers one less
+    extras = np.unique(extras)
+    extras = extras[weights[rows[extras]] == 0]
+    np.subtract.at(weights, representatives[cell_of_row[extras]], 1)
+    weights[rows[extras]] = 1
+
+    # back in data order, so points overlap the way they do at full detail
+    kept = np.flatnonzero(weights)
+    return kept, weights[kept]
+
+
+class LodScatter():
+    ''' A scatter drawing a decimated copy of its points, see `scatter_lod`.
+
+        Colours are given for every point. A drawn point standing in for several others gets the opacity
+        they would have had stacked on top of each other.
+    '''
+    def __init__(self, collection: PathCollection):
+        self.collection = collection
+        self.points = np.asarray(collection.get_offsets(), dtype=np.float64)
+        self.keep = None
+        self.colors = None
+        self.rows = np.arange(len(self.points))
+        self.counts = np.ones(len(self.points), dtype=np.int64)
+        self.view = None
+
+    def set_data(self, points: np.ndarray, keep: np.ndarray | None = None):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.keep = keep
+        # every point until the next update, the rows drawn so far may be past the end of the new ones
+        self.rows = np.arange(len(self.points))
+        self.counts = np.ones(len(self.points), dtype=np.int64)
+        self.view = None
+
+    def set_colors(self, colors):
+        self.colors = mcolors.to_rgba_array(colors)
+        self.apply_colors()
+
+    def update(self, ax: Axes):
+        if not is_stale(self.view, ax):
+            return
+        self.view = view_of(ax)
+
+        # markers closer than their own width overlap anyway
+        marker = np.sqrt(self.collection.get_sizes().max(initial=0)) * ax.figure.dpi / 72
+        cell = max(CELL_PIXELS, int(marker))
+
+        self.rows, self.counts = scatter_lod(self.points, ax.get_xlim(), ax.get_ylim(), (ax.bbox.width, ax.bbox.height), self.keep, cell)
+        self.collection.set_offsets(self.points[self.rows])
+        self.apply_colors()
+
+    def apply_colors(self):
+        if self.colors is None:
+            return
+        colors = self.colors[self.rows] if len(self.colors) > 1 else np.repeat(self.colors, len(self.rows), axis=0)
+        colors[:, 3] = 1 - (1 - colors[:, 3]) ** self.counts
+        self.collection.set_facecolor(colors)
+        self.collection.set_edgecolor(colors)
+
+
+class LodLine():
+    ''' A line drawing a decimated copy of its points, see `line_lod`. '''
+    def __init__(self, line: Line2D):
+        self.line = line
+        xy = np.asarray(line.get_xydata(), dtype=np.float64)
+        self.x, self.y = xy[:, 0], xy[:, 1]
+        self.view = None
+
+    def set_data(self, x: np.ndarray, y: np.ndarray):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.view = None
+        # in full until the next update, so relim() sees all of it
+        self.line.set_data(self.x, self.y)
+
+    def update(self, ax: Axes):
+        if not is_stale(self.view, ax):
+            return
+        self.view = view_of(ax)
+
+        rows = line_lod(self.x, self.y, ax.get_xlim(), ax.bbox.width)
+        self.line.set_data(self.x[rows], self.y[rows])
+
+
+class LodBand():
+    ''' A band filled between two edges (x ascending), drawn through the rows `line_lod` keeps of either edge. '''
+    def __init__(self, collection: PolyCollection):
+        self.collection = collection
+        self.x = self.lower = self.upper = np.empty(0)
+        self.view = None
+
+    def set_data(self, x: np.ndarray, lower: np.ndarray, upper: np.ndarray):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+        self.view = None
+
+    def update(self, ax: Axes):
+        if not is_stale(self.view, ax):
+            return
+        self.view = view_of(ax)
+
+        x_range, pixels = ax.get_xlim(), ax.bbox.width
+        rows = np.union1d(line_lod(self.x, self.lower, x_range, pixels), line_lod(self.x, self.upper, x_range, pixels))
+        x = self.x[rows]
+        outline = np.concatenate((np.column_stack((x, self.upper[rows])), np.column_stack((x[::-1], self.lower[rows][::-1]))))
+        self.collection.set_verts([outline])
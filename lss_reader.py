@@ -0,0 +1,100 @@
+import xml.etree.ElementTree as ET
+
+
+# subtrees that aren't used by any graph, dropped as soon as they're closed
+DISCARDED_TAGS = ('GameIcon', 'Icon', 'SplitTimes', 'BestSegmentTime', 'AutoSplitterSettings', 'LayoutPath', 'Offset')
+
+
+class SegmentHistory():
+    ''' Compact copy of a single Segment's SegmentHistory, one entry per Time element.
+
+        `real_times` holds the raw RealTime string or None when the Time element has no RealTime (skipped split).
+    '''
+    def __init__(self):
+        self.attempt_ids: list[int] = []
+        self.real_times: list[str | None] = []
+
+
+class LssContents():
+    ''' Everything the graphs need from a .lss file, without the ElementTree. '''
+    def __init__(self):
+        self.game_name: str | None = None
+        self.category_name: str | None = None
+        self.variables: dict[str, str] = {}
+
+        # AttemptHistory, one entry per Attempt element
+        self.max_attempt_id = 0
+        self.attempt_ids: list[int] = []
+        self.started: list[str | None] = []
+        self.ended: list[str | None] = []
+        self.real_times: list[str | None] = []
+
+        # Segments
+        self.split_names: list[str] = []
+        self.segment_histories: list[SegmentHistory] = []
+
+
+def read_lss(path: str, after_attempt_id: int | None = None) -> LssContents:
+    ''' Stream a .lss file with `iterparse` and keep only the data the graphs use.
+
+        Every Attempt and Time element is copied into `LssContents` as soon as it is closed and then removed
+        from its parent, so peak memory does not grow with the size of the tree.
+
+        With `after_attempt_id` only attempts with a higher id (and their segment history entries) are kept,
+        which is what an incremental reload needs.
+    '''
+    contents = LssContents()
+    stack: list[ET.Element] = []
+    segment_history: SegmentHistory | None = None
+
+    for event, elem in ET.iterparse(path, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            if elem.tag == 'SegmentHistory':
+                segment_history = SegmentHistory()
+            continue
+
+        stack.pop()
+        parent = stack[-1] if stack else None
+        tag = elem.tag
+
+        match tag:
+            case 'Attempt':
+                attempt_id = int(elem.attrib.get('id'))
+                contents.max_attempt_id = max(contents.max_attempt_id, attempt_id)
+                if after_attempt_id is None or attempt_id > after_attempt_id:
+                    contents.attempt_ids.append(attempt_id)
+                    contents.started.append(elem.attrib.get('started'))
+                    contents.ended.append(elem.attrib.get('ended'))
+                    contents.real_times.append(elem.findtext('RealTime') or None)
+            case 'Time' if segment_history is not None:
+                attempt_id = elem.attrib.get('id')
+                if attempt_id is not None and (after_attempt_id is None or int(attempt_id) > after_attempt_id):
+                    segment_history.attempt_ids.append(int(attempt_id))
+                    segment_history.real_times.append(elem.findtext('RealTime') or None)
+            case 'SegmentHistory':
+                contents.segment_histories.append(segment_history)
+                segment_history = None
+            case 'Segment':
+                # segment without a SegmentHistory element
+                if len(contents.segment_histories) < len(contents.split_names):
+                    contents.segment_histories.append(SegmentHistory())
+            case 'Name' if parent is not None and parent.tag == 'Segment':
+                contents.split_names.append(elem.text or "")
+            case 'GameName' if len(stack) == 1:
+                contents.game_name = elem.text
+            case 'CategoryName' if len(stack) == 1:
+                contents.category_name = elem.text
+            case 'Variable' if parent is not None and parent.tag == 'Variables':
+                contents.variables[elem.attrib.get('name')] = elem.text or ""
+            case _:
+                # children of Attempt and Time are read when their parent closes
+                if tag not in DISCARDED_TAGS:
+                    continue
+
+        # drop the element from the tree now that it's been copied
+        elem.clear()
+        if parent is not None:
+            parent.remove(elem)
+
+    return contents
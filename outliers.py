@@ -0,0 +1,33 @@
+import numpy as np
+
+from graph_options import OutlierStrategy
+
+
+def upper_limit(seconds: np.ndarray, strategy: OutlierStrategy, threshold: float | None = None) -> float:
+    ''' Slowest time (in seconds) that isn't an outlier. '''
+    if threshold is None:
+        threshold = strategy.default_threshold
+    if len(seconds) == 0:
+        return np.inf
+
+    match strategy:
+        case OutlierStrategy.STANDARD_DEVIATION:
+            return seconds.mean() + seconds.std() * threshold
+        case OutlierStrategy.IQR:
+            q1, q3 = np.percentile(seconds, [25, 75])
+            return q3 + (q3 - q1) * threshold
+        case OutlierStrategy.MAD:
+            # modified z-score, 0.6745 scales the MAD to σ for normal data
+            median = np.median(seconds)
+            mad = np.median(np.abs(seconds - median))
+            return median + threshold * mad / 0.6745
+        case _:
+            raise NotImplementedError("No support for this outlier strategy")
+
+
+def outlier_mask(seconds: np.ndarray, strategy: OutlierStrategy, threshold: float | None = None) -> np.ndarray:
+    ''' True for every time that should be kept.
+
+        Only slow times are outliers, fast ones are golds and always kept.
+    '''
+    return seconds <= upper_limit(seconds, strategy, threshold)
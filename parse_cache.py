@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+
+# bump when the layout of the cached arrays changes, older entries are rebuilt
+CACHE_VERSION = 1
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+
+def base_cache_dir() -> str:
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'livesplit-graphs')
+
+
+def cache_dir() -> str:
+    return os.path.join(base_cache_dir(), 'parsed')
+
+
+class FileIdentity():
+    ''' What a splits file is, as far as the cache is concerned: path, size, mtime and content hash. '''
+    def __init__(self, path: str, size: int, mtime_ns: int, content_hash: str):
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.content_hash = content_hash
+
+    def __eq__(self, other):
+        return isinstance(other, FileIdentity) and self.as_dict() == other.as_dict()
+
+    def __hash__(self):
+        return hash((self.path, self.size, self.mtime_ns, self.content_hash))
+
+    def matches_stat(self) -> bool:
+        ''' The file on disk still has this size and mtime, checked without reading it. '''
+        stat = os.stat(self.path)
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    def as_dict(self) -> dict:
+        return {'path': self.path, 'size': self.size, 'mtime_ns': self.mtime_ns, 'content_hash': self.content_hash}
+
+    @staticmethod
+    def of(path: str) -> 'FileIdentity':
+        path = os.path.normcase(os.path.abspath(path))
+        stat = os.stat(path)
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                digest.update(chunk)
+        return FileIdentity(path, stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+
+
+def entry_path(identity: FileIdentity) -> str:
+    name = hashlib.sha1(identity.path.encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir(), f"{name}.npz")
+
+
+def load(identity: FileIdentity) -> tuple[dict, dict[str, np.ndarray]] | None:
+    ''' Metadata and arrays stored for `identity`, None when there's no entry or it's stale or unreadable. '''
+    path = entry_path(identity)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with np.load(path, allow_pickle=False) as entry:
+            metadata = json.loads(entry['__metadata__'].item())
+            if metadata.get('version') != CACHE_VERSION or metadata.get('identity') != identity.as_dict():
+                raise ValueError("stale cache entry")
+            arrays = {key: entry[key] for key in entry.files if key != '__metadata__'}
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile, json.JSONDecodeError):
+        # stale or corrupt, the caller rebuilds it
+        remove(path)
+        return None
+
+    # mark as recently used for eviction, the entry is good either way
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return metadata['data'], arrays
+
+
+def store(identity: FileIdentity, data: dict, arrays: dict[str, np.ndarray]):
+    ''' Write an entry for `identity` and evict the least recently used entries past `MAX_CACHE_BYTES`. '''
+    directory = cache_dir()
+    try:
+        os.makedirs(directory, exist_ok=True)
+        metadata = json.dumps({'version': CACHE_VERSION, 'identity': identity.as_dict(), 'data': data})
+
+        # write to a temporary file first so a crash can't leave half an entry behind
+        handle, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(handle, 'wb') as file:
+            np.savez(file, __metadata__=np.array(metadata), **arrays)
+        os.replace(temporary, entry_path(identity))
+    except OSError as e:
+        # caching is best effort
+        print(e)
+        return
+
+    evict(MAX_CACHE_BYTES)
+
+
+def evict(max_bytes: int):
+    directory = cache_dir()
+    entries = []
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    # oldest first
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        remove(path)
+        total -= size
+
+
+def remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -1,39 +1,60 @@
-from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
+from datetime import timedelta
+from typing import Callable
 
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+import matplotlib.colors as mcolors
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 from matplotlib.backend_bases import MouseEvent
-from matplotlib.collections import PathCollection
 from matplotlib.lines import Line2D
+from matplotlib.collections import LineCollection
 import pandas as pd
 from pandas import DataFrame
 import numpy as np
 
 from livesplit_data import LiveSplitData
+import livesplit_time
 from theme import Theme
 from graph import Graph
+from hover_index import HoverIndex
+import lod
+import time_axis
+from lod import LodScatter, LodLine, LodBand
+from best_segments import NO_TIME
+from resets import ResetAnalysis
+from progression import RunProgression
+from distribution import Distribution
+from history import HistoryRange
 
 
 class Plot():
-    def __init__(self, livesplit_data: LiveSplitData, split_name, split_index, theme: Theme, show_outliers=False):
-        # retarded I know
-        self.fig, ax = plt.subplots()
+    def __init__(self, livesplit_data: LiveSplitData, split_name, split_index, theme: Theme, show_outliers=False, fig: Figure | None = None, history_range: HistoryRange | None = None):
+        if fig is None:
+            # pyplot picks a backend on import, only pay for it when there's no figure to draw into
+            import matplotlib.pyplot as plt
+
+            # retarded I know
+            self.fig, ax = plt.subplots()
+        else:
+            # draw into a figure that's already on screen, next to the axes of other cached graphs
+            self.fig, ax = fig, fig.add_subplot()
         self.ax: Axes = ax
 
         self.lsd = livesplit_data
+        # the part of the history the category graphs show, the split graphs get frames already cut down to it
+        self.history = livesplit_data.query(history_range)
         self.split_name = split_name
         self.split_index = split_index
         self.theme = theme
         self.show_outliers = show_outliers
-        
-        self.fig.patch.set_facecolor(self.theme.figure_color)
-        self.ax.set_facecolor(self.theme.axes_color)
-        self.ax.tick_params(colors=self.theme.ticks_color)
-        self.ax.xaxis.label.set_color(self.theme.xy_label_color)
-        self.ax.yaxis.label.set_color(self.theme.xy_label_color)
+
+        self.title = None
+        self.title_color = None
+        # graph being drawn, its title only mentions the filters that apply to it
+        self.graph: Graph | None = None
+
+        # recolour the artists of the current graph, see apply_theme()
+        self.theme_updates: list[Callable[[Theme], None]] = []
+        self.apply_theme(theme)
 
         # annotation init
         self.annot = self.ax.annotate("", xy=(0,0), xytext=(-50,17),textcoords="offset points",
@@ -44,83 +65,318 @@ class Plot():
         self.annot.set_zorder(100)
 
         self.annot.set_visible(False)
-        
 
-    def hist(self, seg_times) -> Figure:
-        ''' 
-        Plot a histogram given `seg_times`.
+        # the annotation is left out of normal draws and blitted over a copy of the rest of the figure
+        self.annot.set_animated(True)
+        self.background = None
+        self.draw_cid = self.fig.canvas.mpl_connect("draw_event", self.on_draw)
+
+        # screen space lookup of the hoverable points of every artist, see hover_index()
+        self.hover_indexes: dict[object, HoverIndex] = {}
+        self.hovered = None
+
+        # large series drawn at the detail the current view needs, redone on zoom and pan
+        self.lod_artists: list[LodScatter | LodLine] = []
+        self.ax.callbacks.connect("xlim_changed", self.update_lod)
+        self.ax.callbacks.connect("ylim_changed", self.update_lod)
+
+    def remove(self):
+        ''' Take this graph out of a figure it shares with others. '''
+        self.fig.canvas.mpl_disconnect(self.draw_cid)
+        self.ax.remove()
+
+    def redraw(self, graph: Graph, history_range: HistoryRange | None = None, **data) -> Figure:
+        '''
+        Draw `graph` again in the same axes, for another part of the history or data that changed. `data` is what
+        `draw` takes. The axes, annotation and hover handling stay, only the artists of the graph are made again.
+        '''
+        self.clear_graph()
+        self.set_history_range(history_range)
+        return self.draw(graph, **data)
+
+    def clear_graph(self):
+        ''' Take the artists of the drawn graph off the axes, limits go back to following the data. '''
+        self.hide_annot(redraw=False)
+        legend = self.ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        for artist in [*self.ax.lines, *self.ax.collections, *self.ax.patches, *self.ax.texts]:
+            if artist is not self.annot:
+                artist.remove()
+
+        self.theme_updates.clear()
+        self.lod_artists.clear()
+        self.hover_indexes.clear()
+        self.background = None
+        self.ax.ignore_existing_data_limits = True
+        self.ax.set_autoscale_on(True)
+
+    def set_history_range(self, history_range: HistoryRange | None):
+        self.history = self.lsd.query(history_range)
+
+    def apply_theme(self, theme: Theme):
+        """
+        Recolour the figure and every artist of the current graph in place.
+        """
+        self.theme = theme
+        self.fig.patch.set_facecolor(theme.figure_color)
+        self.ax.set_facecolor(theme.axes_color)
+        self.ax.tick_params(colors=theme.ticks_color)
+        self.ax.xaxis.label.set_color(theme.xy_label_color)
+        self.ax.yaxis.label.set_color(theme.xy_label_color)
+
+        if self.title is not None:
+            self.title_color = theme.title_color
+            self.ax.title.set_color(theme.title_color)
+
+        for update in self.theme_updates:
+            update(theme)
+
+    def on_draw(self, event):
+        # other graphs drawn into the same figure, or saved to a format that can't blit
+        if not self.ax.get_visible() or not self.fig.canvas.supports_blit:
+            return
+
+        # resized, go again with a pixel grid that fits
+        if any(lod.is_stale(artist.view, self.ax) for artist in self.lod_artists):
+            self.update_lod()
+            self.fig.canvas.draw_idle()
+
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        if self.annot.get_visible():
+            self.ax.draw_artist(self.annot)
+
+    def update_lod(self, ax=None):
+        for artist in self.lod_artists:
+            artist.update(self.ax)
+
+    def redraw_annot(self):
+        canvas = self.fig.canvas
+        if self.background is None or not canvas.supports_blit:
+            canvas.draw_idle()
+            return
 
-        `seg_times` is a list of datetime objects which is used to calculate the interval used to plot dates on the X axis.
+        canvas.restore_region(self.background)
+        if self.annot.get_visible():
+            self.ax.draw_artist(self.annot)
+        canvas.blit(self.fig.bbox)
+
+    def hover_index(self, artist, points) -> HoverIndex:
+        ''' Index of the screen positions of `points`, rebuilt when the view was zoomed, panned or resized. '''
+        index = self.hover_indexes.get(artist)
+        if index is None or not index.matches(self.ax):
+            index = HoverIndex(self.ax, points)
+            self.hover_indexes[artist] = index
+        return index
+
+    def show_annot(self, hovered):
+        # still on the same point
+        if self.annot.get_visible() and hovered == self.hovered:
+            return
+        self.hovered = hovered
+        self.annot.set_visible(True)
+        self.redraw_annot()
+
+    def hide_annot(self, redraw=True):
+        if self.annot.get_visible():
+            self.hovered = None
+            self.annot.set_visible(False)
+            if redraw:
+                self.redraw_annot()
+
+    @property
+    def nbytes(self) -> int:
+        ''' Rough size of the data held by the artists of this graph. '''
+        size = sum(line.get_xydata().nbytes for line in self.ax.lines)
+        for collection in self.ax.collections:
+            size += collection.get_offsets().nbytes
+            size += sum(path.vertices.nbytes for path in collection.get_paths())
+        # a Rectangle with its transforms
+        return size + len(self.ax.patches) * 512
+
+    def draw(self, graph: Graph, segment_times: DataFrame | None = None, avg_segment_times: DataFrame | None = None, distribution: Distribution | None = None, resets: ResetAnalysis | None = None, progression: RunProgression | None = None) -> Figure:
+        '''
+        Draw `graph`. The split graphs take the frames made by `LiveSplitData.extract_segment_data` and the histogram
+        its `Distribution`, the reset graphs a `ResetAnalysis` and the run progression a `RunProgression`. Anything
+        missing is worked out with the defaults.
         '''
+        self.graph = graph
+        match graph:
+            case Graph.HISTOGRAM:
+                self.hist(segment_times["seconds"], distribution)
+            case Graph.MOVING_AVERAGE:
+                self.moving_avg(segment_times, avg_segment_times)
+            case Graph.ATTEMPTS_OVER_TIME:
+                self.attempts_over_time()
+            case Graph.IMP_OVER_ATTEMPTS:
+                self.imp_over_attempts()
+            case Graph.IMP_OVER_TIME: 
+                self.imp_over_time()
+            case Graph.PB_OVER_TIME:
+                self.personal_best_over_time()
+            case Graph.PB_OVER_ATTEMPTS:
+                self.personal_best_over_attempts()
+            case Graph.SOB_OVER_TIME:
+                self.sum_of_best_over_time()
+            case Graph.RUN_PROGRESSION:
+                self.run_progression(progression or self.lsd.run_progression(self.history.range))
+            case Graph.RESET_DISTRIBUTION:
+                self.reset_distribution(resets or self.lsd.reset_analysis(self.history.range))
+            case Graph.SURVIVAL:
+                self.survival_curve(resets or self.lsd.reset_analysis(self.history.range))
+            case _:
+                raise NotImplementedError("Graph not implemented.")
+
+        self.ax.grid(True)
+        return self.fig
+
+    def hist(self, seconds, distribution: Distribution | None = None) -> Figure:
+        ''' 
+        Plot a histogram given segment times in `seconds`, from the counts of `distribution` when there is one.
+        '''
+        if distribution is None:
+            distribution = Distribution(np.asarray(seconds))
 
         #draw graph
-        self.ax.hist(seg_times, color=self.theme.hist_color)
+        self.bars = self.ax.stairs([], [0], fill=True)
+        self.density_line, = self.ax.plot([], [], linewidth=1.5)
+        self.percentile_lines = [self.ax.axvline(0, linewidth=1.2, linestyle=style) for style in ('-', '--', ':')]
+
+        def recolor(theme: Theme):
+            self.bars.set_facecolor(theme.hist_color)
+            self.density_line.set_color(theme.plot_color)
+            for line in self.percentile_lines:
+                line.set_color(theme.pb_color)
+            self.add_hist_legend()
+        self.theme_updates.append(recolor)
 
         # x axis formatting
-        xfmt = lambda x, pos: mdates.DateFormatter('%M:%S')(x)
-        self.ax.xaxis.set_major_formatter(plt.FuncFormatter(xfmt))
-
-        #set headers
-        self.set_axes_headers(title=f"{self.split_name} Histogram", title_color=self.theme.title_color)
+        time_axis.set_duration_axis(self.ax.xaxis)
 
         #labels
         self.ax.set_xlabel("Time")
         self.ax.set_ylabel("Frequency")
         self.ax.set_axisbelow(False)
 
+        self.update_hist(seconds, self.split_name, distribution)
+        recolor(self.theme)
+
         return self.fig
-    
+
+    def update_hist(self, seconds, split_name, distribution: Distribution | None = None):
+        """
+        Move the artists of `hist` to another distribution, the bars are a single patch whatever the number of bins.
+        """
+        if distribution is None:
+            distribution = Distribution(np.asarray(seconds))
+        self.distribution = distribution
+        self.split_name = split_name
+        self.hover_indexes.clear()
+
+        self.bars.set_data(distribution.counts, distribution.edges)
+        if distribution.density_x is not None:
+            self.density_line.set_data(distribution.density_x, distribution.density_y)
+        else:
+            self.density_line.set_data([], [])
+        for line, (_, seconds) in zip(self.percentile_lines, distribution.markers):
+            line.set_xdata([seconds, seconds])
+            line.set_visible(not np.isnan(seconds))
+
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.ax.set_ylim(bottom=0)
+        self.add_hist_legend()
+        self.set_axes_headers(title=f"{self.split_name} Histogram", title_color=self.theme.title_color)
+
+    def add_hist_legend(self):
+        distribution = self.distribution
+        if distribution.count == 0:
+            legend = self.ax.get_legend()
+            if legend is not None:
+                legend.remove()
+            return
+
+        labels = [f"{name}: {time_axis.format_duration(seconds, 2, seconds >= 3600)}" for name, seconds in distribution.markers]
+        legend = self.ax.legend(self.percentile_lines, labels, loc="upper right", fontsize="small")
+        legend.set_draggable(True)
+
     def moving_avg(self, segment_times: DataFrame, avg_segment_times: DataFrame) -> Figure:
         #draw graph
-        colors = np.where(segment_times["is_from_pb"], self.theme.pb_color, self.theme.scatter_color)
-        alphas = np.where(segment_times["is_from_pb"], 1, 0.3)
-        self.ax.scatter(segment_times.index.values+1, segment_times["seg_times"], s=10, c=colors, alpha=alphas)
-        self.ax.plot(avg_segment_times["avg_indexes"], avg_segment_times["avg_times"], linewidth=1.5, c=self.theme.plot_color)
+        self.scatter = self.ax.scatter([], [], s=10)
+        self.avg_line, = self.ax.plot([], [], linewidth=1.5, c=self.theme.plot_color)
+        self.band = self.ax.fill_between([], [], [], alpha=0.15, linewidth=0)
+        self.lod_scatter = LodScatter(self.scatter)
+        self.lod_avg_line = LodLine(self.avg_line)
+        self.lod_band = LodBand(self.band)
+        self.lod_artists += [self.lod_scatter, self.lod_avg_line, self.lod_band]
+        self.theme_updates.append(lambda theme: self.avg_line.set_color(theme.plot_color))
+        self.theme_updates.append(lambda theme: self.color_moving_avg())
 
         # y axis formatting
-        xfmt = lambda x, pos: mdates.DateFormatter('%M:%S')(x)
-        self.ax.yaxis.set_major_formatter(plt.FuncFormatter(xfmt))
-
-        #set headers
-        self.set_axes_headers(title=f"{self.split_name} Time Over Attempts", title_color=self.theme.title_color)
+        time_axis.set_duration_axis(self.ax.yaxis)
 
         #labels
         self.ax.set_xlabel("Attempts")
         self.ax.set_ylabel("Split Time")
         self.ax.set_axisbelow(True)
 
-        self.seg_times = segment_times["seg_times"]
+        self.update_moving_avg(segment_times, avg_segment_times, self.split_name)
 
         return self.fig
 
-    def attempts_over_time(self) -> Figure:
-        AOT_dates = self.lsd.AOT_dates
-        AOT_attempts = self.lsd.AOT_attempts
+    def update_moving_avg(self, segment_times: DataFrame, avg_segment_times: DataFrame, split_name):
+        """
+        Swap the data of the `moving_avg` artists for another split or outlier setting.
+        """
+        self.split_name = split_name
+        self.hover_indexes.clear()
+        self.is_from_pb = segment_times["is_from_pb"].to_numpy()
+        self.seconds = segment_times["seconds"].to_numpy()
+
+        self.scatter_points = np.column_stack((segment_times.index.values+1, self.seconds))
+        self.lod_scatter.set_data(self.scatter_points, self.is_from_pb)
+
+        # rolling trend with a p10-p90 consistency band
+        avg_indexes = avg_segment_times["avg_indexes"]
+        self.lod_avg_line.set_data(avg_indexes, avg_segment_times["mean"])
+        has_band = "p10" in avg_segment_times and "p90" in avg_segment_times
+        self.band.set_visible(has_band)
+        if has_band:
+            self.lod_band.set_data(avg_indexes, avg_segment_times["p10"], avg_segment_times["p90"])
+        self.color_moving_avg()
+
+        # scatter offsets aren't part of relim()
+        self.ax.relim()
+        self.ax.update_datalim(self.scatter_points)
+        self.ax.autoscale_view()
+        self.update_lod()
 
-        # testing: show most played date and time
-        """ most_time = relativedelta(hours=0)
-        for i, time_played in enumerate(self.lsd.daily_time_played):
-            time_played: relativedelta
+        #set headers
+        self.set_axes_headers(title=f"{self.split_name} Time Over Attempts", title_color=self.theme.title_color)
 
-            if self.rd_in_seconds(time_played) > self.rd_in_seconds(most_time):
-                most_time = time_played
-                print(i)
-                print(AOT_dates[i])
+    def color_moving_avg(self):
+        colors = mcolors.to_rgba_array(np.where(self.is_from_pb, self.theme.pb_color, self.theme.scatter_color))
+        colors[:, 3] = np.where(self.is_from_pb, 1, 0.3)
+        self.lod_scatter.set_colors(colors)
+        self.band.set_facecolor(self.theme.plot_color)
 
-        print(most_time)
-        print(self.rd_in_seconds(most_time)) """
+    def attempts_over_time(self) -> Figure:
+        AOT_dates = self.history.AOT_dates
+        AOT_attempts = self.history.AOT_attempts
 
-        self.ax.plot(AOT_dates, AOT_attempts, c=self.theme.plot_color, label="All")
-        self.ax.plot(self.lsd.unique_finished_dates, self.lsd.finished_attempts, c=self.theme.plot2_color, linewidth=1.5, label="Finished")
+        all_line, = self.ax.plot(time_axis.to_date_numbers(AOT_dates), AOT_attempts, c=self.theme.plot_color, label="All")
+        finished_line, = self.ax.plot(time_axis.to_date_numbers(self.history.unique_finished_dates), self.history.finished_attempts, c=self.theme.plot2_color, linewidth=1.5, label="Finished")
+        self.theme_updates.append(lambda theme: all_line.set_color(theme.plot_color))
+        self.theme_updates.append(lambda theme: finished_line.set_color(theme.plot2_color))
 
         # x axis formatting
-        xfmt = lambda x, pos: mdates.DateFormatter("%b %d '%y")(x)
-        self.ax.xaxis.set_major_formatter(plt.FuncFormatter(xfmt))
-        self.ax.xaxis.set_major_locator(plt.MaxNLocator(6))
+        time_axis.set_date_axis(self.ax.xaxis)
 
         self.set_axes_headers(title="Attempts Over Time", title_color=self.theme.title_color)
 
-        self.ax.legend(loc="upper left").set_draggable(True)
+        legend = self.ax.legend(loc="upper left")
+        legend.set_draggable(True)
+        self.theme_updates.append(lambda theme: self.update_legend_colors(legend))
 
         self.ax.set_xlabel("Date")
         self.ax.set_ylabel("Attempts")
@@ -128,73 +384,68 @@ class Plot():
 
         return self.fig
 
+    def update_legend_colors(self, legend):
+        for handle, line in zip(legend.legend_handles, self.ax.get_lines()):
+            handle.set_color(line.get_color())
+
     def imp_over_attempts(self) -> Figure:
-        completed_times = self.lsd.finished_times
-        abs_indexes = self.lsd.finished_indexes
+        completed_times = self.history.finished_times / livesplit_time.TICKS_PER_SECOND
+        abs_indexes = self.history.finished_indexes
 
-        self.ax.plot(abs_indexes, completed_times, c=self.theme.plot_color, linewidth=1.5)
+        line, = self.ax.plot(abs_indexes, completed_times, c=self.theme.plot_color, linewidth=1.5)
+        self.theme_updates.append(lambda theme: line.set_color(theme.plot_color))
+        self.lod_artists.append(LodLine(line))
 
         # y axis formatting
-        xfmt = lambda x, pos: mdates.DateFormatter("%H:%M:%S")(x)
-        self.ax.yaxis.set_major_formatter(plt.FuncFormatter(xfmt))
-        self.ax.yaxis.set_major_locator(plt.MaxNLocator('auto'))
+        time_axis.set_duration_axis(self.ax.yaxis)
 
         self.set_axes_headers(title="Improvement Over Attempts", title_color=self.theme.title_color)
         self.ax.set_xlabel("Attempts")
         self.ax.set_ylabel("Run Time")
         self.ax.set_axisbelow(True)
 
+        self.update_lod()
+
         return self.fig
 
     def imp_over_time(self) -> Figure:
-        finished_times = self.lsd.finished_times
+        finished_times = self.history.finished_times / livesplit_time.TICKS_PER_SECOND
 
-        self.ax.scatter(self.lsd.finished_dates, finished_times, c=self.theme.scatter_color, s=10, alpha=0.3)
+        scatter = self.ax.scatter(time_axis.to_date_numbers(self.history.finished_dates), finished_times, s=10)
+        lod_scatter = LodScatter(scatter)
+        lod_scatter.set_colors(mcolors.to_rgba(self.theme.scatter_color, 0.3))
+        self.theme_updates.append(lambda theme: lod_scatter.set_colors(mcolors.to_rgba(theme.scatter_color, 0.3)))
+        self.lod_artists.append(lod_scatter)
 
         # y axis formatting
-        xfmt = lambda x, pos: mdates.DateFormatter("%H:%M:%S")(x)
-        self.ax.yaxis.set_major_formatter(plt.FuncFormatter(xfmt))
-        self.ax.yaxis.set_major_locator(plt.MaxNLocator('auto'))
+        time_axis.set_duration_axis(self.ax.yaxis)
 
         # x axis formatting
-        xfmt = lambda x, pos: mdates.DateFormatter("%b %d '%y")(x)
-        self.ax.xaxis.set_major_formatter(plt.FuncFormatter(xfmt))
-        self.ax.xaxis.set_major_locator(plt.MaxNLocator(6))
+        time_axis.set_date_axis(self.ax.xaxis)
 
         self.set_axes_headers(title="Improvement Over Time", title_color=self.theme.title_color)
         self.ax.set_xlabel("Date")
         self.ax.set_ylabel("Run Time")
         self.ax.set_axisbelow(True)
 
+        self.update_lod()
+
         return self.fig
 
     def personal_best_over_time(self) -> Figure:
         """
         https://matplotlib.org/stable/api/_as_gen/matplotlib.pyplot.plot.html
         """
-        pb_dates = self.lsd.pb_dates
-        pb_times = self.lsd.pb_times
+        pb_dates = time_axis.to_date_numbers(self.history.pb_dates)
+        pb_times = self.history.pb_times / livesplit_time.TICKS_PER_SECOND
 
-        self.ax.plot(
-            pb_dates, 
-            pb_times, 
-            color=self.theme.plot_color, 
-            linewidth=1.5, 
-            marker="o", 
-            markersize=3.5, 
-            markerfacecolor=self.theme.scatter_color, 
-            markeredgecolor=self.theme.scatter_color
-        )
+        self.plot_pb_line(pb_dates, pb_times)
 
         # y axis formatting
-        xfmt = lambda x, pos: mdates.DateFormatter("%H:%M:%S")(x)
-        self.ax.yaxis.set_major_formatter(plt.FuncFormatter(xfmt))
-        self.ax.yaxis.set_major_locator(plt.MaxNLocator('auto'))
+        time_axis.set_duration_axis(self.ax.yaxis)
 
         # x axis formatting
-        xfmt = lambda x, pos: mdates.DateFormatter("%b %d '%y")(x)
-        self.ax.xaxis.set_major_formatter(plt.FuncFormatter(xfmt))
-        self.ax.xaxis.set_major_locator(plt.MaxNLocator(6))
+        time_axis.set_date_axis(self.ax.xaxis)
 
         self.set_axes_headers(title="Personal Best Over Time", title_color=self.theme.title_color)
         self.ax.set_xlabel("Date")
@@ -204,24 +455,13 @@ class Plot():
         return self.fig
     
     def personal_best_over_attempts(self) -> Figure:
-        pb_times = self.lsd.pb_times
-        pb_abs_indexes = self.lsd.pb_abs_indexes
+        pb_times = self.history.pb_times / livesplit_time.TICKS_PER_SECOND
+        pb_abs_indexes = self.history.pb_abs_indexes
 
-        self.ax.plot(
-            pb_abs_indexes, 
-            pb_times, 
-            color=self.theme.plot_color, 
-            linewidth=1.5, 
-            marker="o", 
-            markersize=3.5, 
-            markerfacecolor=self.theme.scatter_color, 
-            markeredgecolor=self.theme.scatter_color
-        )
+        self.plot_pb_line(pb_abs_indexes, pb_times)
 
         # y axis formatting
-        xfmt = lambda x, pos: mdates.DateFormatter("%H:%M:%S")(x)
-        self.ax.yaxis.set_major_formatter(plt.FuncFormatter(xfmt))
-        self.ax.yaxis.set_major_locator(plt.MaxNLocator('auto'))
+        time_axis.set_duration_axis(self.ax.yaxis)
 
         self.set_axes_headers(title="Personal Best Over Attempts", title_color=self.theme.title_color)
         self.ax.set_xlabel("Attempts")
@@ -230,6 +470,135 @@ class Plot():
 
         return self.fig
 
+    def sum_of_best_over_time(self) -> Figure:
+        """
+        Sum of best after every attempt that lowered it, attempts without an end stamp are left out.
+        """
+        attempt_numbers, ended, sob, sob_rows = self.history.sum_of_best_history()
+        has_date = ~np.isnat(ended)
+        self.sob_attempts = attempt_numbers[has_date]
+        self.sob_ended = ended[has_date]
+        self.sob_times = sob[has_date]
+        self.sob_rows = sob_rows[has_date]
+
+        self.plot_pb_line(time_axis.to_date_numbers(self.sob_ended), self.sob_times / livesplit_time.TICKS_PER_SECOND)
+        # the sum holds until the next gold
+        self.ax.get_lines()[-1].set_drawstyle('steps-post')
+
+        # y axis formatting
+        time_axis.set_duration_axis(self.ax.yaxis)
+
+        # x axis formatting
+        time_axis.set_date_axis(self.ax.xaxis)
+
+        self.set_axes_headers(title="Sum of Best Over Time", title_color=self.theme.title_color)
+        self.ax.set_xlabel("Date")
+        self.ax.set_ylabel("Sum of Best")
+        self.ax.set_axisbelow(True)
+
+        return self.fig
+
+    def run_progression(self, progression: RunProgression) -> Figure:
+        """
+        Every attempt's time at each split as its difference to the PB, all in one collection. Without a PB
+        the split times themselves are drawn.
+        """
+        attempt_count = progression.attempt_count
+        finished = progression.finished
+        self.progression = LineCollection(progression.points, linewidths=0.8)
+        # the limits are set below, from the points that aren't far off
+        self.ax.add_collection(self.progression, autolim=False)
+
+        def recolor(theme: Theme):
+            # fainter the more attempts pile up
+            alpha = float(np.clip(50 / max(attempt_count, 1), 0.03, 0.6))
+            colors = np.where(finished[:, None], mcolors.to_rgba(theme.plot2_color, alpha), mcolors.to_rgba(theme.scatter_color, alpha / 2))
+            self.progression.set_colors(colors)
+            self.pb_line.set_color(theme.pb_color)
+        self.pb_line = self.ax.axhline(0, linewidth=1.5)
+        recolor(self.theme)
+        self.theme_updates.append(recolor)
+
+        # hoverable points: every split with a time, not the start
+        self.progression_rows, self.progression_splits = progression.rows, progression.splits
+        self.progression_points = progression.hover_points
+        self.progression_times = progression.times
+
+        self.ax.set_xlim(0, progression.split_count)
+        self.set_split_ticks(["Start", *self.lsd.split_names])
+        if len(self.progression_points):
+            low, high = np.percentile(self.progression_points[:, 1], (1, 99))
+            margin = (high - low) * 0.05 or 1
+            self.ax.set_ylim(min(low, 0) - margin, max(high, 0) + margin)
+
+        # y axis formatting
+        time_axis.set_duration_axis(self.ax.yaxis)
+
+        title = "Run Progression" if progression.has_pb else "Run Progression (no PB)"
+        self.set_axes_headers(title=f"{title} ({attempt_count} attempts)", title_color=self.theme.title_color)
+        self.ax.set_xlabel("Split")
+        self.ax.set_ylabel("Delta to PB" if progression.has_pb else "Split Time")
+        self.ax.set_axisbelow(True)
+
+        return self.fig
+
+    def reset_distribution(self, resets: ResetAnalysis) -> Figure:
+        """
+        Number of resets during every segment.
+        """
+        self.resets = resets
+        self.bars = self.ax.bar(np.arange(resets.segment_count), resets.resets, color=self.theme.hist_color)
+        self.theme_updates.append(lambda theme: [bar.set_facecolor(theme.hist_color) for bar in self.bars])
+
+        self.set_split_ticks(self.lsd.split_names)
+
+        self.set_axes_headers(title=f"Reset Distribution ({resets.reset_count} of {resets.attempt_count} attempts)", title_color=self.theme.title_color)
+        self.ax.set_xlabel("Reset During")
+        self.ax.set_ylabel("Resets")
+        self.ax.set_axisbelow(True)
+
+        return self.fig
+
+    def survival_curve(self, resets: ResetAnalysis) -> Figure:
+        """
+        Share of attempts that made it to every split, from 100% at the start down to the finished ones.
+        """
+        self.resets = resets
+        self.plot_pb_line(np.arange(resets.segment_count + 1), resets.survival * 100)
+        # a share holds until the next split
+        self.ax.get_lines()[-1].set_drawstyle('steps-post')
+
+        self.set_split_ticks(["Start", *self.lsd.split_names])
+        self.ax.set_ylim(0, 105)
+
+        self.set_axes_headers(title=f"Survival Curve ({resets.attempt_count} attempts)", title_color=self.theme.title_color)
+        self.ax.set_xlabel("Split")
+        self.ax.set_ylabel("Attempts Reaching (%)")
+        self.ax.set_axisbelow(True)
+
+        return self.fig
+
+    def set_split_ticks(self, labels: list[str]):
+        self.ax.set_xticks(np.arange(len(labels)), labels, rotation=45, ha='right', fontsize='small')
+
+    def plot_pb_line(self, x, pb_times):
+        line, = self.ax.plot(
+            x, 
+            pb_times, 
+            color=self.theme.plot_color, 
+            linewidth=1.5, 
+            marker="o", 
+            markersize=3.5, 
+            markerfacecolor=self.theme.scatter_color, 
+            markeredgecolor=self.theme.scatter_color
+        )
+
+        def recolor(theme: Theme):
+            line.set_color(theme.plot_color)
+            line.set_markerfacecolor(theme.scatter_color)
+            line.set_markeredgecolor(theme.scatter_color)
+        self.theme_updates.append(recolor)
+
     def hover_plot(self, event: MouseEvent, graph: Graph):
         """
         Check when hovering over a plot line, proceed to update the annotation.
@@ -238,49 +607,48 @@ class Plot():
         different graphs require different annotations with different data types.
         """
         plot_data: list[Line2D] = self.ax.get_lines()
-        if event.inaxes != self.ax or len(plot_data) < 1:
+        if event.inaxes != self.ax or len(plot_data) < 1 or graph == Graph.PB_OVER_ATTEMPTS:
             return
 
-        # assume 1 line
-        line = plot_data[0]
-        if len(plot_data) == 2:
-            # check which line is being hovered over
-            if plot_data[1].contains(event)[0]:
-                line = plot_data[1]
+        # closest point of any line, the last line drawn is on top
+        hovered = None
+        for line in reversed(plot_data):
+            index = self.hover_index(line, line.get_xydata()).nearest(event.x, event.y, line.get_pickradius())
+            if index is not None:
+                hovered = (line, index)
+                break
 
-        hovering_over_line, pointlist = line.contains(event)
+        if hovered is None:
+            self.hide_annot()
+            return
 
-        if hovering_over_line:
+        line, index = hovered
+        if hovered != self.hovered:
             match graph:
                 case Graph.ATTEMPTS_OVER_TIME:
-                    self.update_attempts_over_time_annot(pointlist, line)
+                    self.update_attempts_over_time_annot(index, line)
                 case Graph.PB_OVER_TIME:
-                    self.update_pb_over_time_annot(pointlist, line)
-                case Graph.PB_OVER_ATTEMPTS:
-                    return
-            self.annot.set_visible(True)
-            self.fig.canvas.draw_idle()
-        else:
-            if self.annot.get_visible():
-                self.annot.set_visible(False)
-                self.fig.canvas.draw_idle()
-
-    def update_pb_over_time_annot(self, pointlist: dict, line: Line2D):
+                    self.update_pb_over_time_annot(index, line)
+                case Graph.SOB_OVER_TIME:
+                    self.update_sob_annot(index, line)
+                case Graph.SURVIVAL:
+                    self.update_survival_annot(index, line)
+        self.show_annot(hovered)
+
+    def update_pb_over_time_annot(self, index: int, line: Line2D):
         """
         Format the data for the PB Over Time graph and update the annotation.
         """
-        index = pointlist["ind"][0]
-        day: datetime = line.get_xdata()[index]
-        day = day.strftime("%b %d %Y")
-        pb_time: datetime = line.get_ydata()[index]
+        day = self.format_date(self.history.pb_dates[index])
+        pb_time = self.history.pb_times[index]
         
         improved_by = "_"
         if index != 0:  
-            previous_pb_time: datetime = line.get_ydata()[index-1]
-            difference = previous_pb_time - pb_time
+            previous_pb_time = self.history.pb_times[index-1]
+            difference = livesplit_time.ticks_to_timedelta(previous_pb_time - pb_time)
             improved_by = self.format_timedelta(difference)
 
-        pb_time = pb_time.strftime("%H:%M:%S.%f")[:10]
+        pb_time = livesplit_time.format_ticks(pb_time)
 
         # set coordinates for annotation object relative to object being annotated
         pos = line.get_xydata()[index]
@@ -288,21 +656,88 @@ class Plot():
 
         self.annot.set_text(f"#{index+1}\n{day}\n\nPB: {pb_time}\nImproved by {improved_by}")
 
-    def update_attempts_over_time_annot(self, pointlist: dict, line: Line2D):
+    def update_sob_annot(self, index: int, line: Line2D):
+        """
+        Sum of best after an attempt and the golds that attempt set.
+        """
+        day = self.format_date(self.sob_ended[index])
+        sob = livesplit_time.format_ticks(self.sob_times[index])
+
+        improved_by = "_"
+        if index != 0:
+            improved_by = self.format_timedelta(livesplit_time.ticks_to_timedelta(self.sob_times[index-1] - self.sob_times[index]))
+
+        best_segments = self.lsd.best_segments
+        golds = []
+        for gold in best_segments.golds_of_row(self.sob_rows[index]):
+            split_name = self.lsd.split_names[best_segments.gold_segments[gold]]
+            previous = best_segments.previous_times[gold]
+            if previous == NO_TIME:
+                golds.append(f"{split_name}: first time")
+            else:
+                golds.append(f"{split_name}: -{self.format_timedelta(livesplit_time.ticks_to_timedelta(previous - best_segments.gold_times[gold])).strip()}")
+        if len(golds) > 3:
+            golds = golds[:3] + [f"and {len(golds) - 3} more"]
+        # without golds the sum went down through a time over skipped splits
+        details = "Golds:\n" + "\n".join(golds) if golds else "Faster over skipped splits"
+
+        self.annot.xy = line.get_xydata()[index]
+        self.annot.set_text(f"#{self.sob_attempts[index]}\n{day}\n\nSoB: {sob}\nImproved by {improved_by}\n\n{details}")
+
+    def update_survival_annot(self, index: int, line: Line2D):
+        """
+        Attempts that made it through a split and how many of the ones that got to it were reset on it.
+        """
+        resets = self.resets
+        split_name = "Start" if index == 0 else self.lsd.split_names[index - 1]
+        text = f"{split_name}\n\n{resets.reached[index]} attempts ({resets.survival[index]:.1%})"
+        if index != 0:
+            text += f"\n{resets.resets[index - 1]} reset on this split ({resets.reset_rate(index - 1):.1%})"
+
+        self.annot.xy = line.get_xydata()[index]
+        self.annot.set_text(text)
+
+    def hover_bars(self, event: MouseEvent):
+        """
+        Annotate the bar of the Reset Distribution graph under the cursor.
+        """
+        if event.inaxes != self.ax or event.xdata is None:
+            return
+
+        index = int(round(event.xdata))
+        if not 0 <= index < len(self.bars) or not self.bars[index].contains(event)[0]:
+            self.hide_annot()
+            return
+
+        if index != self.hovered:
+            self.update_reset_annot(index)
+        self.show_annot(index)
+
+    def update_reset_annot(self, index: int):
+        resets = self.resets
+        count = resets.resets[index]
+        share = count / resets.reset_count if resets.reset_count else 0.0
+
+        bar = self.bars[index]
+        self.annot.xy = (bar.get_x() + bar.get_width() / 2, bar.get_height())
+        self.annot.set_text(f"{self.lsd.split_names[index]}\n\n{count} resets ({share:.1%} of resets)\n{resets.reset_rate(index):.1%} of {resets.reached[index]} attempts")
+
+    def update_attempts_over_time_annot(self, index: int, line: Line2D):
         """
         Format the data for the Attempts Over Time graph and update the annotation.
         """
-        index = pointlist["ind"][0]
-        day: datetime = line.get_xdata()[index]
-        day = day.strftime("%b %d %Y")
-        total_attempts = line.get_ydata()[index]
-        daily_time_played: relativedelta = self.lsd.daily_time_played[index]
-        daily_time_played = self.format_relativedelta(daily_time_played)
+        if line.get_label() == "All":
+            dates, attempts, before = self.history.AOT_dates, self.history.AOT_attempts, self.history.AOT_before
+        else:
+            dates, attempts, before = self.history.unique_finished_dates, self.history.finished_attempts, self.history.finished_before
+        day = self.format_date(dates[index])
+        total_attempts = attempts[index]
+        daily_time_played = self.format_seconds(self.history.daily_time_played[index])
 
         # check for first index
-        total_attempts_previous_session = line.get_ydata()[index-1]
+        total_attempts_previous_session = attempts[index-1]
         if index == 0:
-            total_attempts_previous_session = 0
+            total_attempts_previous_session = before
         daily_attempts = total_attempts - total_attempts_previous_session
 
         # set coordinates for annotation object relative to object being annotated
@@ -313,6 +748,36 @@ class Plot():
         else:
             self.annot.set_text(f"Total: {total_attempts}\nDaily: {daily_attempts}\nDate: {day}")
 
+    def hover_progression(self, event: MouseEvent):
+        """
+        Annotate the split of any attempt under the cursor on the Run Progression graph.
+        """
+        if event.inaxes != self.ax or len(self.progression_points) == 0:
+            return
+
+        index = self.hover_index(self.progression, self.progression_points).nearest(event.x, event.y, self.progression.get_pickradius())
+        if index is None:
+            self.hide_annot()
+            return
+
+        if index != self.hovered:
+            self.update_progression_annot(index)
+        self.show_annot(index)
+
+    def update_progression_annot(self, index: int):
+        row = self.progression_rows[index]
+        attempt_num = self.lsd.attempt_positions(self.lsd.segment_matrix.attempt_ids[row:row + 1])[0] + 1
+        split_name = self.lsd.split_names[self.progression_splits[index]]
+        split_time = livesplit_time.format_ticks(self.progression_times[index])
+
+        self.annot.xy = self.progression_points[index]
+        if self.lsd.segment_matrix.pb_row >= 0:
+            seconds = self.progression_points[index, 1]
+            delta = ("-" if seconds < 0 else "+") + time_axis.format_duration(abs(seconds), 2, abs(seconds) >= 3600)
+            self.annot.set_text(f"#{attempt_num}\n{split_name}\n\n{split_time}\n{delta}")
+        else:
+            self.annot.set_text(f"#{attempt_num}\n{split_name}\n\n{split_time}")
+
     def hover_scatter(self, event: MouseEvent):
         """
         Check when hovering over a scatter node, proceed to update the annotation.
@@ -320,27 +785,36 @@ class Plot():
         if event.inaxes != self.ax:
             return
         
-        scatter_data = self.ax.collections[0]
-        hovering_over_scatter_point, points_on_x_axis = scatter_data.contains(event)
+        # every time can be hovered, not just the ones the decimation kept
+        offsets = self.scatter_points
+        # marker radius plus the same slack Collection.contains gives
+        radius = np.sqrt(self.scatter.get_sizes()[0]) / 2 * self.fig.dpi / 72 + self.scatter.get_pickradius()
+        index = self.hover_index(self.scatter, offsets).nearest(event.x, event.y, radius)
+
+        if index is None:
+            self.hide_annot()
+            return
 
-        if hovering_over_scatter_point:
-            self.update_scatter_annot(points_on_x_axis, scatter_data)
-            self.annot.set_visible(True)
-            self.fig.canvas.draw_idle()
-        else:
-            if self.annot.get_visible():
-                self.annot.set_visible(False)
-                self.fig.canvas.draw_idle()
+        if index != self.hovered:
+            self.update_scatter_annot(index, offsets)
+        self.show_annot(index)
 
-    def update_scatter_annot(self, points_on_x_axis: dict, scatter_data: PathCollection):
-        pos = scatter_data.get_offsets()[points_on_x_axis["ind"][0]]
-        self.annot.xy = pos
+    def update_scatter_annot(self, index: int, offsets: np.ndarray):
+        self.annot.xy = offsets[index]
 
-        attempt_num = points_on_x_axis["ind"][0] + 1
-        formatted_time = self.seg_times[attempt_num-1].strftime("%M:%S.%f")[:9]
+        attempt_num = index + 1
+        formatted_time = time_axis.format_duration(self.seconds[index], 3)
         self.annot.set_text(f"#{attempt_num}\n{formatted_time}")
 
+    def refresh_headers(self):
+        """
+        Redraw the title with the current data, used when the speedrun.com variables arrive after the graph was drawn.
+        """
+        if self.title is not None:
+            self.set_axes_headers(self.title, self.title_color)
+
     def set_axes_headers(self, title, title_color):
+        self.title, self.title_color = title, title_color
         game_name = self.lsd.game_name
         category = self.lsd.game_category
         variables = self.lsd.variables
@@ -352,19 +826,23 @@ class Plot():
         #variables must be present in lss file
         if available_variables != 0 and len(variables) != 0 :
             for available_var in available_variables:
-                for var in variables:
-                    if available_var == var.attrib.get('name'):
-                        ordered_variables.append(var)
+                if available_var in variables:
+                    ordered_variables.append((available_var, variables[available_var]))
 
-            for variable in ordered_variables:
-                if variable.text.lower() in ('yes', 'no'):
-                    variable_string += f"{variable.attrib.get('name')}={variable.text}, "
+            for name, value in ordered_variables:
+                if value.lower() in ('yes', 'no'):
+                    variable_string += f"{name}={value}, "
                     continue
-                variable_string += f"{variable.text}, "
+                variable_string += f"{value}, "
         
             variable_string = variable_string.removesuffix(', ')
             variable_string = f"({variable_string})"
 
+        # a graph of part of the history says which part
+        label = self.history.range.label(self.graph is None or self.graph.uses_finished_only)
+        if label:
+            title = f"{title} [{label}]"
+
         self.ax.set_title(f"{game_name} - {category} {variable_string}\n{title}", color=title_color, loc='center', wrap=True)
 
     def format_timedelta(self, td: timedelta) -> str:
@@ -393,25 +871,29 @@ class Plot():
 
         return formatted_str
     
-    def format_relativedelta(self, rd: relativedelta) -> str:
+    def format_seconds(self, total_seconds: int) -> str:
         """
-        Helper function that converts a `relativedelta` object to a user friendly string.
+        Helper function that converts a number of seconds to a user friendly string.
+
+        Examples: `26h 3m 10s` or `17m 56s`
         """
-        
-        hours = rd.hours
-        hours += rd.days * 24
+        hours, rest = divmod(int(total_seconds), 3600)
+        minutes, seconds = divmod(rest, 60)
 
         formatted_str = ""
         if hours != 0:
             formatted_str += f"{hours}h "
 
-        if rd.minutes != 0:
-            formatted_str += f"{rd.minutes}m "
+        if minutes != 0:
+            formatted_str += f"{minutes}m "
 
-        if rd.seconds != 0:
-            formatted_str += f"{rd.seconds}s "
+        if seconds != 0:
+            formatted_str += f"{seconds}s "
 
         return formatted_str
-    
-    def rd_in_seconds(self, rd: relativedelta) -> int:
-        return rd.days*86400 + rd.hours*3600 + rd.minutes*60 + rd.seconds
\ No newline at end of file
+
+    def format_date(self, day: np.datetime64) -> str:
+        """
+        Helper function that formats a `datetime64` day like `Jan 05 2024`.
+        """
+        return day.astype('datetime64[D]').item().strftime("%b %d %Y")
@@ -0,0 +1,43 @@
+import numpy as np
+
+from segment_matrix import SegmentMatrix
+import livesplit_time
+
+
+class RunProgression():
+    ''' Every attempt's time at each split as a line for the Run Progression graph: its difference to the PB,
+        or the split times themselves when there's no PB.
+
+        - `points`: attempts x (splits + 1) x 2 vertices, every line starts level at x = 0 and is NaN past its last time
+        - `finished`: attempts with a time on the last split
+        - `rows`, `splits`: matrix row and split of every point with a time (the start isn't one)
+        - `hover_points`, `times`: position on the graph and split time (ticks) of the same points
+    '''
+    def __init__(self, matrix: SegmentMatrix, rows: slice | np.ndarray):
+        self.has_pb = matrix.pb_row >= 0
+        split_times = matrix.split_times(rows)
+        valid = matrix.valid[rows].copy()
+        if self.has_pb:
+            pb_split_times = matrix.split_times(slice(matrix.pb_row, matrix.pb_row + 1))[0]
+            seconds = (split_times - pb_split_times) / livesplit_time.TICKS_PER_SECOND
+            valid &= matrix.valid[matrix.pb_row]
+        else:
+            seconds = split_times / livesplit_time.TICKS_PER_SECOND
+
+        attempt_count, split_count = seconds.shape
+        self.attempt_count, self.split_count = attempt_count, split_count
+        xs = np.broadcast_to(np.arange(split_count + 1, dtype=np.float64), (attempt_count, split_count + 1))
+        ys = np.hstack((np.zeros((attempt_count, 1)), seconds))
+        keep = np.hstack((np.ones((attempt_count, 1), dtype=bool), valid))
+
+        # a line goes straight over skipped splits: move the points with a time to the front of their row
+        order = np.argsort(~keep, axis=1, kind='stable')
+        kept = np.take_along_axis(keep, order, axis=1)
+        self.points = np.stack((np.take_along_axis(xs, order, axis=1), np.take_along_axis(ys, order, axis=1)), axis=2)
+        self.points[~kept] = np.nan
+        self.finished = valid[:, -1]
+
+        lines, splits = np.nonzero(valid)
+        self.rows, self.splits = np.arange(len(matrix.attempt_ids))[rows][lines], splits
+        self.hover_points = np.column_stack((splits + 1.0, seconds[lines, splits]))
+        self.times = split_times[lines, splits]
@@ -0,0 +1,62 @@
+import numpy as np
+
+from attempt_table import AttemptTable
+from segment_matrix import SegmentMatrix
+
+
+def splits_reached(matrix: SegmentMatrix, attempts: AttemptTable) -> np.ndarray:
+    ''' How many splits every attempt got through, in `attempts` order. Attempts reset before their first split
+        have no segment history and got through 0.
+
+        A split counts as reached when its history has an entry for the attempt, skipped ones included.
+    '''
+    segment_count = matrix.segment_count
+    reached = np.zeros(len(attempts), dtype=np.int64)
+    if len(matrix.attempt_ids) == 0 or segment_count == 0:
+        return reached
+
+    # last split with an entry, read from the end of every row at once
+    present = matrix.present
+    last = segment_count - np.argmax(present[:, ::-1], axis=1)
+    rows_reached = np.where(present.any(axis=1), last, 0)
+
+    # rows are sorted by id, the table is in file order
+    order = np.argsort(attempts.ids, kind='stable')
+    found = np.searchsorted(attempts.ids, matrix.attempt_ids, sorter=order)
+    in_table = found < len(order)
+    positions = order[found[in_table]]
+    in_table[in_table] = attempts.ids[positions] == matrix.attempt_ids[in_table]
+    reached[order[found[in_table]]] = rows_reached[in_table]
+
+    # a finished run went through everything even when the file lost some of its history
+    reached[attempts.finished] = segment_count
+    return reached
+
+
+class ResetAnalysis():
+    ''' Where a number of attempts were reset, from how many splits each got through and whether it was finished.
+
+        - `attempt_count`, `finished_count`: attempts taken into account and how many of them were finished
+        - `resets`: resets during every segment, so `resets[0]` are the attempts that never got through the first split
+        - `reached`: attempts that got to the start of every segment and past the last one (`segment_count + 1` entries)
+        - `survival`: `reached` as a share of `attempt_count`
+    '''
+    def __init__(self, reached: np.ndarray, finished: np.ndarray, segment_count: int):
+        self.segment_count = segment_count
+        self.attempt_count = len(reached)
+        self.finished_count = int(finished.sum())
+
+        # an attempt that has every split but no time still died on the last segment
+        reset_at = np.minimum(reached[~finished], max(segment_count - 1, 0))
+        self.resets = np.bincount(reset_at, minlength=segment_count)[:segment_count]
+        self.reached = self.attempt_count - np.concatenate(([0], np.cumsum(self.resets)))
+        self.survival = self.reached / self.attempt_count if self.attempt_count else np.zeros(segment_count + 1)
+
+    @property
+    def reset_count(self) -> int:
+        return self.attempt_count - self.finished_count
+
+    def reset_rate(self, segment: int) -> float:
+        ''' Share of the attempts that started segment `segment` and were reset during it. '''
+        started = self.reached[segment]
+        return self.resets[segment] / started if started else 0.0
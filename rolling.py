@@ -0,0 +1,154 @@
+from bisect import bisect_left, insort
+
+import numpy as np
+import pandas as pd
+
+
+def window_starts(count: int, window: int) -> np.ndarray:
+    ''' First position of the window ending at every point, shorter windows at the start of the series. '''
+    return np.maximum(np.arange(1, count + 1) - window, 0)
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    ''' Mean of the last `window` values at every point, from one cumulative sum. '''
+    values = np.asarray(values, dtype=np.float64)
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    ends = np.arange(1, len(values) + 1)
+    starts = window_starts(len(values), window)
+    return (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    ''' Population standard deviation of the last `window` values at every point, from cumulative sums. '''
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return values.copy()
+
+    # centre first so the sum of squares doesn't lose precision
+    centred = values - values.mean()
+    mean = rolling_mean(centred, window)
+    mean_of_squares = rolling_mean(centred * centred, window)
+    return np.sqrt(np.maximum(mean_of_squares - mean * mean, 0))
+
+
+class SortedWindow():
+    ''' Values of a rolling window in order, kept as sorted blocks of up to `2 * load` values.
+
+        Adding or removing a value is a binary search over the block maxima and an insert or delete inside one block,
+        O(log w + load) for a window of w values. Reading the value at a position walks the block lengths, O(w / load).
+    '''
+    def __init__(self, load: int = 1000):
+        self.load = load
+        self.blocks: list[list[float]] = []
+        self.maxes: list[float] = []
+        self.length = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: int) -> float:
+        for block in self.blocks:
+            if index < len(block):
+                return block[index]
+            index -= len(block)
+        raise IndexError("window position out of range")
+
+    def add(self, value: float):
+        self.length += 1
+        if not self.blocks:
+            self.blocks.append([value])
+            self.maxes.append(value)
+            return
+
+        b = bisect_left(self.maxes, value)
+        if b == len(self.blocks):
+            b -= 1
+            self.blocks[b].append(value)
+            self.maxes[b] = value
+        else:
+            insort(self.blocks[b], value)
+
+        block = self.blocks[b]
+        if len(block) > 2 * self.load:
+            self.blocks[b:b + 1] = [block[:self.load], block[self.load:]]
+            self.maxes[b:b + 1] = [block[self.load - 1], block[-1]]
+
+    def remove(self, value: float):
+        # the first block whose maximum isn't below the value holds its first copy
+        b = bisect_left(self.maxes, value)
+        block = self.blocks[b]
+        del block[bisect_left(block, value)]
+        self.length -= 1
+        if block:
+            self.maxes[b] = block[-1]
+        else:
+            del self.blocks[b]
+            del self.maxes[b]
+
+
+def rolling_percentiles(values: np.ndarray, window: int, percentiles: tuple[float, ...]) -> np.ndarray:
+    ''' Percentiles of the last `window` values at every point, shape (len(percentiles), len(values)).
+
+        The window is a `SortedWindow`: each step adds the new value, drops the one leaving the window and reads every
+        percentile off by position (linear interpolation, same as `np.percentile`). That's O(n * (log w + load + w / load))
+        for n values, windows up to the block size are a single sorted list.
+    '''
+    values = np.asarray(values, dtype=np.float64)
+    fractions = [percentile / 100 for percentile in percentiles]
+    columns: list[list[float]] = [[] for _ in fractions]
+
+    # interpolation points only depend on the window length, which is constant after the first `window` values
+    lookup: dict[int, list[tuple[int, int, float]]] = {}
+
+    ordered = SortedWindow()
+    add, remove = ordered.add, ordered.remove
+    as_list = values.tolist()
+    for i, value in enumerate(as_list):
+        add(value)
+        if i >= window:
+            remove(as_list[i - window])
+
+        length = len(ordered)
+        if length not in lookup:
+            points = []
+            for fraction in fractions:
+                position = fraction * (length - 1)
+                lower = int(position)
+                points.append((lower, min(lower + 1, length - 1), position - lower))
+            lookup[length] = points
+
+        # most windows fit in one block, which is indexed directly
+        at = ordered.blocks[0].__getitem__ if len(ordered.blocks) == 1 else ordered.__getitem__
+        for column, (lower, upper, weight) in zip(columns, lookup[length]):
+            low = at(lower)
+            column.append(low + (at(upper) - low) * weight)
+
+    return np.array(columns, dtype=np.float64).reshape(len(fractions), len(values))
+
+
+def rolling_stats(values: np.ndarray, window: int, percentiles: tuple[float, ...] = (10, 90)) -> pd.DataFrame:
+    ''' Rolling mean, median, standard deviation and `percentiles` (columns `p10`, `p90`, ...) for every point. '''
+    window = max(int(window), 1)
+    quantiles = rolling_percentiles(values, window, (50, *percentiles))
+
+    stats = pd.DataFrame({
+        'mean': rolling_mean(values, window),
+        'median': quantiles[0],
+        'std': rolling_std(values, window),
+    })
+    for percentile, column in zip(percentiles, quantiles[1:]):
+        stats[f"p{percentile:g}"] = column
+    return stats
+
+
+def extend_rolling_stats(stats: pd.DataFrame, values: np.ndarray, window: int, percentiles: tuple[float, ...] = (10, 90)) -> pd.DataFrame:
+    ''' `rolling_stats` of `values` when `stats` already covers its first `len(stats)` points.
+
+        Only the new points and the `window - 1` values before them are looked at.
+    '''
+    window = max(int(window), 1)
+    done = len(stats)
+    tail_start = max(done - window + 1, 0)
+    tail = rolling_stats(values[tail_start:], window, percentiles)
+    new_rows = tail.iloc[done - tail_start:]
+    return pd.concat((stats, new_rows), ignore_index=True)
@@ -0,0 +1,107 @@
+import numpy as np
+
+from lss_reader import SegmentHistory
+import livesplit_time
+
+
+class SegmentMatrix():
+    ''' Every SegmentHistory decoded into one attempts x segments grid.
+
+        - `attempt_ids`: sorted attempt id of every row
+        - `times`: segment RealTime in ticks, 0 where there's no time
+        - `present`: a Time element exists for that attempt and segment (the split was reached)
+        - `valid`: that Time element has a RealTime (False for skipped splits)
+        - `pb_row`: row of the PB attempt, -1 without a PB
+    '''
+    def __init__(self, attempt_ids: np.ndarray, times: np.ndarray, present: np.ndarray, valid: np.ndarray, pb_row: int):
+        self.attempt_ids = attempt_ids
+        self.times = times
+        self.present = present
+        self.valid = valid
+        self.pb_row = pb_row
+
+    @property
+    def segment_count(self) -> int:
+        return self.times.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.attempt_ids.nbytes + self.times.nbytes + self.present.nbytes + self.valid.nbytes
+
+    def column(self, segment_index: int, first_row: int = 0, last_row: int | None = None, finished_only: bool = False) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        ''' Attempt ids, times (ticks) and PB marker of every valid entry of a segment from `first_row` up to `last_row`
+            (exclusive), in attempt order. `finished_only` leaves out the entries of attempts without a last split.
+        '''
+        valid = self.valid[first_row:last_row, segment_index]
+        if finished_only:
+            valid = valid & self.valid[first_row:last_row, -1]
+        rows = np.flatnonzero(valid) + first_row
+        return self.attempt_ids[rows], self.times[rows, segment_index], rows == self.pb_row
+
+    def split_times(self, rows: slice | np.ndarray = slice(None)) -> np.ndarray:
+        ''' What the timer showed at every split of the attempts in `rows` (ticks): the running sum of their segment times.
+
+            Only meaningful where `valid`. A skipped split shows no time and the next one includes its segment,
+            nothing after a reset has a time.
+        '''
+        return np.cumsum(np.where(self.valid[rows], self.times[rows], 0), axis=1)
+
+    def append(self, histories: list[SegmentHistory], pb_id: int | None):
+        ''' Add rows for history entries of attempts newer than every existing row. '''
+        new = SegmentMatrix.from_histories(histories, None)
+        if len(self.attempt_ids) and len(new.attempt_ids) and new.attempt_ids[0] <= self.attempt_ids[-1]:
+            raise ValueError("appended attempts must be newer than the existing ones")
+
+        self.attempt_ids = np.concatenate((self.attempt_ids, new.attempt_ids))
+        self.times = np.concatenate((self.times, new.times))
+        self.present = np.concatenate((self.present, new.present))
+        self.valid = np.concatenate((self.valid, new.valid))
+        self.pb_row = self.row_of(pb_id)
+
+    def row_of(self, attempt_id: int | None) -> int:
+        if attempt_id is None:
+            return -1
+        row = np.searchsorted(self.attempt_ids, attempt_id)
+        if row < len(self.attempt_ids) and self.attempt_ids[row] == attempt_id:
+            return int(row)
+        return -1
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        return {
+            'segment_attempt_ids': self.attempt_ids,
+            'segment_times': self.times,
+            'segment_present': self.present,
+            'segment_valid': self.valid,
+            'segment_pb_row': np.array(self.pb_row),
+        }
+
+    @staticmethod
+    def from_arrays(arrays: dict[str, np.ndarray]) -> 'SegmentMatrix':
+        return SegmentMatrix(arrays['segment_attempt_ids'], arrays['segment_times'], arrays['segment_present'], arrays['segment_valid'], int(arrays['segment_pb_row']))
+
+    @staticmethod
+    def from_histories(histories: list[SegmentHistory], pb_id: int | None) -> 'SegmentMatrix':
+        ''' Decode every segment's history at once, entries from imported history (negative ids) are left out. '''
+        id_columns = [np.array(history.attempt_ids, dtype=np.int32) for history in histories]
+        all_ids = np.concatenate(id_columns) if id_columns else np.empty(0, dtype=np.int32)
+        attempt_ids = np.unique(all_ids[all_ids >= 0])
+
+        shape = (len(attempt_ids), len(histories))
+        times = np.zeros(shape, dtype=np.int64)
+        present = np.zeros(shape, dtype=bool)
+        valid = np.zeros(shape, dtype=bool)
+
+        # parse every segment's times in a single call, then scatter them into the grid
+        segment_of_entry = np.repeat(np.arange(len(histories)), [len(ids) for ids in id_columns])
+        ticks, has_time = livesplit_time.parse_times([t for history in histories for t in history.real_times])
+        keep = all_ids >= 0
+        rows = np.searchsorted(attempt_ids, all_ids[keep])
+        cols = segment_of_entry[keep]
+
+        present[rows, cols] = True
+        valid[rows, cols] = has_time[keep]
+        times[rows, cols] = ticks[keep]
+
+        matrix = SegmentMatrix(attempt_ids, times, present, valid, -1)
+        matrix.pb_row = matrix.row_of(pb_id)
+        return matrix
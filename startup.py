@@ -0,0 +1,62 @@
+'''
+Where the time goes between launching the app and the first graph on screen.
+
+Stages (imports, parts of the window setup) are timed with `stage`, points in time (first paint, first
+graph drawn) with `mark`. Start the app with `--startup-report` or set LIVESPLIT_GRAPHS_STARTUP_REPORT to
+have them printed once startup is over.
+'''
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+
+
+# as close to process start as a module can get, it's the first thing the app imports
+START = perf_counter()
+
+enabled = '--startup-report' in sys.argv or bool(os.environ.get('LIVESPLIT_GRAPHS_STARTUP_REPORT'))
+
+# (name, seconds it took or None for a mark, seconds since start when it ended, thread)
+_entries: list[tuple[str, float | None, float, str]] = []
+_lock = threading.Lock()
+reported = False
+
+
+def elapsed() -> float:
+    return perf_counter() - START
+
+
+@contextmanager
+def stage(name: str):
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        end = perf_counter()
+        if enabled:
+            with _lock:
+                _entries.append((name, end - start, end - START, threading.current_thread().name))
+
+
+def mark(name: str):
+    if not enabled:
+        return
+    with _lock:
+        _entries.append((name, None, elapsed(), threading.current_thread().name))
+
+
+def report(file=sys.stderr):
+    ''' Print everything recorded so far, only the first time it's called and only when enabled. '''
+    global reported
+    with _lock:
+        if reported or not enabled:
+            return
+        reported = True
+        entries = sorted(_entries, key=lambda entry: entry[2])
+
+    print("startup:", file=file)
+    for name, seconds, at, thread in entries:
+        took = f"{seconds * 1000:8.1f}ms" if seconds is not None else " " * 10
+        where = "" if thread == 'MainThread' else f"  [{thread}]"
+        print(f"  {at * 1000:8.1f}ms {took}  {name}{where}", file=file)
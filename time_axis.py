@@ -0,0 +1,122 @@
+import math
+
+import numpy as np
+import matplotlib.dates as mdates
+from matplotlib.axis import Axis
+from matplotlib.ticker import Formatter, Locator
+
+
+# tick steps for duration axes in seconds, past the last one steps are multiples of it
+DURATION_STEPS = (
+    0.01, 0.02, 0.05, 0.1, 0.2, 0.5,
+    1, 2, 5, 10, 15, 30,
+    60, 2*60, 5*60, 10*60, 15*60, 30*60,
+    3600, 2*3600, 3*3600, 6*3600, 12*3600,
+)
+
+
+def duration_step(span: float, nbins: int) -> float:
+    ''' Smallest step from `DURATION_STEPS` that splits `span` seconds into at most `nbins` intervals. '''
+    raw = span / max(nbins, 1)
+    for step in DURATION_STEPS:
+        if step >= raw:
+            return step
+    largest = DURATION_STEPS[-1]
+    return largest * math.ceil(raw / largest)
+
+
+def step_decimals(step: float) -> int:
+    ''' Digits after the point needed to tell ticks `step` seconds apart. '''
+    if step >= 1:
+        return 0
+    return min(3, max(1, -math.floor(math.log10(step) + 1e-9)))
+
+
+def format_duration(seconds: float, decimals: int = 0, hours: bool = False) -> str:
+    ''' `H:MM:SS` (`hours`) or `MM:SS` with `decimals` digits after the point, minutes keep counting past an hour without `hours`.
+
+        Digits past `decimals` are cut off rather than rounded, like LiveSplit does.
+    '''
+    sign = "-" if seconds < 0 else ""
+    scale = 10 ** decimals
+    # the epsilon keeps float noise (0.3 * 10 = 2.999...) from dropping a digit
+    total = math.floor(abs(seconds) * scale + 1e-6)
+    whole, fraction = divmod(total, scale)
+    m, s = divmod(whole, 60)
+
+    if hours:
+        h, m = divmod(m, 60)
+        formatted = f"{sign}{h}:{m:02d}:{s:02d}"
+    else:
+        formatted = f"{sign}{m:02d}:{s:02d}"
+    if decimals > 0:
+        formatted += f".{fraction:0{decimals}d}"
+    return formatted
+
+
+class DurationLocator(Locator):
+    ''' Ticks on round durations (1s, 15s, 1m, 5m, ...) for an axis in seconds. '''
+    def __init__(self, nbins: int = 8):
+        self.nbins = nbins
+
+    def __call__(self):
+        vmin, vmax = self.axis.get_view_interval()
+        return self.tick_values(vmin, vmax)
+
+    def tick_values(self, vmin, vmax):
+        if vmax < vmin:
+            vmin, vmax = vmax, vmin
+        if not np.isfinite(vmin) or not np.isfinite(vmax) or vmax == vmin:
+            return np.array([vmin])
+
+        step = duration_step(vmax - vmin, self.nbins)
+        first = math.ceil(vmin / step - 1e-9)
+        last = math.floor(vmax / step + 1e-9)
+        return self.raise_if_exceeds(np.arange(first, last + 1) * step)
+
+    def view_limits(self, vmin, vmax):
+        return vmin, vmax
+
+
+class DurationFormatter(Formatter):
+    ''' Labels for an axis in seconds. The format is picked once per draw from the ticks in view:
+        `H:MM:SS` past an hour, `MM:SS` below, with as many decimals as the tick step needs.
+    '''
+    def __init__(self):
+        self.hours = False
+        self.decimals = 0
+
+    def set_locs(self, locs):
+        super().set_locs(locs)
+        locs = np.asarray(locs, dtype=np.float64)
+        locs = locs[np.isfinite(locs)]
+        if len(locs) == 0:
+            return
+        self.hours = bool(np.abs(locs).max() >= 3600)
+        self.decimals = step_decimals(np.diff(locs).min()) if len(locs) > 1 else 0
+
+    def __call__(self, x, pos=None):
+        return format_duration(x, self.decimals, self.hours)
+
+    def format_data_short(self, value):
+        # toolbar coordinates
+        return format_duration(value, 3, abs(value) >= 3600)
+
+
+def set_duration_axis(axis: Axis, nbins: int = 8):
+    axis.set_major_locator(DurationLocator(nbins))
+    axis.set_major_formatter(DurationFormatter())
+
+
+def set_date_axis(axis: Axis, maxticks: int = 6):
+    ''' Axis of matplotlib date numbers (see `to_date_numbers`) ticked on whole days, months or years. '''
+    locator = mdates.AutoDateLocator(minticks=3, maxticks=maxticks)
+    # one formatter for every label, not one per tick
+    formatter = mdates.DateFormatter("%b %d '%y")
+    axis.set_major_locator(locator)
+    axis.set_major_formatter(formatter)
+
+
+def to_date_numbers(dates: np.ndarray) -> np.ndarray:
+    ''' datetime64 days to matplotlib date numbers, converted once instead of on every draw. '''
+    return mdates.date2num(np.asarray(dates))
@@ -228,6 +228,74 @@ class Ui_MainWindow(object):
         self.option_personalBestOverTime.setObjectName("option_personalBestOverTime")
         self.option_buttons.addButton(self.option_personalBestOverTime)
         self.options_gridLayout.addWidget(self.option_personalBestOverTime, 0, 3, 1, 1)
+        self.option_sumOfBestOverTime = QtWidgets.QPushButton(parent=self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Maximum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.option_sumOfBestOverTime.sizePolicy().hasHeightForWidth())
+        self.option_sumOfBestOverTime.setSizePolicy(sizePolicy)
+        self.option_sumOfBestOverTime.setMinimumSize(QtCore.QSize(0, 40))
+        self.option_sumOfBestOverTime.setMaximumSize(QtCore.QSize(16777215, 50))
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        self.option_sumOfBestOverTime.setFont(font)
+        self.option_sumOfBestOverTime.setCheckable(True)
+        self.option_sumOfBestOverTime.setChecked(False)
+        self.option_sumOfBestOverTime.setAutoExclusive(True)
+        self.option_sumOfBestOverTime.setObjectName("option_sumOfBestOverTime")
+        self.option_buttons.addButton(self.option_sumOfBestOverTime)
+        self.options_gridLayout.addWidget(self.option_sumOfBestOverTime, 1, 1, 1, 1)
+        self.option_runProgression = QtWidgets.QPushButton(parent=self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Maximum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.option_runProgression.sizePolicy().hasHeightForWidth())
+        self.option_runProgression.setSizePolicy(sizePolicy)
+        self.option_runProgression.setMinimumSize(QtCore.QSize(0, 40))
+        self.option_runProgression.setMaximumSize(QtCore.QSize(16777215, 50))
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        self.option_runProgression.setFont(font)
+        self.option_runProgression.setCheckable(True)
+        self.option_runProgression.setChecked(False)
+        self.option_runProgression.setAutoExclusive(True)
+        self.option_runProgression.setObjectName("option_runProgression")
+        self.option_buttons.addButton(self.option_runProgression)
+        self.options_gridLayout.addWidget(self.option_runProgression, 2, 0, 1, 1)
+        self.option_resetDistribution = QtWidgets.QPushButton(parent=self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Maximum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.option_resetDistribution.sizePolicy().hasHeightForWidth())
+        self.option_resetDistribution.setSizePolicy(sizePolicy)
+        self.option_resetDistribution.setMinimumSize(QtCore.QSize(0, 40))
+        self.option_resetDistribution.setMaximumSize(QtCore.QSize(16777215, 50))
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        self.option_resetDistribution.setFont(font)
+        self.option_resetDistribution.setCheckable(True)
+        self.option_resetDistribution.setChecked(False)
+        self.option_resetDistribution.setAutoExclusive(True)
+        self.option_resetDistribution.setObjectName("option_resetDistribution")
+        self.option_buttons.addButton(self.option_resetDistribution)
+        self.options_gridLayout.addWidget(self.option_resetDistribution, 2, 1, 1, 1)
+        self.option_survivalCurve = QtWidgets.QPushButton(parent=self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Maximum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.option_survivalCurve.sizePolicy().hasHeightForWidth())
+        self.option_survivalCurve.setSizePolicy(sizePolicy)
+        self.option_survivalCurve.setMinimumSize(QtCore.QSize(0, 40))
+        self.option_survivalCurve.setMaximumSize(QtCore.QSize(16777215, 50))
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        self.option_survivalCurve.setFont(font)
+        self.option_survivalCurve.setCheckable(True)
+        self.option_survivalCurve.setChecked(False)
+        self.option_survivalCurve.setAutoExclusive(True)
+        self.option_survivalCurve.setObjectName("option_survivalCurve")
+        self.option_buttons.addButton(self.option_survivalCurve)
+        self.options_gridLayout.addWidget(self.option_survivalCurve, 2, 2, 1, 1)
         self.check_showOutliers = QtWidgets.QCheckBox(parent=self.centralwidget)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Minimum)
         sizePolicy.setHorizontalStretch(0)
@@ -245,6 +313,145 @@ class Ui_MainWindow(object):
         self.check_showOutliers.setChecked(False)
         self.check_showOutliers.setObjectName("check_showOutliers")
         self.options_gridLayout.addWidget(self.check_showOutliers, 3, 0, 1, 1)
+        self.outlier_options = QtWidgets.QComboBox(parent=self.centralwidget)
+        self.outlier_options.setStyleSheet("QComboBox {\n"
+"    border-radius: 3px;\n"
+"    padding: 3px;\n"
+"    background-color: white;\n"
+"}")
+        self.outlier_options.setObjectName("outlier_options")
+        self.options_gridLayout.addWidget(self.outlier_options, 3, 1, 1, 1)
+        self.outlier_threshold = QtWidgets.QDoubleSpinBox(parent=self.centralwidget)
+        self.outlier_threshold.setStyleSheet("QDoubleSpinBox {\n"
+"    border-radius: 3px;\n"
+"    padding: 3px;\n"
+"    background-color: white;\n"
+"}")
+        self.outlier_threshold.setDecimals(1)
+        self.outlier_threshold.setMinimum(0.5)
+        self.outlier_threshold.setMaximum(10.0)
+        self.outlier_threshold.setSingleStep(0.5)
+        self.outlier_threshold.setProperty("value", 3.0)
+        self.outlier_threshold.setObjectName("outlier_threshold")
+        self.options_gridLayout.addWidget(self.outlier_threshold, 3, 2, 1, 1)
+        self.moving_avg_window = QtWidgets.QSpinBox(parent=self.centralwidget)
+        self.moving_avg_window.setStyleSheet("QSpinBox {\n"
+"    border-radius: 3px;\n"
+"    padding: 3px;\n"
+"    background-color: white;\n"
+"}")
+        self.moving_avg_window.setMinimum(2)
+        self.moving_avg_window.setMaximum(1000)
+        self.moving_avg_window.setProperty("value", 10)
+        self.moving_avg_window.setObjectName("moving_avg_window")
+        self.options_gridLayout.addWidget(self.moving_avg_window, 3, 3, 1, 1)
+        self.check_density = QtWidgets.QCheckBox(parent=self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Minimum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.check_density.sizePolicy().hasHeightForWidth())
+        self.check_density.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.check_density.setFont(font)
+        self.check_density.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.ArrowCursor))
+        self.check_density.setLayoutDirection(QtCore.Qt.LayoutDirection.LeftToRight)
+        self.check_density.setStyleSheet("QCheckBox {\n"
+"    margin-left: 10px;\n"
+"}")
+        self.check_density.setChecked(True)
+        self.check_density.setObjectName("check_density")
+        self.options_gridLayout.addWidget(self.check_density, 4, 0, 1, 1)
+        self.bin_options = QtWidgets.QComboBox(parent=self.centralwidget)
+        self.bin_options.setStyleSheet("QComboBox {\n"
+"    border-radius: 3px;\n"
+"    padding: 3px;\n"
+"    background-color: white;\n"
+"}")
+        self.bin_options.setObjectName("bin_options")
+        self.options_gridLayout.addWidget(self.bin_options, 4, 1, 1, 1)
+        self.bin_width = QtWidgets.QDoubleSpinBox(parent=self.centralwidget)
+        self.bin_width.setEnabled(False)
+        self.bin_width.setStyleSheet("QDoubleSpinBox {\n"
+"    border-radius: 3px;\n"
+"    padding: 3px;\n"
+"    background-color: white;\n"
+"}")
+        self.bin_width.setDecimals(1)
+        self.bin_width.setMinimum(0.1)
+        self.bin_width.setMaximum(600.0)
+        self.bin_width.setSingleStep(0.5)
+        self.bin_width.setProperty("value", 1.0)
+        self.bin_width.setObjectName("bin_width")
+        self.options_gridLayout.addWidget(self.bin_width, 4, 2, 1, 1)
+        self.check_finishedOnly = QtWidgets.QCheckBox(parent=self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Minimum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.check_finishedOnly.sizePolicy().hasHeightForWidth())
+        self.check_finishedOnly.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.check_finishedOnly.setFont(font)
+        self.check_finishedOnly.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.ArrowCursor))
+        self.check_finishedOnly.setLayoutDirection(QtCore.Qt.LayoutDirection.LeftToRight)
+        self.check_finishedOnly.setStyleSheet("QCheckBox {\n"
+"    margin-left: 10px;\n"
+"}")
+        self.check_finishedOnly.setChecked(False)
+        self.check_finishedOnly.setObjectName("check_finishedOnly")
+        self.options_gridLayout.addWidget(self.check_finishedOnly, 5, 0, 1, 1)
+        self.range_first = QtWidgets.QSpinBox(parent=self.centralwidget)
+        self.range_first.setStyleSheet("QSpinBox {\n"
+"    border-radius: 3px;\n"
+"    padding: 3px;\n"
+"    background-color: white;\n"
+"}")
+        self.range_first.setMaximum(9999999)
+        self.range_first.setObjectName("range_first")
+        self.options_gridLayout.addWidget(self.range_first, 5, 1, 1, 1)
+        self.range_last = QtWidgets.QSpinBox(parent=self.centralwidget)
+        self.range_last.setStyleSheet("QSpinBox {\n"
+"    border-radius: 3px;\n"
+"    padding: 3px;\n"
+"    background-color: white;\n"
+"}")
+        self.range_last.setMaximum(9999999)
+        self.range_last.setObjectName("range_last")
+        self.options_gridLayout.addWidget(self.range_last, 5, 2, 1, 1)
+        self.range_days = QtWidgets.QSpinBox(parent=self.centralwidget)
+        self.range_days.setStyleSheet("QSpinBox {\n"
+"    border-radius: 3px;\n"
+"    padding: 3px;\n"
+"    background-color: white;\n"
+"}")
+        self.range_days.setMaximum(36500)
+        self.range_days.setObjectName("range_days")
+        self.options_gridLayout.addWidget(self.range_days, 5, 3, 1, 1)
+        self.range_from = QtWidgets.QDateEdit(parent=self.centralwidget)
+        self.range_from.setStyleSheet("QDateEdit {\n"
+"    border-radius: 3px;\n"
+"    padding: 3px;\n"
+"    background-color: white;\n"
+"}")
+        self.range_from.setKeyboardTracking(False)
+        self.range_from.setMinimumDate(QtCore.QDate(2000, 1, 1))
+        self.range_from.setCalendarPopup(True)
+        self.range_from.setDate(QtCore.QDate(2000, 1, 1))
+        self.range_from.setObjectName("range_from")
+        self.options_gridLayout.addWidget(self.range_from, 6, 1, 1, 1)
+        self.range_to = QtWidgets.QDateEdit(parent=self.centralwidget)
+        self.range_to.setStyleSheet("QDateEdit {\n"
+"    border-radius: 3px;\n"
+"    padding: 3px;\n"
+"    background-color: white;\n"
+"}")
+        self.range_to.setKeyboardTracking(False)
+        self.range_to.setMinimumDate(QtCore.QDate(2000, 1, 1))
+        self.range_to.setCalendarPopup(True)
+        self.range_to.setDate(QtCore.QDate(2000, 1, 1))
+        self.range_to.setObjectName("range_to")
+        self.options_gridLayout.addWidget(self.range_to, 6, 2, 1, 1)
         self.option_attemptsOverTime = QtWidgets.QPushButton(parent=self.centralwidget)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Maximum)
         sizePolicy.setHorizontalStretch(0)
@@ -291,9 +498,19 @@ class Ui_MainWindow(object):
         self.menuFile = QtWidgets.QMenu(parent=self.menubar)
         self.menuFile.setObjectName("menuFile")
         MainWindow.setMenuBar(self.menubar)
+        self.statusbar = QtWidgets.QStatusBar(parent=MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
         self.actionOpen = QtGui.QAction(parent=MainWindow)
         self.actionOpen.setObjectName("actionOpen")
+        self.actionCompare = QtGui.QAction(parent=MainWindow)
+        self.actionCompare.setObjectName("actionCompare")
+        self.actionWatch = QtGui.QAction(parent=MainWindow)
+        self.actionWatch.setCheckable(True)
+        self.actionWatch.setObjectName("actionWatch")
         self.menuFile.addAction(self.actionOpen)
+        self.menuFile.addAction(self.actionCompare)
+        self.menuFile.addAction(self.actionWatch)
         self.menubar.addAction(self.menuFile.menuAction())
 
         self.retranslateUi(MainWindow)
@@ -321,8 +538,45 @@ class Ui_MainWindow(object):
         self.option_impOverAttempts.setProperty("class", _translate("MainWindow", "option_button"))
         self.option_personalBestOverTime.setText(_translate("MainWindow", "PB Over Time"))
         self.option_personalBestOverTime.setProperty("class", _translate("MainWindow", "option_button"))
+        self.option_sumOfBestOverTime.setText(_translate("MainWindow", "Sum of Best Over Time"))
+        self.option_sumOfBestOverTime.setProperty("class", _translate("MainWindow", "option_button"))
+        self.option_runProgression.setText(_translate("MainWindow", "Run Progression"))
+        self.option_runProgression.setProperty("class", _translate("MainWindow", "option_button"))
+        self.option_resetDistribution.setText(_translate("MainWindow", "Reset Distribution"))
+        self.option_resetDistribution.setProperty("class", _translate("MainWindow", "option_button"))
+        self.option_survivalCurve.setText(_translate("MainWindow", "Survival Curve"))
+        self.option_survivalCurve.setProperty("class", _translate("MainWindow", "option_button"))
         self.check_showOutliers.setText(_translate("MainWindow", "Show Outliers"))
+        self.outlier_options.setToolTip(_translate("MainWindow", "Outlier strategy"))
+        self.outlier_threshold.setToolTip(_translate("MainWindow", "Outlier threshold"))
+        self.moving_avg_window.setToolTip(_translate("MainWindow", "Moving average window"))
+        self.moving_avg_window.setPrefix(_translate("MainWindow", "Window: "))
+        self.check_density.setText(_translate("MainWindow", "Density Curve"))
+        self.bin_options.setToolTip(_translate("MainWindow", "Histogram bins"))
+        self.bin_width.setToolTip(_translate("MainWindow", "Width of fixed width bins"))
+        self.bin_width.setPrefix(_translate("MainWindow", "Width: "))
+        self.bin_width.setSuffix(_translate("MainWindow", " s"))
+        self.check_finishedOnly.setToolTip(_translate("MainWindow", "Only finished runs in the segment graphs and run progression"))
+        self.check_finishedOnly.setText(_translate("MainWindow", "Finished Only"))
+        self.range_first.setToolTip(_translate("MainWindow", "First attempt to show"))
+        self.range_first.setSpecialValueText(_translate("MainWindow", "From first"))
+        self.range_first.setPrefix(_translate("MainWindow", "From #"))
+        self.range_last.setToolTip(_translate("MainWindow", "Last attempt to show"))
+        self.range_last.setSpecialValueText(_translate("MainWindow", "To last"))
+        self.range_last.setPrefix(_translate("MainWindow", "To #"))
+        self.range_days.setToolTip(_translate("MainWindow", "Only the latest days of the history"))
+        self.range_days.setSpecialValueText(_translate("MainWindow", "All time"))
+        self.range_days.setPrefix(_translate("MainWindow", "Last "))
+        self.range_days.setSuffix(_translate("MainWindow", " days"))
+        self.range_from.setToolTip(_translate("MainWindow", "First day to show"))
+        self.range_from.setSpecialValueText(_translate("MainWindow", "From first day"))
+        self.range_from.setDisplayFormat(_translate("MainWindow", "yyyy-MM-dd"))
+        self.range_to.setToolTip(_translate("MainWindow", "Last day to show"))
+        self.range_to.setSpecialValueText(_translate("MainWindow", "To last day"))
+        self.range_to.setDisplayFormat(_translate("MainWindow", "yyyy-MM-dd"))
         self.option_attemptsOverTime.setText(_translate("MainWindow", "Attempts Over Time"))
         self.option_attemptsOverTime.setProperty("class", _translate("MainWindow", "option_button"))
         self.menuFile.setTitle(_translate("MainWindow", "File"))
         self.actionOpen.setText(_translate("MainWindow", "Open"))
+        self.actionCompare.setText(_translate("MainWindow", "Compare Files"))
+        self.actionWatch.setText(_translate("MainWindow", "Watch For New Attempts"))
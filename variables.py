@@ -1,42 +1,140 @@
-import requests
+from __future__ import annotations
 
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING
 
-def get_game_id(game_name):
-    response = requests.get(f'https://www.speedrun.com/api/v1/games?name={game_name}')
+import parse_cache
 
-    for game in response.json()['data']:
+# requests takes a while to import and is only needed once a lookup misses the cache
+if TYPE_CHECKING:
+    import requests
+
+
+API_URL = 'https://www.speedrun.com/api/v1'
+TIMEOUT = 5
+
+# how long a lookup stays valid, misses are retried sooner in case the category gets added
+CACHE_TTL = 7 * 24 * 3600
+MISS_TTL = 24 * 3600
+
+_session: requests.Session | None = None
+_executor: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    ''' One pooled session shared by every lookup. '''
+    global _session
+    with _lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            _session = requests.Session()
+            _session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+            _session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        return _session
+
+
+def get_json(url, params=None):
+    response = get_session().get(url, params=params, timeout=TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+def get_game_id(game_name, api_url=API_URL):
+    data = get_json(f'{api_url}/games', params={'name': game_name})
+
+    for game in data['data']:
         if game['names']['international'] == game_name:
             return game['id']
-        
+
     print("Game not found")
     return 0
 
-def get_category_variable_uri(game_id, game_category):
-    response = requests.get(f'https://www.speedrun.com/api/v1/games/{game_id}/categories')
+def get_category_variable_uri(game_id, game_category, api_url=API_URL):
+    data = get_json(f'{api_url}/games/{game_id}/categories')
 
-    for category in response.json()['data']:
+    for category in data['data']:
         if category['name'] == game_category:
             for link in category['links']:
                 if link['rel'] == 'variables':
                     return link['uri']
-                
+
     print("Category not found")
     return 0
 
-def get_category_variables(game_name, game_category):
+def cache_path():
+    return os.path.join(parse_cache.base_cache_dir(), 'category_variables.json')
+
+def read_cache() -> dict:
     try:
-        game_id = get_game_id(game_name)
-        if game_id == 0:
-            return 0
-        
-        variable_uri = get_category_variable_uri(game_id, game_category)
-        if variable_uri == 0:
-            return 0
+        with open(cache_path(), 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def cache_key(game_name, game_category, api_url=API_URL):
+    # results of another endpoint (a test server for example) are kept apart
+    return f"{api_url}\x1f{game_name}\x1f{game_category}"
+
+def cached_variables(game_name, game_category, api_url=API_URL):
+    ''' Cached lookup result, None when there's nothing fresh enough. '''
+    entry = read_cache().get(cache_key(game_name, game_category, api_url))
+    if entry is None:
+        return None
+
+    ttl = CACHE_TTL if entry['variables'] != 0 else MISS_TTL
+    if time.time() - entry['fetched'] > ttl:
+        return None
+    return entry['variables']
+
+def store_variables(game_name, game_category, available_variables, api_url=API_URL):
+    with _lock:
+        cache = read_cache()
+        cache[cache_key(game_name, game_category, api_url)] = {'fetched': time.time(), 'variables': available_variables}
+        try:
+            os.makedirs(os.path.dirname(cache_path()), exist_ok=True)
+            with open(cache_path(), 'w', encoding='utf-8') as file:
+                json.dump(cache, file)
+        except OSError as e:
+            print(e)
 
-        response = requests.get(variable_uri)
-        data = response.json()['data']
+def get_category_variables(game_name, game_category, api_url=API_URL):
+    '''
+    Names of the variables of a speedrun.com category in their display order, 0 when they can't be found.
 
-        return [variable['name'] for variable in data]
+    Results are cached on disk per (API, game, category), failed requests aren't.
+    '''
+    available_variables = cached_variables(game_name, game_category, api_url)
+    if available_variables is not None:
+        return available_variables
+
+    try:
+        game_id = get_game_id(game_name, api_url)
+        if game_id != 0:
+            variable_uri = get_category_variable_uri(game_id, game_category, api_url)
+        if game_id == 0 or variable_uri == 0:
+            store_variables(game_name, game_category, 0, api_url)
+            return 0
+
+        data = get_json(variable_uri)['data']
+        available_variables = [variable['name'] for variable in data]
     except Exception:
         #Couldn't call SRC API
-        return 0
\ No newline at end of file
+        return 0
+
+    store_variables(game_name, game_category, available_variables, api_url)
+    return available_variables
+
+def get_category_variables_async(game_name, game_category, api_url=API_URL) -> Future:
+    ''' `get_category_variables` on a background thread. '''
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='src-variables')
+    return _executor.submit(get_category_variables, game_name, game_category, api_url)